@@ -0,0 +1,34 @@
+import { NextRequest, NextResponse } from 'next/server';
+
+export const runtime = 'nodejs';
+
+function backendBase() {
+  return process.env.TICKER_LAB_BACKEND_URL ?? 'http://127.0.0.1:8001';
+}
+
+export async function POST(request: NextRequest) {
+  const body = await request.text();
+  if (!body) return NextResponse.json({ error: 'trades are required' }, { status: 400 });
+
+  const url = `${backendBase()}/trades/excursions`;
+  try {
+    const res = await fetch(url, {
+      method: 'POST',
+      headers: { 'content-type': 'application/json' },
+      body,
+      cache: 'no-store',
+    });
+    const text = await res.text();
+
+    return new NextResponse(text, {
+      status: res.status,
+      headers: { 'content-type': res.headers.get('content-type') ?? 'application/json' },
+    });
+  } catch (err) {
+    console.error('ticker-lab proxy error (excursions)', { url, err });
+    return NextResponse.json(
+      { error: 'Ticker Lab backend is not reachable', url },
+      { status: 502 },
+    );
+  }
+}
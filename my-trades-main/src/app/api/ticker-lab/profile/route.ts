@@ -11,7 +11,12 @@ export async function GET(request: NextRequest) {
   const symbol = searchParams.get('symbol');
   if (!symbol) return NextResponse.json({ error: 'symbol is required' }, { status: 400 });
 
-  const url = `${backendBase()}/ticker/profile?symbol=${encodeURIComponent(symbol)}`;
+  const params = new URLSearchParams({ symbol });
+  for (const key of ['fields', 'deadline_ms']) {
+    const value = searchParams.get(key);
+    if (value) params.set(key, value);
+  }
+  const url = `${backendBase()}/ticker/profile?${params.toString()}`;
   try {
     const res = await fetch(url, { cache: 'no-store' });
     const text = await res.text();
@@ -0,0 +1,35 @@
+import { NextRequest, NextResponse } from 'next/server';
+
+export const runtime = 'nodejs';
+
+function backendBase() {
+  return process.env.TICKER_LAB_BACKEND_URL ?? 'http://127.0.0.1:8001';
+}
+
+export async function GET(request: NextRequest) {
+  const { searchParams } = new URL(request.url);
+  const symbol = searchParams.get('symbol');
+  if (!symbol) return NextResponse.json({ error: 'symbol is required' }, { status: 400 });
+
+  const params = new URLSearchParams({ symbol });
+  for (const key of ['date', 'include', 'months', 'gap_threshold', 'deadline_ms', 'stream']) {
+    const value = searchParams.get(key);
+    if (value) params.set(key, value);
+  }
+  const url = `${backendBase()}/ticker/snapshot?${params.toString()}`;
+  try {
+    const res = await fetch(url, { cache: 'no-store' });
+
+    // NDJSON sections are passed through as they arrive
+    return new NextResponse(res.body, {
+      status: res.status,
+      headers: { 'content-type': res.headers.get('content-type') ?? 'application/json' },
+    });
+  } catch (err) {
+    console.error('ticker-lab proxy error (snapshot)', { url, err });
+    return NextResponse.json(
+      { error: 'Ticker Lab backend is not reachable', url },
+      { status: 502 },
+    );
+  }
+}
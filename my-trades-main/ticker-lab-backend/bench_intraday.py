@@ -0,0 +1,120 @@
+"""Benchmark encode time and bytes on the wire for a full-day /ticker/intraday payload.
+
+Usage:
+    python bench_intraday.py                      # synthetic 04:00-20:00 ET session (960 bars)
+    python bench_intraday.py --live TSLA 2026-02-03  # real payload through fetch_intraday_1m
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+
+import main
+
+
+def synthetic_payload(symbol: str = "TSLA", day: str = "2026-02-03", seed: int = 7) -> Dict[str, Any]:
+    """Build a payload shaped exactly like fetch_intraday_1m for a full prepost session."""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp(f"{day} 04:00", tz=main.DEFAULT_TZ)
+    times = pd.date_range(start, periods=16 * 60, freq="1min")
+    closes = 250.0 * np.exp(np.cumsum(rng.normal(0, 0.0015, len(times))))
+    opens = np.concatenate([[closes[0]], closes[:-1]])
+    spread = np.abs(rng.normal(0, 0.002, len(times))) * closes
+    highs = np.maximum(opens, closes) + spread
+    lows = np.minimum(opens, closes) - spread
+    volumes = rng.integers(100, 250_000, len(times)).astype(float)
+
+    candles: List[Dict[str, Any]] = []
+    for i, ts in enumerate(times):
+        candles.append(
+            {
+                "time": main._to_unix_seconds(ts),
+                "open": float(opens[i]),
+                "high": float(highs[i]),
+                "low": float(lows[i]),
+                "close": float(closes[i]),
+                "volume": float(volumes[i]),
+            }
+        )
+    return {"symbol": symbol, "date": day, "count": len(candles), "candles": candles}
+
+
+def stdlib_encode(payload: Dict[str, Any]) -> bytes:
+    # What FastAPI's default path does: jsonable_encoder walk, then Starlette's JSONResponse.render
+    return json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def fast_encode(payload: Dict[str, Any]) -> bytes:
+    return main.FastJSONResponse(payload).body
+
+
+def candles_size(candles: List[Dict[str, Any]]) -> int:
+    # list + one dict per bar + its boxed values (the keys are interned and shared)
+    return sys.getsizeof(candles) + sum(sys.getsizeof(c) + sum(sys.getsizeof(v) for v in c.values()) for c in candles)
+
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--live", nargs=2, metavar=("SYMBOL", "DATE"), help="fetch a real session instead")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.live:
+        bars = main.fetch_intraday_1m(main._clean_symbol(args.live[0]), args.live[1])
+        payload = bars.payload()
+    else:
+        payload = synthetic_payload()
+        values = np.array([[c[field] for c in payload["candles"]] for field in main._OHLCV], dtype=np.float64)
+        bars = main.IntradayBars(payload["symbol"], payload["date"], values)
+    assert bars.payload() == payload, "IntradayBars does not round-trip the payload"
+
+    raw_std = stdlib_encode(payload)
+    raw_fast = fast_encode(payload)
+    assert json.loads(raw_std) == json.loads(raw_fast), "encoders disagree"
+
+    print(f"payload: {payload['symbol']} {payload['date']} bars={payload['count']}")
+    print(f"{'encoder':<28}{'best ms':>10}")
+    print(f"{'jsonable_encoder + json':<28}{best_of(lambda: stdlib_encode(payload), args.repeat):>10.2f}")
+    print(f"{'orjson (FastJSONResponse)':<28}{best_of(lambda: fast_encode(payload), args.repeat):>10.2f}")
+    print(f"{'IntradayBars -> orjson':<28}{best_of(lambda: fast_encode(bars.payload()), args.repeat):>10.2f}")
+
+    print()
+    print(f"{'cached as':<28}{'bytes in memory':>16}")
+    print(f"{'list of candle dicts':<28}{candles_size(payload['candles']):>16}")
+    print(f"{'IntradayBars':<28}{sys.getsizeof(bars) + bars.values.nbytes:>16}")
+
+    print()
+    print(f"{'wire format':<28}{'bytes':>10}{'encode ms':>12}")
+    rows = [("identity (stdlib)", lambda: raw_std), ("identity (orjson)", lambda: raw_fast)]
+    rows.append((f"gzip level {main.GZIP_LEVEL}", lambda: gzip.compress(raw_fast, compresslevel=main.GZIP_LEVEL)))
+    if main.brotli is not None:
+        rows.append(
+            (f"br quality {main.BROTLI_QUALITY}", lambda: main.brotli.compress(raw_fast, quality=main.BROTLI_QUALITY))
+        )
+    else:
+        print("(brotli not installed; skipping br)")
+    for label, fn in rows:
+        size = len(fn())
+        print(f"{label:<28}{size:>10}{best_of(fn, args.repeat):>12.2f}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -1,39 +1,1347 @@
+from __future__ import annotations
+
+import time
+
+_IMPORT_T0 = time.perf_counter()
+
 import os
 import re
+import csv
+import ast
+import bisect
+import gzip
+import sys
+import uuid
+import queue
+import random
+import pickle
+import sqlite3
+import hashlib
+import hmac
+import tempfile
+import importlib
+import atexit
+import asyncio
 import logging
-from datetime import datetime, timedelta, date as date_type
-from typing import Any, Dict, List, Optional, Tuple
-
-import httpx
-import numpy as np
-import pandas as pd
-import yfinance as yf
-from bs4 import BeautifulSoup
+import contextvars
+import functools
+import threading
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import ExitStack, contextmanager, nullcontext
+from logging.handlers import QueueHandler, QueueListener
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta, timezone, date as date_type
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import anyio
+import orjson
 from cachetools import TTLCache
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, Header, HTTPException, Query
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, Field
+from starlette.datastructures import Headers, MutableHeaders
+
+import parsers
+from parsers import parse_human_number as _parse_human_number
+
+try:
+    import brotli
+except ImportError:  # optional: without it we only negotiate gzip
+    brotli = None
+
+try:
+    import fcntl
+except ImportError:  # not on Windows: run a single worker there if the daily panel is on
+    fcntl = None
 
 APP_NAME = "ticker-lab-backend"
 
 logger = logging.getLogger(APP_NAME)
-logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
 
-# Cache: avoid hammering Yahoo + sites
-PROFILE_CACHE = TTLCache(maxsize=512, ttl=60 * 60)  # 1h
-INTRADAY_CACHE = TTLCache(maxsize=512, ttl=60 * 2)  # 2m
-DAILY_CACHE = TTLCache(maxsize=512, ttl=60 * 60 * 6)  # 6h
+# Logging: request threads only enqueue records; one listener thread formats and writes them
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("TICKER_LAB_LOG_FORMAT", "json").lower()
+LOG_QUEUE_SIZE = int(os.getenv("TICKER_LAB_LOG_QUEUE_SIZE", "10000"))
+# path=rate: share of INFO-and-below records kept while serving that path ("*" = everything else)
+DEFAULT_LOG_SAMPLE = "/ticker/profile=0.1,/ticker/news=0.1,/ticker/intraday=0.1,/ticker/gaps=0.1,/ticker/snapshot=0.1"
+
+_LOG_PATH: contextvars.ContextVar[str] = contextvars.ContextVar("log_path", default="")
+_LOG_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+
+def _parse_log_sample(spec: str) -> Dict[str, float]:
+    rates: Dict[str, float] = {}
+    for part in spec.split(","):
+        path, _, rate = part.strip().rpartition("=")
+        if not path:
+            continue
+        try:
+            rates[path] = min(1.0, max(0.0, float(rate)))
+        except ValueError:
+            continue
+    return rates
+
+
+class JSONLogFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, every `extra` field, and exc."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        out: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _LOG_RECORD_ATTRS:
+                out[key] = value
+        if record.exc_info:
+            out["exc"] = self.formatException(record.exc_info)
+        return orjson.dumps(out, default=str, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+
+
+class LogSampler(logging.Filter):
+    """Keep a `rate` share of INFO-and-below records per request path; warnings and errors always pass."""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self.default = rates.get("*", 1.0)
+        self.dropped = 0
+
+    def rate(self, levelno: int) -> float:
+        if levelno > logging.INFO:
+            return 1.0
+        return self.rates.get(_LOG_PATH.get(), self.default)
+
+    def keep(self, rate: float) -> bool:
+        if rate >= 1.0 or random.random() < rate:
+            return True
+        self.dropped += 1
+        return False
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if hasattr(record, "sampleRate"):  # already sampled by log_event
+            return True
+        rate = self.rate(record.levelno)
+        if not self.keep(rate):
+            return False
+        if rate < 1.0:
+            record.sampleRate = rate
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Never blocks the caller: a full queue drops the record and counts it."""
+
+    def __init__(self, q: queue.Queue):
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # In-process queue: the record (and exc_info) goes across as-is, formatting happens on the listener.
+        record.msg, record.args = record.getMessage(), None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+LOG_SAMPLER = LogSampler(
+    {**_parse_log_sample(DEFAULT_LOG_SAMPLE), **_parse_log_sample(os.getenv("TICKER_LAB_LOG_SAMPLE", ""))}
+)
+
+
+def _setup_logging() -> Tuple[DroppingQueueHandler, QueueListener]:
+    out = logging.StreamHandler(sys.stderr)
+    out.setFormatter(JSONLogFormatter() if LOG_FORMAT == "json" else logging.Formatter(logging.BASIC_FORMAT))
+    handler = DroppingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    handler.addFilter(LOG_SAMPLER)
+    # Only the app's own logger goes through the queue; the root logger is left to the host process
+    logger.addHandler(handler)
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+    listener = QueueListener(handler.queue, out)
+    listener.start()
+    atexit.register(listener.stop)
+    return handler, listener
+
+
+LOG_HANDLER, LOG_LISTENER = _setup_logging()
+
+
+def log_event(msg: str, fields: Optional[Callable[[], Dict[str, Any]]] = None, level: int = logging.INFO) -> None:
+    """Hot-path logging: `fields()` only runs when the level is enabled and the record survives sampling."""
+    if not logger.isEnabledFor(level):
+        return
+    rate = LOG_SAMPLER.rate(level)
+    if not LOG_SAMPLER.keep(rate):
+        return
+    extra = fields() if fields is not None else {}
+    if rate < 1.0:
+        extra["sampleRate"] = rate
+    logger.log(level, msg, extra=extra)
+
+# Cold-start accounting, served by GET /startup
+STARTUP_REPORT: Dict[str, Any] = {"imports": {}, "steps": {}, "prewarm": {}}
+_LAZY_IMPORT_LOCK = threading.Lock()
+
+
+@contextmanager
+def _startup_step(name: str, section: str = "steps"):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        STARTUP_REPORT[section][name] = round((time.perf_counter() - t0) * 1000, 1)
+
+
+class _LazyModule:
+    """Module stand-in that imports on first attribute access.
+
+    Keeps yfinance/pandas/numpy/httpx off the import path so /health answers sooner;
+    the import time is recorded in STARTUP_REPORT["imports"].
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            with _LAZY_IMPORT_LOCK:
+                if self._module is None:
+                    with _startup_step(self._name, "imports"):
+                        self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self._name!r} {'loaded' if self._module is not None else 'pending'}>"
+
+
+httpx = _LazyModule("httpx")
+np = _LazyModule("numpy")
+pd = _LazyModule("pandas")
+yf = _LazyModule("yfinance")
 
 DEFAULT_TZ = os.getenv("TICKER_LAB_TZ", "America/New_York")
 
 # Load env files (best-effort): backend-local .env, then project-root .env
 _here = os.path.dirname(__file__)
-load_dotenv(os.path.join(_here, ".env"), override=False)
-load_dotenv(os.path.join(_here, "..", ".env"), override=False)
+with _startup_step("dotenv"):
+    load_dotenv(os.path.join(_here, ".env"), override=False)
+    load_dotenv(os.path.join(_here, "..", ".env"), override=False)
 
 POLYGON_API_KEY = os.getenv("POLYGON_API_KEY")
 
-app = FastAPI(title=APP_NAME)
+# Cache backend: "memory" (per process) or "sqlite" (one file shared by every worker on the node)
+CACHE_BACKEND = os.getenv("TICKER_LAB_CACHE_BACKEND", "memory").lower()
+CACHE_PATH = os.getenv("TICKER_LAB_CACHE_PATH", os.path.join(tempfile.gettempdir(), "ticker-lab-cache.sqlite3"))
+# How long a caller waits for another worker's in-flight fetch of the same key before fetching itself
+CACHE_LOCK_WAIT_S = float(os.getenv("TICKER_LAB_CACHE_LOCK_WAIT_S", "30"))
+# Shared secret for the /admin endpoints (X-Admin-Token header); unset disables them
+ADMIN_TOKEN = os.getenv("TICKER_LAB_ADMIN_TOKEN")
+# On-demand sampling profiler (X-Profile header or POST /admin/profile); needs ADMIN_TOKEN
+PROFILE_INTERVAL_MS = float(os.getenv("TICKER_LAB_PROFILE_INTERVAL_MS", "5"))
+PROFILE_KEEP = int(os.getenv("TICKER_LAB_PROFILE_KEEP", "20"))
+PROFILE_DIR = os.getenv("TICKER_LAB_PROFILE_DIR")  # also write each profile here as <id>.folded
+PROFILE_MAX_S = float(os.getenv("TICKER_LAB_PROFILE_MAX_S", "60"))
+_MISS = object()
+
+
+class _KeyLocks:
+    """In-process per-key locks, dropped again once nobody holds or waits on them."""
+
+    def __init__(self):
+        self._locks: Dict[Any, List[Any]] = {}
+        self._guard = threading.Lock()
+
+    @contextmanager
+    def hold(self, key: Any):
+        with self._guard:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._guard:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    self._locks.pop(key, None)
+
+
+class CacheBackend:
+    """Mapping-style TTL cache with a per-key single-flight lock.
+
+    Subclasses implement get / __setitem__ / pop / clear / __len__ / lock.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        raise NotImplementedError
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        raise NotImplementedError
+
+    def pop(self, key: Any, default: Any = None) -> Any:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def lock(self, key: Any):
+        raise NotImplementedError
+
+    def keys(self) -> List[Any]:
+        raise NotImplementedError
+
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key, _MISS) is not _MISS
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self.get(key, _MISS)
+        if value is _MISS:
+            raise KeyError(key)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": type(self).__name__, "size": len(self), "maxsize": self.maxsize, "ttl": self.ttl}
+
+
+class MemoryCache(CacheBackend):
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        super().__init__(name, maxsize, ttl)
+        self._data = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._guard = threading.Lock()
+        self._locks = _KeyLocks()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        with self._guard:
+            return self._data.get(key, default)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        with self._guard:
+            self._data[key] = value
+
+    def pop(self, key: Any, default: Any = None) -> Any:
+        with self._guard:
+            return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        with self._guard:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._guard:
+            self._data.expire()
+            return len(self._data)
+
+    def lock(self, key: Any):
+        return self._locks.hold(key)
+
+    def keys(self) -> List[Any]:
+        with self._guard:
+            self._data.expire()
+            return list(self._data.keys())
+
+
+class SQLiteCache(CacheBackend):
+    """Cache stored in one SQLite (WAL) file so all uvicorn workers on a node share entries.
+
+    Values are pickled. The single-flight lock is a lease row in the same file, so only
+    one worker fetches a given key while the others wait for its entry.
+    """
+
+    LOCK_LEASE_S = 120.0
+    _PRUNE_EVERY = 64
+
+    def __init__(self, name: str, maxsize: int, ttl: float, path: str = CACHE_PATH):
+        super().__init__(name, maxsize, ttl)
+        self.path = path
+        self._local = threading.local()
+        self._locks = _KeyLocks()
+        self._writes = 0
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (ns TEXT, key TEXT, value BLOB, expires REAL, PRIMARY KEY (ns, key))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS locks (ns TEXT, key TEXT, owner TEXT, expires REAL, PRIMARY KEY (ns, key))"
+            )
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _key(key: Any) -> str:
+        # Cache keys are tuples of str/int/float/None, whose repr is stable across processes
+        return repr(key)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        row = self._conn().execute(
+            "SELECT value FROM cache WHERE ns = ? AND key = ? AND expires >= ?", (self.name, self._key(key), time.time())
+        ).fetchone()
+        if row is None:
+            return default
+        try:
+            return pickle.loads(row[0])
+        except Exception:
+            return default
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (ns, key, value, expires) VALUES (?, ?, ?, ?)",
+            (self.name, self._key(key), blob, time.time() + self.ttl),
+        )
+        self._writes += 1
+        if self._writes % self._PRUNE_EVERY == 0:
+            self._prune(conn)
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM cache WHERE ns = ? AND expires < ?", (self.name, time.time()))
+        # Over capacity: drop the entries closest to expiry
+        conn.execute(
+            "DELETE FROM cache WHERE ns = ? AND key IN ("
+            " SELECT key FROM cache WHERE ns = ? ORDER BY expires DESC LIMIT -1 OFFSET ?)",
+            (self.name, self.name, self.maxsize),
+        )
+
+    def pop(self, key: Any, default: Any = None) -> Any:
+        value = self.get(key, _MISS)
+        self._conn().execute("DELETE FROM cache WHERE ns = ? AND key = ?", (self.name, self._key(key)))
+        return default if value is _MISS else value
+
+    def clear(self) -> None:
+        self._conn().execute("DELETE FROM cache WHERE ns = ?", (self.name,))
+
+    def __len__(self) -> int:
+        row = self._conn().execute(
+            "SELECT COUNT(*) FROM cache WHERE ns = ? AND expires >= ?", (self.name, time.time())
+        ).fetchone()
+        return int(row[0])
+
+    def keys(self) -> List[Any]:
+        rows = self._conn().execute(
+            "SELECT key FROM cache WHERE ns = ? AND expires >= ?", (self.name, time.time())
+        ).fetchall()
+        return [ast.literal_eval(row[0]) for row in rows]
+
+    @contextmanager
+    def lock(self, key: Any):
+        skey = self._key(key)
+        owner = f"{os.getpid()}:{uuid.uuid4().hex}"
+        with self._locks.hold(key):
+            conn = self._conn()
+            deadline = time.time() + CACHE_LOCK_WAIT_S
+            owned = False
+            while True:
+                now = time.time()
+                conn.execute("DELETE FROM locks WHERE ns = ? AND key = ? AND expires < ?", (self.name, skey, now))
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO locks (ns, key, owner, expires) VALUES (?, ?, ?, ?)",
+                    (self.name, skey, owner, now + self.LOCK_LEASE_S),
+                )
+                owned = cur.rowcount == 1
+                # Stop waiting once we own the lease, the other worker's entry landed, or we ran out of patience
+                if owned or now > deadline or self.get(key, _MISS) is not _MISS:
+                    break
+                time.sleep(0.05)
+            try:
+                yield
+            finally:
+                if owned:
+                    conn.execute("DELETE FROM locks WHERE ns = ? AND key = ? AND owner = ?", (self.name, skey, owner))
+
+
+def make_cache(name: str, maxsize: int, ttl: float) -> CacheBackend:
+    if CACHE_BACKEND == "sqlite":
+        return SQLiteCache(name, maxsize, ttl)
+    if CACHE_BACKEND != "memory":
+        logger.warning("unknown cache backend, using memory", extra={"backend": CACHE_BACKEND})
+    return MemoryCache(name, maxsize, ttl)
+
+
+class Uncached(Exception):
+    """Raised inside a read_through fetch to return a result without caching it (e.g. bulkhead full)."""
+
+    def __init__(self, value: Any):
+        super().__init__("uncached result")
+        self.value = value
+
+
+def _is_negative(value: Any) -> bool:
+    """Error / empty results, kept only for the namespace's negative TTL."""
+    if value is None:
+        return True
+    if isinstance(value, list):
+        return not value
+    if isinstance(value, tuple):
+        return bool(value) and value[0] is None
+    if isinstance(value, dict):
+        return value.get("ok") is False or value.get("yahooOk") is False
+    return False
+
+
+class ReadThroughCache:
+    """One cache namespace: hits for `ttl`, negative results for `negative_ttl` (0 = never cached).
+
+    Keys are tuples whose first element is the symbol, so entries can be listed and dropped
+    per symbol. Both stores share the positive store's single-flight lock.
+    """
+
+    def __init__(self, namespace: str, ttl: float, negative_ttl: float, maxsize: int):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.maxsize = maxsize
+        self.store = make_cache(namespace, maxsize, ttl)
+        self.negative = make_cache(f"{namespace}:neg", maxsize, negative_ttl) if negative_ttl > 0 else None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        value = self.store.get(key, _MISS)
+        if value is _MISS and self.negative is not None:
+            value = self.negative.get(key, _MISS)
+        return default if value is _MISS else value
+
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key, _MISS) is not _MISS
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self.get(key, _MISS)
+        if value is _MISS:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if not _is_negative(value):
+            self.store[key] = value
+            if self.negative is not None:
+                self.negative.pop(key, None)
+        elif self.negative is not None:
+            self.negative[key] = value
+
+    def pop(self, key: Any, default: Any = None) -> Any:
+        value = self.store.pop(key, _MISS)
+        if self.negative is not None:
+            neg = self.negative.pop(key, _MISS)
+            value = neg if value is _MISS else value
+        return default if value is _MISS else value
+
+    def clear(self) -> None:
+        self.store.clear()
+        if self.negative is not None:
+            self.negative.clear()
+
+    def lock(self, key: Any):
+        return self.store.lock(key)
+
+    def entries(self) -> List[Tuple[Any, bool]]:
+        """(key, negative) for every live entry."""
+        out = [(key, False) for key in self.store.keys()]
+        if self.negative is not None:
+            out += [(key, True) for key in self.negative.keys()]
+        return out
+
+    def invalidate(self, symbol: Optional[str] = None) -> int:
+        if symbol is None:
+            count = len(self.entries())
+            self.clear()
+            return count
+        keys = {key for key, _ in self.entries() if isinstance(key, tuple) and key and key[0] == symbol}
+        for key in keys:
+            self.pop(key)
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.store).__name__,
+            "ttl": self.ttl,
+            "negativeTtl": self.negative_ttl,
+            "maxsize": self.maxsize,
+            "size": len(self.store),
+            "negativeSize": len(self.negative) if self.negative is not None else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+# namespace=ttl:negative_ttl:maxsize (seconds); override any of them with TICKER_LAB_CACHE_POLICIES
+DEFAULT_CACHE_POLICIES = (
+    "yahoo_profile=21600:0:1024,"
+    "polygon_profile=21600:300:1024,"
+    "polygon_financials=86400:600:1024,"
+    "google_finance_ebitda=86400:1800:1024,"
+    "google_exchange=604800:0:4096,"
+    "finviz_page=900:120:512,"
+    "finviz_profile=3600:120:1024,"
+    "finviz_news=300:60:512,"
+    "polygon_news=300:60:512,"
+    "knowthefloat=86400:1800:1024,"
+    "dilutiontracker=43200:1800:1024,"
+    "intraday_1m=120:0:512,"
+    "polygon_1m=21600:0:2048,"
+    "daily=21600:0:512,"
+    "polygon_daily=21600:0:512,"
+    "session_stats_live=120:0:512,"
+    "session_stats=21600:0:2048"
+)
+
+
+def _parse_cache_policies(spec: str) -> Dict[str, Tuple[float, float, int]]:
+    policies: Dict[str, Tuple[float, float, int]] = {}
+    for part in spec.split(","):
+        name, _, values = part.strip().partition("=")
+        if not name or not values:
+            continue
+        try:
+            ttl, negative_ttl, maxsize = (values.split(":") + ["", ""])[:3]
+            policies[name.strip()] = (float(ttl), float(negative_ttl or 0), int(maxsize or 512))
+        except ValueError:
+            logger.warning("ignoring bad cache policy", extra={"spec": part})
+    return policies
+
+
+CACHE_POLICIES = {
+    **_parse_cache_policies(DEFAULT_CACHE_POLICIES),
+    **_parse_cache_policies(os.getenv("TICKER_LAB_CACHE_POLICIES", "")),
+}
+CACHES: Dict[str, ReadThroughCache] = {
+    name: ReadThroughCache(name, ttl, negative_ttl, maxsize) for name, (ttl, negative_ttl, maxsize) in CACHE_POLICIES.items()
+}
+
+# (symbol,) -> "SYMBOL:EXCHANGE" Google Finance quote that last yielded EBITDA
+GOOGLE_EXCHANGE_MEMO = CACHES["google_exchange"]
+
+
+def read_through(namespace: str, key_fn):
+    """Cache a fetch in CACHES[namespace]; only one caller per key runs it at a time.
+
+    With the sqlite backend the single-flight lock spans every worker on the node.
+    Negative results (see _is_negative) use the namespace's negative TTL; a fetch
+    raises Uncached to hand back a result that must not be stored at all.
+    """
+    cache = CACHES[namespace]
+
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = key_fn(*args, **kwargs)
+            value = cache.get(key, _MISS)
+            if value is not _MISS:
+                cache.hits += 1
+                return value
+            with cache.lock(key):
+                value = cache.get(key, _MISS)
+                if value is not _MISS:
+                    cache.hits += 1
+                    return value
+                cache.misses += 1
+                try:
+                    value = fn(*args, **kwargs)
+                except Uncached as e:
+                    return e.value
+                cache[key] = value
+                return value
+
+        wrapper.cache, wrapper.cache_key = cache, key_fn
+        return wrapper
+
+    return deco
+
+
+# Symbol master: local reference file(s) of listed symbols (CSV or NASDAQ Trader *listed.txt)
+SYMBOL_MASTER_PATHS = [p for p in os.getenv("TICKER_LAB_SYMBOL_MASTER", "").split(",") if p.strip()]
+# When a master is loaded, reject symbols it doesn't know (set 0 to use it only for exchange hints)
+SYMBOL_MASTER_STRICT = os.getenv("TICKER_LAB_SYMBOL_MASTER_STRICT", "1") not in ("0", "false", "no")
+
+# News ingestion (opt-in): tracked symbols are polled in the background into NEWS_INDEX
+NEWS_INGEST_ENABLED = os.getenv("TICKER_LAB_NEWS_INGEST", "0") not in ("0", "false", "no")
+NEWS_POLL_S = float(os.getenv("TICKER_LAB_NEWS_POLL_S", "300"))
+NEWS_RETENTION_DAYS = int(os.getenv("TICKER_LAB_NEWS_RETENTION_DAYS", "7"))
+# Newest items kept per symbol; add() enforces this and the retention window on every write
+NEWS_MAX_PER_SYMBOL = int(os.getenv("TICKER_LAB_NEWS_MAX_PER_SYMBOL", "200"))
+NEWS_TRACK_MAX = int(os.getenv("TICKER_LAB_NEWS_TRACK_MAX", "200"))
+# Symbols nobody asked about for this long drop out of the poll list (seed symbols never do)
+NEWS_TRACK_TTL_S = float(os.getenv("TICKER_LAB_NEWS_TRACK_TTL_S", str(60 * 60 * 24)))
+NEWS_SEED_SYMBOLS = [x.strip().upper() for x in os.getenv("TICKER_LAB_NEWS_SYMBOLS", "").split(",") if x.strip()]
+# Optional JSONL file so the index survives restarts
+NEWS_STORE_PATH = os.getenv("TICKER_LAB_NEWS_STORE")
+NEWS_COMPACT_EVERY_S = float(os.getenv("TICKER_LAB_NEWS_COMPACT_EVERY_S", "3600"))
+
+# Pre-market warmup: load the universe file's symbols into the caches at set times (TICKER_LAB_TZ)
+WARMUP_UNIVERSE_PATH = os.getenv("TICKER_LAB_WARMUP_UNIVERSE")  # unset disables the scheduler
+WARMUP_AT = [x.strip() for x in os.getenv("TICKER_LAB_WARMUP_AT", "08:00").split(",") if x.strip()]
+WARMUP_SECTIONS = [x.strip() for x in os.getenv("TICKER_LAB_WARMUP_SECTIONS", "profile,gaps,intraday").split(",") if x.strip()]
+WARMUP_WORKERS = int(os.getenv("TICKER_LAB_WARMUP_WORKERS", "4"))
+# After a run, re-download today's 1m bars this often (under the intraday_1m TTL) until WARMUP_UNTIL
+WARMUP_INTRADAY_EVERY_S = float(os.getenv("TICKER_LAB_WARMUP_INTRADAY_EVERY_S", "90"))
+WARMUP_UNTIL = os.getenv("TICKER_LAB_WARMUP_UNTIL", "09:35")
+WARMUP_BATCH = int(os.getenv("TICKER_LAB_WARMUP_BATCH", "50"))  # symbols per batched Yahoo download
+WARMUP_RATE_WAIT_S = float(os.getenv("TICKER_LAB_WARMUP_RATE_WAIT_S", "120"))  # warmup may queue for tokens this long
+
+# Daily panel: whole-market daily bars from Polygon's grouped endpoint in a memory-mapped store
+PANEL_DIR = os.getenv("TICKER_LAB_PANEL_DIR")  # unset disables the panel
+PANEL_DAYS = int(os.getenv("TICKER_LAB_PANEL_DAYS", "300"))  # sessions kept; 12 months of /ticker/gaps is ~260
+PANEL_INGEST_ENABLED = os.getenv("TICKER_LAB_PANEL_INGEST", "1") not in ("0", "false", "no")
+PANEL_UPDATE_AT = os.getenv("TICKER_LAB_PANEL_UPDATE_AT", "18:30")  # TICKER_LAB_TZ wall clock
+# Reads fall back to the per-symbol providers when the newest panel day is older than this
+PANEL_MAX_STALE_DAYS = int(os.getenv("TICKER_LAB_PANEL_MAX_STALE_DAYS", "4"))
+# Pause between backfill calls; the default fits Polygon's free 5 calls/minute
+PANEL_CALL_GAP_S = float(os.getenv("TICKER_LAB_PANEL_CALL_GAP_S", "12"))
+
+# Google Finance candidates: how long the leading candidate runs alone before the next one is raced
+GOOGLE_HEDGE_DELAY_S = float(os.getenv("TICKER_LAB_GOOGLE_HEDGE_DELAY_S", "0.3"))
+
+# Provider registry: rolling latency / success per upstream call, used to order and hedge providers
+PROVIDER_WINDOW = int(os.getenv("TICKER_LAB_PROVIDER_WINDOW", "50"))
+PROVIDER_WINDOW_S = float(os.getenv("TICKER_LAB_PROVIDER_WINDOW_S", "300"))  # older samples are forgotten
+PROVIDER_MIN_SAMPLES = int(os.getenv("TICKER_LAB_PROVIDER_MIN_SAMPLES", "5"))
+PROVIDER_MIN_SUCCESS = float(os.getenv("TICKER_LAB_PROVIDER_MIN_SUCCESS", "0.5"))
+# Never hedge before this, whatever the primary's p95 says
+PROVIDER_HEDGE_MIN_S = float(os.getenv("TICKER_LAB_PROVIDER_HEDGE_MIN_S", "0.5"))
+PROVIDER_HEDGE_WORKERS = int(os.getenv("TICKER_LAB_PROVIDER_HEDGE_WORKERS", "16"))
+
+# /ticker/profile?deadline_ms=: source fetches run on this pool and outlive the request
+PROFILE_WORKERS = int(os.getenv("TICKER_LAB_PROFILE_WORKERS", "16"))
+
+# POST /trades/excursions: trades per request, and symbol-days fetched at once
+EXCURSION_MAX_TRADES = int(os.getenv("TICKER_LAB_EXCURSION_MAX_TRADES", "2000"))
+EXCURSION_FETCH_WORKERS = int(os.getenv("TICKER_LAB_EXCURSION_FETCH_WORKERS", "4"))
+
+# Yahoo serves 1m bars for recent days only; older sessions come from Polygon minute aggregates
+YAHOO_1M_DAYS = int(os.getenv("TICKER_LAB_YAHOO_1M_DAYS", "7"))
+# GET /gaps/study: events per request and sessions loaded at once
+GAP_STUDY_MAX_EVENTS = int(os.getenv("TICKER_LAB_GAP_STUDY_MAX_EVENTS", "500"))
+GAP_STUDY_FETCH_WORKERS = int(os.getenv("TICKER_LAB_GAP_STUDY_FETCH_WORKERS", "8"))
+
+# HTML parsing runs in worker processes so scraping CPU doesn't hold the request threads' GIL
+PARSE_WORKERS = int(os.getenv("TICKER_LAB_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+PARSE_TIMEOUT_S = float(os.getenv("TICKER_LAB_PARSE_TIMEOUT_S", "10"))
+_PARSE_POOL: Optional[ProcessPoolExecutor] = None
+_PARSE_POOL_LOCK = threading.Lock()
+
+# Response encoding: orjson for bodies, br/gzip for anything above the threshold
+COMPRESS_MIN_BYTES = int(os.getenv("TICKER_LAB_COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("TICKER_LAB_GZIP_LEVEL", "5"))
+BROTLI_QUALITY = int(os.getenv("TICKER_LAB_BROTLI_QUALITY", "4"))
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+_COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def _orjson_default(obj: Any) -> Any:
+    # orjson handles dicts/lists/floats/numpy natively; only odd types land here.
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return jsonable_encoder(obj)
+
+
+def dump_json(content: Any) -> bytes:
+    return orjson.dumps(content, default=_orjson_default, option=_ORJSON_OPTIONS)
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
+
+
+def _fast_json_endpoint(endpoint):
+    """Wrap an endpoint so plain return values skip FastAPI's jsonable_encoder walk."""
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            result = await endpoint(*args, **kwargs)
+            return result if isinstance(result, Response) else FastJSONResponse(result)
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        result = endpoint(*args, **kwargs)
+        return result if isinstance(result, Response) else FastJSONResponse(result)
+
+    return wrapper
+
+
+class FastJSONRoute(APIRoute):
+    def __init__(self, path: str, endpoint, **kwargs):
+        # Endpoints with a response model still need FastAPI's validation/serialization.
+        untyped = isinstance(kwargs.get("response_model"), DefaultPlaceholder) and "return" not in getattr(
+            endpoint, "__annotations__", {}
+        )
+        super().__init__(path, _fast_json_endpoint(endpoint) if untyped else endpoint, **kwargs)
+
+
+def _negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br or gzip from an Accept-Encoding header, honouring q-values."""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        m = re.search(r"q=([0-9.]+)", params)
+        if m:
+            try:
+                q = float(m.group(1))
+            except ValueError:
+                q = 0.0
+        weights[token] = q
+
+    wildcard = weights.get("*", 0.0)
+    best: Optional[str] = None
+    best_q = 0.0
+    for coding in (["br"] if brotli is not None else []) + ["gzip"]:
+        q = weights.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    """Compress buffered responses with the encoding negotiated from Accept-Encoding.
+
+    Streaming responses (more than one body message) pass through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESS_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = _negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Dict[str, Any]] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            body = message.get("body", b"")
+            compressible = headers.get("content-type", "").startswith(_COMPRESSIBLE_TYPES)
+            if (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or not compressible
+                or len(body) < self.minimum_size
+            ):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = _compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+# Import heavy providers / load reference data in a background thread once the app starts
+PREWARM_ENABLED = os.getenv("TICKER_LAB_PREWARM", "1") not in ("0", "false", "no")
+READY = threading.Event()
+
+# Bulkheads: "name=limit:queue" lists. limit = concurrent slots, queue = callers allowed to wait for one.
+DEFAULT_ENDPOINT_POOLS = "profile=8:16,news=8:16,gaps=8:16,intraday=16:64,journal=4:8,default=16:64"
+DEFAULT_UPSTREAM_POOLS = "yahoo=8:16,polygon=8:16,finviz=4:8,google=4:8,knowthefloat=2:4,dilutiontracker=2:4"
+BULKHEAD_WAIT_S = float(os.getenv("TICKER_LAB_BULKHEAD_WAIT_S", "5"))
+# Paths that never queue behind a pool (cheap, and needed to diagnose a saturated service)
+BULKHEAD_EXEMPT_PATHS = {"/health", "/livez", "/readyz", "/startup", "/bulkheads", "/providers"}
+ENDPOINT_CLASSES = {
+    "/ticker/profile": "profile",
+    "/ticker/news": "news",
+    "/ticker/gaps": "gaps",
+    "/ticker/intraday": "intraday",
+    "/trades/excursions": "journal",
+    "/gaps/study": "gaps",
+    "/ticker/session-stats": "intraday",
+    "/ticker/compare": "intraday",
+    "/ticker/snapshot": "profile",
+}
+
+
+def _parse_pool_spec(spec: str) -> Dict[str, Tuple[int, int]]:
+    pools: Dict[str, Tuple[int, int]] = {}
+    for part in spec.split(","):
+        name, _, sizes = part.strip().partition("=")
+        if not name or not sizes:
+            continue
+        limit, _, queue = sizes.partition(":")
+        try:
+            pools[name.strip().lower()] = (max(1, int(limit)), max(0, int(queue or 0)))
+        except ValueError:
+            logger.warning("ignoring bad bulkhead spec", extra={"spec": part})
+    return pools
+
+
+def _parse_rate_spec(spec: str) -> Dict[str, Tuple[float, float]]:
+    """name=calls/seconds -> (tokens per second, burst)."""
+    rates: Dict[str, Tuple[float, float]] = {}
+    for part in spec.split(","):
+        name, _, value = part.strip().partition("=")
+        if not name or not value:
+            continue
+        calls, _, per = value.partition("/")
+        try:
+            rates[name.strip().lower()] = (float(calls) / float(per or 1), max(1.0, float(calls)))
+        except (ValueError, ZeroDivisionError):
+            logger.warning("ignoring bad rate limit spec", extra={"spec": part})
+    return rates
+
+
+class BulkheadFull(Exception):
+    def __init__(self, name: str, reason: str = "bulkhead full"):
+        super().__init__(f"{name} busy ({reason})")
+        self.name = name
+
+
+# How long a slot() may sleep for rate-limit tokens; background jobs raise it for their own threads
+_RATE_WAIT_S: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("rate_wait_s", default=None)
+
+
+class TokenBucket:
+    """`rate` tokens per second up to `burst`; callers reserve tokens and sleep off any shortfall."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.throttled = 0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, cost: float, max_wait: float) -> Optional[float]:
+        """Seconds to sleep before the call may go out, or None (nothing taken) if that exceeds max_wait."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max(0.0, (cost - self.tokens) / self.rate)
+            if wait > max_wait:
+                return None
+            self.tokens -= cost
+            if wait:
+                self.throttled += 1
+            return wait
+
+    def refund(self, cost: float) -> None:
+        """Return a reservation whose call never went out."""
+        with self._lock:
+            self.tokens = min(self.burst, self.tokens + cost)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"ratePerS": round(self.rate, 4), "burst": self.burst, "tokens": round(self.tokens, 2), "throttled": self.throttled}
+
+
+class _BulkheadStats:
+    def __init__(self, name: str, limit: int, queue: int):
+        self.name = name
+        self.limit = limit
+        self.queue = queue
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "queue": self.queue,
+            "active": self.active,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+        }
+
+
+class Bulkhead(_BulkheadStats):
+    """Thread-side concurrency pool for one upstream; raises BulkheadFull instead of piling up."""
+
+    def __init__(
+        self, name: str, limit: int, queue: int, wait_s: float = BULKHEAD_WAIT_S, bucket: Optional[TokenBucket] = None
+    ):
+        super().__init__(name, limit, queue)
+        self.wait_s = wait_s
+        self.bucket = bucket
+        self._cond = threading.Condition()
+
+    def stats(self) -> Dict[str, Any]:
+        out = super().stats()
+        if self.bucket is not None:
+            out["rateLimit"] = self.bucket.stats()
+        return out
+
+    @contextmanager
+    def slot(self, cost: float = 1.0):
+        """One upstream call (`cost` calls for a batched download); throttled first, then concurrency-limited.
+
+        Tokens are only spent on calls that go out: a call the pool turns away refunds its reservation.
+        """
+        if self.bucket is not None:
+            budget = _RATE_WAIT_S.get()  # 0 is a real budget (don't queue), only None means unset
+            wait = self.bucket.reserve(cost, self.wait_s if budget is None else budget)
+            if wait is None:
+                with self._cond:
+                    self.rejected += 1
+                raise BulkheadFull(self.name, "rate limited")
+            if wait:
+                time.sleep(wait)
+        with self._cond:
+            if self.active >= self.limit:
+                acquired = False
+                if self.waiting < self.queue:
+                    self.waiting += 1
+                    try:
+                        acquired = self._cond.wait_for(lambda: self.active < self.limit, timeout=self.wait_s)
+                    finally:
+                        self.waiting -= 1
+                if not acquired:
+                    self.rejected += 1
+                    if self.bucket is not None:
+                        self.bucket.refund(cost)
+                    raise BulkheadFull(self.name)
+            self.active += 1
+        try:
+            yield
+        finally:
+            self.release()
+
+    def try_acquire(self, spare: int = 0) -> bool:
+        """Take a slot only if one is free now with `spare` more left over; never queues or waits for tokens.
+
+        Pair a True result with release(). For optional extra calls (hedges) that should use idle capacity only.
+        """
+        if self.bucket is not None and self.bucket.reserve(1.0, 0) is None:
+            return False
+        with self._cond:
+            if self.active + spare < self.limit:
+                self.active += 1
+                return True
+        if self.bucket is not None:
+            self.bucket.refund(1.0)
+        return False
+
+    def release(self) -> None:
+        with self._cond:
+            self.active -= 1
+            self._cond.notify()
+
+
+class AsyncBulkhead(_BulkheadStats):
+    """Event-loop-side pool for an endpoint class; waiting here doesn't hold a worker thread."""
+
+    def __init__(self, name: str, limit: int, queue: int, wait_s: float = BULKHEAD_WAIT_S):
+        super().__init__(name, limit, queue)
+        self.wait_s = wait_s
+        self._sem = asyncio.Semaphore(limit)
+
+    async def acquire(self) -> bool:
+        if self._sem.locked() and self.waiting >= self.queue:
+            self.rejected += 1
+            return False
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._sem.acquire(), timeout=self.wait_s)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            return False
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        return True
+
+    def release(self) -> None:
+        self.active -= 1
+        self._sem.release()
+
+
+ENDPOINT_BULKHEADS: Dict[str, AsyncBulkhead] = {
+    name: AsyncBulkhead(name, limit, queue)
+    for name, (limit, queue) in {
+        **_parse_pool_spec(DEFAULT_ENDPOINT_POOLS),
+        **_parse_pool_spec(os.getenv("TICKER_LAB_ENDPOINT_POOLS", "")),
+    }.items()
+}
+# Per-upstream call budgets, e.g. "polygon=5/60,yahoo=120/60" (calls/seconds); unset means unthrottled
+UPSTREAM_RATES = _parse_rate_spec(os.getenv("TICKER_LAB_UPSTREAM_RATES", ""))
+UPSTREAM_BULKHEADS: Dict[str, Bulkhead] = {
+    name: Bulkhead(name, limit, queue, bucket=TokenBucket(*UPSTREAM_RATES[name]) if name in UPSTREAM_RATES else None)
+    for name, (limit, queue) in {
+        **_parse_pool_spec(DEFAULT_UPSTREAM_POOLS),
+        **_parse_pool_spec(os.getenv("TICKER_LAB_UPSTREAM_POOLS", "")),
+    }.items()
+}
+# Sync handlers share anyio's thread limiter; size it to hold every endpoint pool at once.
+THREADPOOL_SIZE = int(
+    os.getenv("TICKER_LAB_THREADPOOL_SIZE", str(max(40, sum(b.limit for b in ENDPOINT_BULKHEADS.values()))))
+)
+
+
+class BulkheadMiddleware:
+    """Admit each request through its endpoint-class pool; reply 503 right away when it is full."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if scope["type"] != "http" or path in BULKHEAD_EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        pool = ENDPOINT_BULKHEADS.get(ENDPOINT_CLASSES.get(path, "default"))
+        if pool is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await pool.acquire():
+            logger.warning("endpoint bulkhead rejected request", extra={"pool": pool.name, "path": path})
+            response = FastJSONResponse(
+                {"detail": f"Too many concurrent {pool.name} requests, retry shortly"},
+                status_code=503,
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            pool.release()
+
+
+# Innermost frames that mean "parked": a thread stopped here with no app frame on its stack is idle
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("connection.py", "wait"),
+    ("connection.py", "_poll"),
+    ("connection.py", "_recv"),
+}
+_APP_FILES = {os.path.abspath(__file__), os.path.abspath(parsers.__file__)}
+
+
+def _frame_label(code) -> str:
+    path = code.co_filename
+    _, sep, rest = path.rpartition("site-packages" + os.sep)
+    return f"{code.co_name} ({rest if sep else os.path.basename(path)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Poll every thread's stack with sys._current_frames() and count them as folded stacks.
+
+    Runs on its own thread only while a capture is active, so nothing is paid when nobody profiles.
+    The output is Brendan Gregg's collapsed format (`thread;outer;...;inner count`), ready for
+    flamegraph.pl or speedscope. HTML parsing runs in the parse pool's processes, so it shows up
+    as the request thread waiting in _run_parser.
+    """
+
+    def __init__(self, interval_ms: float = PROFILE_INTERVAL_MS):
+        self.interval = max(0.001, interval_ms / 1000.0)
+        self.counts: Dict[str, int] = {}
+        self.samples = 0
+        self.started = 0.0
+        self.ms = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        self.started = time.time()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.ms = round((time.time() - self.started) * 1000, 1)
+        return self
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != me:
+                    self._record(names.get(ident, str(ident)), frame)
+            self.samples += 1
+
+    def _record(self, thread_name: str, frame) -> None:
+        top = frame.f_code
+        idle = (os.path.basename(top.co_filename), top.co_name) in _IDLE_FRAMES
+        stack: List[str] = []
+        while frame is not None:
+            code = frame.f_code
+            idle = idle and code.co_filename not in _APP_FILES
+            stack.append(_frame_label(code))
+            frame = frame.f_back
+        if idle:
+            return
+        stack.append(re.sub(r"[_-]?\d+$", "", thread_name) or thread_name)
+        key = ";".join(reversed(stack))
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def folded(self) -> str:
+        return "\n".join(f"{stack} {n}" for stack, n in sorted(self.counts.items())) + "\n"
+
+
+# Finished profiles, newest last; GET /admin/profiles lists them
+PROFILES: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_PROFILE_ACTIVE = threading.Semaphore(1)  # one capture at a time keeps the overhead bounded
+
+
+def _store_profile(profiler: SamplingProfiler, source: str, profile_id: Optional[str] = None) -> Dict[str, Any]:
+    record = {
+        "id": profile_id or uuid.uuid4().hex[:12],
+        "source": source,
+        "startedAt": datetime.fromtimestamp(profiler.started, timezone.utc).isoformat(timespec="seconds"),
+        "ms": profiler.ms,
+        "samples": profiler.samples,
+        "intervalMs": round(profiler.interval * 1000, 2),
+        "stacks": len(profiler.counts),
+        "folded": profiler.folded(),
+    }
+    PROFILES[record["id"]] = record
+    while len(PROFILES) > PROFILE_KEEP:
+        PROFILES.popitem(last=False)
+    if PROFILE_DIR:
+        try:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            with open(os.path.join(PROFILE_DIR, f"{record['id']}.folded"), "w", encoding="utf-8") as f:
+                f.write(record["folded"])
+        except OSError:
+            logger.exception("profile write failed", extra={"dir": PROFILE_DIR})
+    logger.info("profile captured", extra={k: v for k, v in record.items() if k != "folded"})
+    return record
+
+
+class ProfilingMiddleware:
+    """Profile one request when it carries `X-Profile: 1` and a valid X-Admin-Token.
+
+    Only installed when TICKER_LAB_ADMIN_TOKEN is set. The response gets X-Profile-Id (fetch the
+    stacks from /admin/profiles/{id}); every thread busy during the request is sampled, so
+    concurrent requests show up too.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+        if not _PROFILE_ACTIVE.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex[:12]
+        profiler = SamplingProfiler().start()
+        source = scope.get("path", "") + (f"?{scope['query_string'].decode('latin-1')}" if scope.get("query_string") else "")
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                # The stacks are only complete once the body is sent; the id is reserved up front
+                MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profiler.stop()
+            _PROFILE_ACTIVE.release()
+            _store_profile(profiler, source, profile_id)
+
+    @staticmethod
+    def _wanted(scope) -> bool:
+        flag = token = None
+        for key, value in scope["headers"]:
+            if key == b"x-profile":
+                flag = value
+            elif key == b"x-admin-token":
+                token = value
+        if flag is None or flag in (b"0", b"false") or token is None:
+            return False
+        return hmac.compare_digest(token, ADMIN_TOKEN.encode())
+
+
+class LogContextMiddleware:
+    """Expose the request path to LogSampler; the contextvar follows the handler into its worker thread."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            _LOG_PATH.set(scope.get("path", ""))
+        await self.app(scope, receive, send)
+
+
+app = FastAPI(title=APP_NAME, default_response_class=FastJSONResponse)
+app.router.route_class = FastJSONRoute
+
+app.add_middleware(BulkheadMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -42,12 +1350,165 @@ app.add_middleware(
     allow_methods=["*"] ,
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(LogContextMiddleware)
+if ADMIN_TOKEN:
+    app.add_middleware(ProfilingMiddleware)
+
+
+@app.on_event("startup")
+async def _size_threadpool():
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+
+
+@app.on_event("shutdown")
+def _shutdown_parse_pool():
+    global _PARSE_POOL
+    with _PARSE_POOL_LOCK:
+        if _PARSE_POOL is not None:
+            _PARSE_POOL.shutdown(wait=False, cancel_futures=True)
+            _PARSE_POOL = None
+
+
+# NASDAQ Trader otherlisted.txt exchange codes
+_NASDAQ_TRADER_EXCHANGES = {"A": "AMEX", "N": "NYSE", "P": "ARCA", "Z": "BATS", "V": "IEX"}
+
+
+class SymbolMaster:
+    """In-memory index of listed symbols: O(1) lookups plus sorted-array prefix search.
+
+    Rows live in parallel lists sorted by symbol; exchanges and types are interned
+    into small tables so each row costs a few list slots.
+    """
+
+    def __init__(self):
+        self.symbols: List[str] = []
+        self.names: List[str] = []
+        self._exchange_ids: List[int] = []
+        self._type_ids: List[int] = []
+        self._exchanges: List[str] = []
+        self._types: List[str] = []
+        self._pos: Dict[str, int] = {}
+        # (lowercased name, row) sorted, for company-name autocomplete
+        self._name_keys: List[Tuple[str, int]] = []
+        self.sources: List[str] = []
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self.symbols)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @staticmethod
+    def _read_rows(path: str) -> List[Tuple[str, str, str, str]]:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            head = f.readline()
+            f.seek(0)
+            delimiter = "|" if head.count("|") > head.count(",") else ","
+            rows: List[Tuple[str, str, str, str]] = []
+            for rec in csv.DictReader(f, delimiter=delimiter):
+                rec = {(k or "").strip().lower(): (v or "").strip() for k, v in rec.items()}
+                symbol = rec.get("symbol") or rec.get("act symbol") or rec.get("ticker") or ""
+                # NASDAQ Trader files end with a "File Creation Time" footer and flag test issues
+                if not symbol or symbol.startswith("File Creation Time") or rec.get("test issue") == "Y":
+                    continue
+                if "market category" in rec:
+                    exchange = "NASDAQ"
+                else:
+                    exchange = rec.get("exchange", "")
+                    exchange = _NASDAQ_TRADER_EXCHANGES.get(exchange, exchange)
+                name = rec.get("name") or rec.get("security name") or ""
+                sec_type = rec.get("type") or ("ETF" if rec.get("etf") == "Y" else "EQUITY")
+                rows.append((symbol.upper(), exchange.upper(), name, sec_type.upper()))
+            return rows
+
+    def load(self, paths: List[str]) -> None:
+        merged: Dict[str, Tuple[str, str, str]] = {}
+        for path in paths:
+            for symbol, exchange, name, sec_type in self._read_rows(path):
+                merged.setdefault(symbol, (exchange, name, sec_type))
+
+        exchanges: Dict[str, int] = {}
+        types: Dict[str, int] = {}
+        symbols = sorted(merged)
+        self.symbols = symbols
+        self.names = [merged[s][1] for s in symbols]
+        self._exchange_ids = [exchanges.setdefault(merged[s][0], len(exchanges)) for s in symbols]
+        self._type_ids = [types.setdefault(merged[s][2], len(types)) for s in symbols]
+        self._exchanges = list(exchanges)
+        self._types = list(types)
+        self._pos = {s: i for i, s in enumerate(symbols)}
+        self._name_keys = sorted((n.lower(), i) for i, n in enumerate(self.names) if n)
+        self.sources = list(paths)
+
+    def _row(self, i: int) -> Dict[str, Any]:
+        return {
+            "symbol": self.symbols[i],
+            "exchange": self._exchanges[self._exchange_ids[i]] or None,
+            "name": self.names[i] or None,
+            "type": self._types[self._type_ids[i]] or None,
+        }
+
+    def _index(self, symbol: str) -> Optional[int]:
+        # Share classes are "BRK.B" in exchange files but "BRK-B" on Yahoo
+        for variant in (symbol, symbol.replace("-", "."), symbol.replace(".", "-")):
+            i = self._pos.get(variant)
+            if i is not None:
+                return i
+        return None
+
+    def __contains__(self, symbol: str) -> bool:
+        return self._index(symbol) is not None
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        i = self._index(symbol)
+        return self._row(i) if i is not None else None
+
+    def exchange(self, symbol: str) -> Optional[str]:
+        i = self._index(symbol)
+        return (self._exchanges[self._exchange_ids[i]] or None) if i is not None else None
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Symbols starting with the query first, then company names starting with it."""
+        rows: List[int] = []
+        prefix = query.strip().upper()
+        if prefix:
+            i = bisect.bisect_left(self.symbols, prefix)
+            while i < len(self.symbols) and len(rows) < limit and self.symbols[i].startswith(prefix):
+                rows.append(i)
+                i += 1
+
+        name_prefix = query.strip().lower()
+        if name_prefix and len(rows) < limit:
+            j = bisect.bisect_left(self._name_keys, (name_prefix, -1))
+            while j < len(self._name_keys) and len(rows) < limit and self._name_keys[j][0].startswith(name_prefix):
+                if self._name_keys[j][1] not in rows:
+                    rows.append(self._name_keys[j][1])
+                j += 1
+        return [self._row(i) for i in rows]
+
+
+SYMBOL_MASTER = SymbolMaster()
+
+
+def _load_symbol_master():
+    if not SYMBOL_MASTER_PATHS:
+        return
+    try:
+        SYMBOL_MASTER.load(SYMBOL_MASTER_PATHS)
+        logger.info("symbol master loaded", extra={"symbols": len(SYMBOL_MASTER), "paths": SYMBOL_MASTER_PATHS})
+    except Exception:
+        logger.exception("symbol master load failed", extra={"paths": SYMBOL_MASTER_PATHS})
 
 
 def _clean_symbol(symbol: str) -> str:
     s = symbol.strip().upper()
     if not re.fullmatch(r"[A-Z0-9.\-]{1,15}", s):
         raise HTTPException(status_code=400, detail="Invalid symbol")
+    # Unknown tickers stop here instead of costing a round of upstream calls
+    if SYMBOL_MASTER_STRICT and SYMBOL_MASTER.loaded and s not in SYMBOL_MASTER:
+        raise HTTPException(status_code=404, detail=f"Unknown symbol {s}")
     return s
 
 
@@ -75,19 +1536,38 @@ def _safe_get(d: Dict[str, Any], key: str) -> Any:
     return d.get(key) if isinstance(d, dict) else None
 
 
-def _parse_human_number(text: str) -> Optional[float]:
-    if not text:
-        return None
-    s = text.strip().replace(",", "")
-    m = re.fullmatch(r"(-?[0-9]*\.?[0-9]+)\s*([KMBT])?", s, flags=re.IGNORECASE)
-    if not m:
-        return None
+def _parse_pool() -> ProcessPoolExecutor:
+    global _PARSE_POOL
+    with _PARSE_POOL_LOCK:
+        if _PARSE_POOL is None:
+            # spawn: workers import only parsers.py, never a copy of this threaded process
+            _PARSE_POOL = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _PARSE_POOL
+
+
+def _run_parser(fn, resp: httpx.Response) -> Any:
+    """Run an extractor from parsers.py over the raw response bytes in the parse pool.
+
+    With TICKER_LAB_PARSE_WORKERS=0 (or a broken pool) the extractor runs inline. A parse that
+    overruns TICKER_LAB_PARSE_TIMEOUT_S is abandoned and the extractor's empty result returned.
+    """
+    if PARSE_WORKERS <= 0:
+        return fn(resp.content, resp.encoding)
+    global _PARSE_POOL
     try:
-        num = float(m.group(1))
-    except Exception:
-        return None
-    mult = {"K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}.get((m.group(2) or "").upper(), 1.0)
-    return num * mult
+        future = _parse_pool().submit(fn, resp.content, resp.encoding)
+        return future.result(timeout=PARSE_TIMEOUT_S)
+    except FutureTimeout:
+        future.cancel()  # drops it if still queued; a parse already running finishes unobserved
+        logger.warning("parse timed out", extra={"parser": fn.__name__, "timeoutS": PARSE_TIMEOUT_S, "url": str(resp.url)})
+        return parsers.EMPTY_RESULTS[fn.__name__]()
+    except BrokenProcessPool:
+        logger.warning("parse pool broken, recreating", extra={"parser": fn.__name__})
+        with _PARSE_POOL_LOCK:
+            _PARSE_POOL = None
+        return fn(resp.content, resp.encoding)
 
 
 def _polygon_key() -> str:
@@ -96,30 +1576,26 @@ def _polygon_key() -> str:
     return POLYGON_API_KEY
 
 
+@read_through("polygon_profile", lambda symbol: (symbol,))
 def fetch_polygon_profile(symbol: str) -> Dict[str, Any]:
-    cache_key = ("polygon_profile", symbol)
-    if cache_key in PROFILE_CACHE:
-        return PROFILE_CACHE[cache_key]
-
     key = _polygon_key()
     url = f"https://api.polygon.io/v3/reference/tickers/{symbol}"
     params = {"apiKey": key}
     try:
-        with httpx.Client(timeout=15.0) as client:
+        with UPSTREAM_BULKHEADS["polygon"].slot(), httpx.Client(timeout=15.0) as client:
             resp = client.get(url, params=params)
             if resp.status_code != 200:
-                PROFILE_CACHE[cache_key] = {"ok": False, "error": f"Polygon status {resp.status_code}"}
-                return PROFILE_CACHE[cache_key]
+                return {"ok": False, "error": f"Polygon status {resp.status_code}"}
             data = resp.json() if resp.text else {}
+    except BulkheadFull as e:
+        raise Uncached({"ok": False, "error": str(e)})
     except Exception as e:
         logger.exception("polygon profile request failed", extra={"symbol": symbol})
-        PROFILE_CACHE[cache_key] = {"ok": False, "error": f"Polygon exception {type(e).__name__}"}
-        return PROFILE_CACHE[cache_key]
+        return {"ok": False, "error": f"Polygon exception {type(e).__name__}"}
 
     results = data.get("results") if isinstance(data, dict) else None
     if not isinstance(results, dict):
-        PROFILE_CACHE[cache_key] = {"ok": False, "error": "Polygon results missing"}
-        return PROFILE_CACHE[cache_key]
+        return {"ok": False, "error": "Polygon results missing"}
 
     payload = {
         "ok": True,
@@ -137,7 +1613,6 @@ def fetch_polygon_profile(symbol: str) -> Dict[str, Any]:
         "sourceUrl": f"https://polygon.io/stocks/{symbol}",
     }
 
-    PROFILE_CACHE[cache_key] = payload
     return payload
 
 
@@ -151,26 +1626,30 @@ def _map_exchange_to_google(exchange: Optional[str]) -> Optional[str]:
         "XNYS": "NYSE", "NYSE": "NYSE", "NYQ": "NYSE",
         "XASE": "NYSEAMERICAN", "AMEX": "NYSEAMERICAN", "ASE": "NYSEAMERICAN",
         "XBOS": "NYSEARCA", "ARCA": "NYSEARCA", "PCX": "NYSEARCA",
+        "BATS": "BATS", "BZX": "BATS",
     }
     return mapping.get(ex)
 
 
-def fetch_google_finance_ebitda(symbol: str, exchange: Optional[str]) -> Dict[str, Any]:
-    cache_key = ("google_finance_ebitda", symbol, exchange)
-    if cache_key in PROFILE_CACHE:
-        return PROFILE_CACHE[cache_key]
-
-    exch = _map_exchange_to_google(exchange)
-
-    candidates = []
-    if exch:
-        candidates.append(f"{symbol}:{exch}")
-    # Common US exchanges as fallback
-    for fb in ["NASDAQ", "NYSE", "NYSEAMERICAN"]:
-        cand = f"{symbol}:{fb}"
-        if cand not in candidates:
-            candidates.append(cand)
-
+def _run_coroutine(coro):
+    """Run a coroutine to completion from sync code, even on a thread that already has a loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        return ex.submit(asyncio.run, coro).result()
+
+
+async def _race_google_candidates(candidates: List[str]) -> Tuple[Optional[float], Optional[str]]:
+    """Hedged race over Google Finance quote pages.
+
+    The first candidate starts alone on the caller's google slot. When a probe misses, the next
+    candidate takes over its slot; when GOOGLE_HEDGE_DELAY_S passes without an answer, the next
+    one joins only if the google pool has a slot to spare, so a race never fills the pool. The
+    first page that yields EBITDA wins and the remaining probes are cancelled.
+    """
+    pool = UPSTREAM_BULKHEADS["google"]
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
         "Accept-Language": "en-US,en;q=0.9",
@@ -179,62 +1658,120 @@ def fetch_google_finance_ebitda(symbol: str, exchange: Optional[str]) -> Dict[st
         "CONSENT": "YES+cb.20210720-07-p0.en+FX+111",
         "SOCS": "CAISHAgCEhJnd3NfMjAyMzA4MTAtMF9SQzIaAmVuIAEaBgiAo_CmBg",
     }
-    for c in candidates:
-        url = f"https://www.google.com/finance/quote/{c}?gl=US&hl=en"
+
+    async with httpx.AsyncClient(timeout=15.0, headers=headers, follow_redirects=True, cookies=cookies) as client:
+
+        async def probe(candidate: str) -> Optional[float]:
+            resp = await client.get(f"https://www.google.com/finance/quote/{candidate}?gl=US&hl=en")
+            if resp.status_code != 200:
+                return None
+            return await asyncio.to_thread(_run_parser, parsers.scan_google_finance_ebitda, resp)
+
+        remaining = list(candidates)
+        running: Dict[asyncio.Task, str] = {}
+        hedges: Set[asyncio.Task] = set()  # probes holding a google slot of their own
+
+        def launch(hedge: bool) -> None:
+            cand = remaining.pop(0)
+            task = asyncio.create_task(probe(cand))
+            running[task] = cand
+            if hedge:
+                hedges.add(task)
+
+        launch(hedge=False)
         try:
-            with httpx.Client(timeout=15.0, headers=headers, follow_redirects=True, cookies=cookies) as client:
-                resp = client.get(url)
-                if resp.status_code != 200:
+            while running:
+                done, _ = await asyncio.wait(
+                    running,
+                    timeout=GOOGLE_HEDGE_DELAY_S if remaining else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    if pool.try_acquire(spare=1):
+                        launch(hedge=True)
                     continue
-                html = resp.text
-        except Exception:
-            continue
+                for task in done:
+                    cand = running.pop(task)
+                    hedge = task in hedges
+                    hedges.discard(task)
+                    ebitda = None if task.cancelled() or task.exception() else task.result()
+                    if ebitda is None and remaining:
+                        launch(hedge)
+                        continue
+                    if hedge:
+                        pool.release()
+                    if ebitda is not None:
+                        return ebitda, cand
+            return None, None
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            for _ in hedges:
+                pool.release()
+
+
+@read_through("google_finance_ebitda", lambda symbol, exchange: (symbol, exchange))
+def fetch_google_finance_ebitda(symbol: str, exchange: Optional[str]) -> Dict[str, Any]:
+    exch = _map_exchange_to_google(exchange)
 
-        # Try multiple regex patterns for EBITDA extraction
-        ebitda_patterns = [
-            r"EBITDA[^<]*?<[^>]*>([0-9.,]+\s*[KMBT]?)\s*(USD)?",
-            r">EBITDA<[^>]*>\s*(?:<[^>]*>)*\s*([0-9.,]+\s*[KMBT]?)",
-            r"EBITDA\s*</[^>]+>\s*<[^>]+>\s*([0-9.,]+\s*[KMBT]?)",
-            r"EBITDA\s*([0-9.,]+\s*[KMBT]?)",
-            r"data-[^>]*EBITDA[^>]*>([0-9.,]+\s*[KMBT]?)<",
-        ]
-        for pattern in ebitda_patterns:
-            m = re.search(pattern, html, re.IGNORECASE | re.DOTALL)
-            if m:
-                ebitda = _parse_human_number(m.group(1).replace(" ", "").strip())
-                if ebitda is not None:
-                    logger.info("google finance EBITDA found", extra={"symbol": symbol, "url": url, "ebitda": ebitda})
-                    payload = {"ok": True, "ebitda": ebitda, "sourceUrl": url, "error": None}
-                    PROFILE_CACHE[cache_key] = payload
-                    return payload
+    candidates = []
+    # The exchange that answered last time goes straight to the front
+    remembered = GOOGLE_EXCHANGE_MEMO.get((symbol,))
+    if remembered:
+        candidates.append(remembered)
+    # Then the local symbol master's listing exchange, then the upstream-reported one
+    for guess in (_map_exchange_to_google(SYMBOL_MASTER.exchange(symbol)), exch):
+        if guess and f"{symbol}:{guess}" not in candidates:
+            candidates.append(f"{symbol}:{guess}")
+    # Common US exchanges as fallback
+    for fb in ["NASDAQ", "NYSE", "NYSEAMERICAN"]:
+        cand = f"{symbol}:{fb}"
+        if cand not in candidates:
+            candidates.append(cand)
+
+    try:
+        with UPSTREAM_BULKHEADS["google"].slot():
+            ebitda, winner = _run_coroutine(_race_google_candidates(candidates))
+    except BulkheadFull as e:
+        # Don't cache: the page may well have EBITDA once Google traffic drains.
+        raise Uncached({"ok": False, "ebitda": None, "sourceUrl": None, "error": str(e)})
+    except Exception:
+        logger.exception("google finance race failed", extra={"symbol": symbol})
+        ebitda, winner = None, None
+
+    if ebitda is not None and winner:
+        url = f"https://www.google.com/finance/quote/{winner}?gl=US&hl=en"
+        GOOGLE_EXCHANGE_MEMO[(symbol,)] = winner
+        log_event("google finance EBITDA found", lambda: {"symbol": symbol, "url": url, "ebitda": ebitda})
+        payload = {"ok": True, "ebitda": ebitda, "sourceUrl": url, "error": None}
+        return payload
 
     payload = {"ok": False, "ebitda": None, "sourceUrl": None, "error": "EBITDA not found in Google Finance"}
-    PROFILE_CACHE[cache_key] = payload
     return payload
 
 
 def fetch_finviz_ebitda(symbol: str) -> Optional[float]:
     """Try to extract EBITDA from Finviz snapshot table only (avoids false positives)."""
-    soup, _url, _err = _fetch_finviz_soup(symbol)
-    if soup is None:
+    try:
+        page, _url, _err = _fetch_finviz_page(symbol)
+    except BulkheadFull:
+        return None
+    if page is None:
         return None
     # Only trust the structured snapshot table, not full-text regex
-    for table in soup.find_all("table", class_="snapshot-table2"):
-        cells = table.find_all("td")
-        for i in range(0, len(cells) - 1, 2):
-            label = cells[i].get_text(strip=True)
-            if label.upper() == "EBITDA":
-                val = cells[i + 1].get_text(strip=True)
-                if val and val != "-":
-                    return _parse_human_number(val)
+    for label, val in page["snapshot"].items():
+        if label.upper() == "EBITDA":
+            if val and val != "-":
+                return _parse_human_number(val)
     return None
 
 
-def _fetch_finviz_soup(symbol: str) -> Tuple[Optional[BeautifulSoup], str, Optional[str]]:
-    """Fetch and cache the Finviz HTML page for a symbol."""
-    cache_key = ("finviz_html", symbol)
-    if cache_key in PROFILE_CACHE:
-        return PROFILE_CACHE[cache_key]
+@read_through("finviz_page", lambda symbol: (symbol,))
+def _fetch_finviz_page(symbol: str) -> Tuple[Optional[Dict[str, Any]], str, Optional[str]]:
+    """Fetch the Finviz quote page for a symbol and cache its parsed contents.
+    Raises BulkheadFull (uncached) when the Finviz pool is saturated.
+    """
 
     url = f"https://finviz.com/quote.ashx?t={symbol}&p=d"
     headers = {
@@ -244,30 +1781,31 @@ def _fetch_finviz_soup(symbol: str) -> Tuple[Optional[BeautifulSoup], str, Optio
         "Referer": "https://finviz.com/",
     }
     try:
-        with httpx.Client(timeout=20.0, headers=headers, follow_redirects=True) as client:
+        with UPSTREAM_BULKHEADS["finviz"].slot(), httpx.Client(
+            timeout=20.0, headers=headers, follow_redirects=True
+        ) as client:
             resp = client.get(url)
             if resp.status_code != 200:
                 result = (None, url, f"HTTP {resp.status_code}")
-                PROFILE_CACHE[cache_key] = result
                 return result
-            soup = BeautifulSoup(resp.text, "html.parser")
-            result = (soup, url, None)
-            PROFILE_CACHE[cache_key] = result
+            page = {**_run_parser(parsers.parse_finviz_page, resp), "fetchedAt": time.time()}
+            result = (page, url, None)
             return result
+    except BulkheadFull:
+        raise
     except Exception as e:
         logger.exception("finviz page fetch failed", extra={"symbol": symbol})
         result = (None, url, f"Exception {type(e).__name__}")
-        PROFILE_CACHE[cache_key] = result
         return result
 
 
+@read_through("finviz_profile", lambda symbol: (symbol,))
 def fetch_finviz_profile(symbol: str) -> Dict[str, Any]:
     """Scrape comprehensive profile from Finviz: Exchange, Sector, Industry, Country, Market Cap, Float, Short %."""
-    cache_key = ("finviz_profile", symbol)
-    if cache_key in PROFILE_CACHE:
-        return PROFILE_CACHE[cache_key]
-
-    soup, url, fetch_err = _fetch_finviz_soup(symbol)
+    try:
+        page, url, fetch_err = _fetch_finviz_page(symbol)
+    except BulkheadFull as e:
+        raise Uncached({"ok": False, "symbol": symbol, "sourceUrl": None, "error": str(e)})
 
     result: Dict[str, Any] = {
         "ok": False,
@@ -283,34 +1821,12 @@ def fetch_finviz_profile(symbol: str) -> Dict[str, Any]:
         "error": fetch_err,
     }
 
-    if soup is None:
-        PROFILE_CACHE[cache_key] = result
+    if page is None:
         return result
 
-    # --- Snapshot table (financial metrics) ---
-    snapshot: Dict[str, str] = {}
-    for table in soup.find_all("table", class_="snapshot-table2"):
-        cells = table.find_all("td")
-        for i in range(0, len(cells) - 1, 2):
-            label = cells[i].get_text(strip=True)
-            value = cells[i + 1].get_text(strip=True)
-            if label:
-                snapshot[label] = value
-
-    # --- Header links (Sector | Industry | Country | Exchange) ---
-    for a in soup.find_all("a", class_="tab-link"):
-        href = a.get("href", "")
-        text = a.get_text(strip=True)
-        if not text or text == "-":
-            continue
-        if "f=sec_" in href:
-            result["sector"] = text
-        elif "f=ind_" in href:
-            result["industry"] = text
-        elif "f=geo_" in href:
-            result["country"] = text
-        elif "f=exch_" in href:
-            result["exchange"] = text
+    snapshot: Dict[str, str] = page["snapshot"]
+    # Header links (Sector | Industry | Country | Exchange)
+    result.update(page["links"])
 
     # Exchange fallback from snapshot Index field
     if not result["exchange"]:
@@ -338,19 +1854,13 @@ def fetch_finviz_profile(symbol: str) -> Dict[str, Any]:
             except Exception:
                 pass
 
-    # Fallback: regex on full text
+    # Fallback: regex on full text (done by the parser)
     if result["shortInterestPercent"] is None:
-        text = soup.get_text(" ")
-        m = re.search(r"Short Float\s*([0-9.]+)%", text, re.IGNORECASE)
-        if m:
-            try:
-                result["shortInterestPercent"] = float(m.group(1))
-            except Exception:
-                pass
+        result["shortInterestPercent"] = page["textShortFloat"]
 
-    logger.info(
+    log_event(
         "finviz profile scraped",
-        extra={
+        lambda: {
             "symbol": symbol,
             "exchange": result["exchange"],
             "sector": result["sector"],
@@ -368,24 +1878,17 @@ def fetch_finviz_profile(symbol: str) -> Dict[str, Any]:
         for k in ["exchange", "sector", "industry", "country", "marketCap", "float", "shortInterestPercent"]
     )
 
-    PROFILE_CACHE[cache_key] = result
     return result
 
 
+@read_through("finviz_news", lambda symbol: (symbol,))
 def fetch_finviz_news(symbol: str) -> List[Dict[str, Any]]:
     """Scrape recent news headlines from Finviz news table."""
-    cache_key = ("finviz_news", symbol)
-    if cache_key in PROFILE_CACHE:
-        return PROFILE_CACHE[cache_key]
-
-    soup, _url, _err = _fetch_finviz_soup(symbol)
-    if soup is None:
-        PROFILE_CACHE[cache_key] = []
-        return []
-
-    news_table = soup.find("table", id="news-table")
-    if not news_table:
-        PROFILE_CACHE[cache_key] = []
+    try:
+        page, _url, _err = _fetch_finviz_page(symbol)
+    except BulkheadFull:
+        raise Uncached([])
+    if page is None or not page["news"]:
         return []
 
     items: List[Dict[str, Any]] = []
@@ -393,21 +1896,7 @@ def fetch_finviz_news(symbol: str) -> List[Dict[str, Any]]:
     today = datetime.utcnow().date()
     cutoff = today - timedelta(days=3)
 
-    for row in news_table.find_all("tr"):
-        cells = row.find_all("td")
-        if len(cells) < 2:
-            continue
-
-        date_cell = cells[0].get_text(strip=True)
-        link_el = cells[1].find("a")
-        if not link_el:
-            continue
-
-        title = link_el.get_text(strip=True)
-        href = link_el.get("href", "")
-        source_span = cells[1].find("span")
-        source = source_span.get_text(strip=True).strip("()") if source_span else "Finviz"
-
+    for date_cell, title, href, source in page["news"]:
         # Date parsing: "Feb-20-26 09:30AM" or just "09:30AM"
         date_match = re.match(r"([A-Z][a-z]{2}-\d{2}-\d{2})", date_cell)
         if date_match:
@@ -432,36 +1921,31 @@ def fetch_finviz_news(symbol: str) -> List[Dict[str, Any]]:
             "publishedAt": pub_date.isoformat() if pub_date else None,
         })
 
-    PROFILE_CACHE[cache_key] = items
     return items
 
 
+@read_through("polygon_news", lambda symbol: (symbol,))
 def fetch_polygon_news(symbol: str) -> Dict[str, Any]:
-    cache_key = ("polygon_news", symbol)
-    if cache_key in PROFILE_CACHE:
-        return PROFILE_CACHE[cache_key]
-
     key = _polygon_key()
     url = "https://api.polygon.io/v2/reference/news"
     params = {"ticker": symbol, "limit": 10, "order": "desc", "sort": "published_utc", "apiKey": key}
     try:
-        with httpx.Client(timeout=20.0) as client:
+        with UPSTREAM_BULKHEADS["polygon"].slot(), httpx.Client(timeout=20.0) as client:
             resp = client.get(url, params=params)
             if resp.status_code != 200:
                 payload = {"ok": False, "items": [], "error": f"Polygon news status {resp.status_code}"}
-                PROFILE_CACHE[cache_key] = payload
                 return payload
             data = resp.json() if resp.text else {}
+    except BulkheadFull as e:
+        raise Uncached({"ok": False, "items": [], "error": str(e)})
     except Exception as e:
         logger.exception("polygon news request failed", extra={"symbol": symbol})
         payload = {"ok": False, "items": [], "error": f"Polygon news exception {type(e).__name__}"}
-        PROFILE_CACHE[cache_key] = payload
         return payload
 
     results = data.get("results") if isinstance(data, dict) else None
     if not isinstance(results, list):
         payload = {"ok": False, "items": [], "error": "Polygon news results missing"}
-        PROFILE_CACHE[cache_key] = payload
         return payload
 
     items = []
@@ -479,15 +1963,11 @@ def fetch_polygon_news(symbol: str) -> Dict[str, Any]:
         )
 
     payload = {"ok": True, "items": items, "error": None}
-    PROFILE_CACHE[cache_key] = payload
     return payload
 
 
+@read_through("polygon_financials", lambda symbol: (symbol,))
 def fetch_polygon_financials(symbol: str) -> Dict[str, Any]:
-    cache_key = ("polygon_financials", symbol)
-    if cache_key in PROFILE_CACHE:
-        return PROFILE_CACHE[cache_key]
-
     key = _polygon_key()
     url = "https://api.polygon.io/vX/reference/financials"
     params = {
@@ -499,23 +1979,22 @@ def fetch_polygon_financials(symbol: str) -> Dict[str, Any]:
     }
 
     try:
-        with httpx.Client(timeout=20.0) as client:
+        with UPSTREAM_BULKHEADS["polygon"].slot(), httpx.Client(timeout=20.0) as client:
             resp = client.get(url, params=params)
             if resp.status_code != 200:
                 payload = {"ok": False, "error": f"Polygon financials status {resp.status_code}"}
-                PROFILE_CACHE[cache_key] = payload
                 return payload
             data = resp.json() if resp.text else {}
+    except BulkheadFull as e:
+        raise Uncached({"ok": False, "error": str(e)})
     except Exception as e:
         logger.exception("polygon financials request failed", extra={"symbol": symbol})
         payload = {"ok": False, "error": f"Polygon financials exception {type(e).__name__}"}
-        PROFILE_CACHE[cache_key] = payload
         return payload
 
     results = data.get("results") if isinstance(data, dict) else None
     if not isinstance(results, list) or not results:
         payload = {"ok": False, "error": "Polygon financials empty"}
-        PROFILE_CACHE[cache_key] = payload
         return payload
 
     last = results[0] if isinstance(results[0], dict) else {}
@@ -540,15 +2019,11 @@ def fetch_polygon_financials(symbol: str) -> Dict[str, Any]:
         "sourceUrl": "https://polygon.io/docs/stocks/get_vx_reference_financials",
         "error": None if ebitda is not None else "EBITDA not available from Polygon financials",
     }
-    PROFILE_CACHE[cache_key] = payload
     return payload
 
 
+@read_through("polygon_daily", lambda symbol, months: (symbol, months))
 def fetch_polygon_daily(symbol: str, months: int) -> pd.DataFrame:
-    cache_key = ("polygon_daily", symbol, months)
-    if cache_key in DAILY_CACHE:
-        return DAILY_CACHE[cache_key]
-
     key = _polygon_key()
     end = datetime.utcnow().date()
     start = end - timedelta(days=months * 31)
@@ -561,13 +2036,15 @@ def fetch_polygon_daily(symbol: str, months: int) -> pd.DataFrame:
     }
 
     try:
-        with httpx.Client(timeout=20.0) as client:
+        with UPSTREAM_BULKHEADS["polygon"].slot(), httpx.Client(timeout=20.0) as client:
             resp = client.get(url, params=params)
             if resp.status_code != 200:
                 raise HTTPException(status_code=502, detail=f"Polygon daily status {resp.status_code}")
             data = resp.json() if resp.text else {}
     except HTTPException:
         raise
+    except BulkheadFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.exception("polygon daily request failed", extra={"symbol": symbol, "months": months})
         raise HTTPException(status_code=502, detail=f"Polygon daily exception {type(e).__name__}")
@@ -600,36 +2077,39 @@ def fetch_polygon_daily(symbol: str, months: int) -> pd.DataFrame:
     df.index = pd.to_datetime(df["_t"], unit="ms", utc=True)
     df = df.drop(columns=["_t"])
 
-    DAILY_CACHE[cache_key] = df
     return df
 
 
+@read_through("yahoo_profile", lambda symbol: (symbol,))
 def fetch_yahoo_profile(symbol: str) -> Dict[str, Any]:
-    cache_key = symbol
-    if cache_key in PROFILE_CACHE:
-        return PROFILE_CACHE[cache_key]
-
     t = _get_yf_ticker(symbol)
     info = {}
     info_error: Optional[str] = None
-    try:
-        info = t.get_info()
-    except Exception as e:
-        # Some tickers error on get_info; fallback to fast_info
-        info = {}
-        info_error = f"get_info failed: {type(e).__name__}"
-
     fast = {}
     fast_error: Optional[str] = None
+    busy = False
     try:
-        fast = dict(t.fast_info) if getattr(t, "fast_info", None) is not None else {}
-    except Exception as e:
-        fast = {}
-        fast_error = f"fast_info failed: {type(e).__name__}"
+        with UPSTREAM_BULKHEADS["yahoo"].slot():
+            try:
+                info = t.get_info()
+            except Exception as e:
+                # Some tickers error on get_info; fallback to fast_info
+                info = {}
+                info_error = f"get_info failed: {type(e).__name__}"
 
-    logger.info(
+            try:
+                fast = dict(t.fast_info) if getattr(t, "fast_info", None) is not None else {}
+            except Exception as e:
+                fast = {}
+                fast_error = f"fast_info failed: {type(e).__name__}"
+    except BulkheadFull as e:
+        # Falls through to the "empty profile" path below, and is never cached.
+        info_error = str(e)
+        busy = True
+
+    log_event(
         "yahoo profile fetched",
-        extra={
+        lambda: {
             "symbol": symbol,
             "info_keys": len(info) if isinstance(info, dict) else 0,
             "fast_keys": len(fast) if isinstance(fast, dict) else 0,
@@ -665,7 +2145,7 @@ def fetch_yahoo_profile(symbol: str) -> Dict[str, Any]:
         except Exception:
             profile["shortInterestPercent"] = None
 
-    # If Yahoo returns no useful fields, don't poison the cache.
+    # No useful fields: a negative result (yahoo_profile's negative TTL is 0, so not cached by default).
     useful = any(
         profile.get(k) not in (None, "")
         for k in [
@@ -684,36 +2164,32 @@ def fetch_yahoo_profile(symbol: str) -> Dict[str, Any]:
         profile["sources"]["yahoo"] = False
         if not profile.get("yahooError"):
             profile["yahooError"] = "Yahoo returned empty profile (possible rate limit)"
+        if busy:
+            raise Uncached(profile)
         return profile
 
-    PROFILE_CACHE[cache_key] = profile
     return profile
 
 
+@read_through("knowthefloat", lambda symbol: (symbol,))
 def fetch_knowthefloat(symbol: str) -> Dict[str, Any]:
     # NOTE: KnowTheFloat might block scraping. We keep this best-effort + cached.
-    cache_key = ("ktf", symbol)
-    if cache_key in PROFILE_CACHE:
-        return PROFILE_CACHE[cache_key]
-
     url = f"https://www.knowthefloat.com/stock/{symbol.lower()}.htm"
     float_shares = None
     error: Optional[str] = None
     try:
-        with httpx.Client(timeout=15.0, headers={"User-Agent": "Mozilla/5.0"}) as client:
+        with UPSTREAM_BULKHEADS["knowthefloat"].slot(), httpx.Client(
+            timeout=15.0, headers={"User-Agent": "Mozilla/5.0"}
+        ) as client:
             resp = client.get(url)
             if resp.status_code == 200:
-                soup = BeautifulSoup(resp.text, "html.parser")
-                text = soup.get_text(" ")
-                m = re.search(r"Float\s*:\s*([0-9,.]+)\s*(K|M|B)?", text, re.IGNORECASE)
-                if m:
-                    num = float(m.group(1).replace(",", ""))
-                    mult = {"K": 1e3, "M": 1e6, "B": 1e9}.get((m.group(2) or "").upper(), 1.0)
-                    float_shares = num * mult
+                float_shares = _run_parser(parsers.parse_knowthefloat_page, resp)
                 if float_shares is None:
                     error = "Float not found in page"
             else:
                 error = f"HTTP {resp.status_code}"
+    except BulkheadFull as e:
+        raise Uncached({"symbol": symbol, "float": None, "sourceUrl": url, "ok": False, "error": str(e)})
     except Exception:
         float_shares = None
         error = "Exception while scraping"
@@ -725,16 +2201,12 @@ def fetch_knowthefloat(symbol: str) -> Dict[str, Any]:
         "ok": float_shares is not None,
         "error": error,
     }
-    PROFILE_CACHE[cache_key] = payload
     return payload
 
 
+@read_through("dilutiontracker", lambda symbol: (symbol,))
 def fetch_dilutiontracker(symbol: str) -> Dict[str, Any]:
     """Scrape dilution info from DilutionTracker (best-effort, may be paywalled)."""
-    cache_key = ("dilution", symbol)
-    if cache_key in PROFILE_CACHE:
-        return PROFILE_CACHE[cache_key]
-
     url = f"https://dilutiontracker.com/app/search/{symbol.upper()}"
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
@@ -751,54 +2223,77 @@ def fetch_dilutiontracker(symbol: str) -> Dict[str, Any]:
     }
 
     try:
-        with httpx.Client(timeout=15.0, headers=headers, follow_redirects=True) as client:
+        with UPSTREAM_BULKHEADS["dilutiontracker"].slot(), httpx.Client(
+            timeout=15.0, headers=headers, follow_redirects=True
+        ) as client:
             resp = client.get(url)
             if resp.status_code != 200:
                 result["error"] = f"HTTP {resp.status_code}"
-                PROFILE_CACHE[cache_key] = result
                 return result
 
-            soup = BeautifulSoup(resp.text, "html.parser")
-            text = soup.get_text(" ", strip=True)
-
-            # Try to find dilution-related info snippets
-            dilution_patterns = [
-                r"(ATM\s+offering[^.]{5,120}\.)",
-                r"(shelf\s+registration[^.]{5,120}\.)",
-                r"(shares\s+outstanding[:\s]+[0-9,.]+[KMBT]?)",
-                r"(authorized\s+shares[:\s]+[0-9,.]+[KMBT]?)",
-                r"(dilution\s+risk[^.]{5,80}\.)",
-                r"(S-3\s+filing[^.]{5,80}\.)",
-            ]
-
-            snippets: List[str] = []
-            for pattern in dilution_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                for match in matches[:2]:
-                    cleaned = match.strip()
-                    if len(cleaned) > 15 and cleaned not in snippets:
-                        snippets.append(cleaned)
-
+            # Dilution-related info snippets
+            snippets = _run_parser(parsers.parse_dilutiontracker_page, resp)
             if snippets:
-                result["dilutionInfo"] = " | ".join(snippets[:3])
+                result["dilutionInfo"] = " | ".join(snippets)
                 result["ok"] = True
             else:
                 result["error"] = "No dilution data found (may require subscription)"
                 result["note"] = "DilutionTracker may require a paid subscription for full data."
 
+    except BulkheadFull as e:
+        result["error"] = str(e)
+        raise Uncached(result)
     except Exception as e:
         logger.exception("dilutiontracker scrape failed", extra={"symbol": symbol})
         result["error"] = f"Exception {type(e).__name__}"
 
-    PROFILE_CACHE[cache_key] = result
     return result
 
 
-def fetch_intraday_1m(symbol: str, day: str) -> Dict[str, Any]:
-    cache_key = (symbol, day)
-    if cache_key in INTRADAY_CACHE:
-        return INTRADAY_CACHE[cache_key]
+_OHLCV = ("time", "open", "high", "low", "close", "volume")
+_OHLCV_ROW = {field: i for i, field in enumerate(_OHLCV)}
+
+
+class IntradayBars:
+    """One symbol-day of 1m bars as a single (6, n) float64 block, one contiguous row per _OHLCV field.
+
+    This is what the intraday caches hold: 48 bytes per bar and one object per day, instead of a
+    dict of six boxed floats per bar. Calculations take read-only row views from arrays(); the
+    /ticker/intraday candle list is only built by payload(), at response time.
+    """
+
+    __slots__ = ("symbol", "date", "values")
+
+    def __init__(self, symbol: str, day: str, values: np.ndarray):
+        self.symbol = symbol
+        self.date = day
+        self.values = values
 
+    def __len__(self) -> int:
+        return self.values.shape[1]
+
+    def arrays(self, fields: Tuple[str, ...] = ("time", "high", "low", "close")) -> Dict[str, np.ndarray]:
+        out = {}
+        for field in fields:
+            row = self.values[_OHLCV_ROW[field]]
+            row.flags.writeable = False  # a view into the cached block
+            out[field] = row
+        return out
+
+    def candles(self) -> List[Dict[str, Any]]:
+        times = self.values[0].astype(np.int64).tolist()
+        opens, highs, lows, closes, volumes = self.values[1:].tolist()
+        return [
+            {"time": t, "open": o, "high": h, "low": lo, "close": c, "volume": v}
+            for t, o, h, lo, c, v in zip(times, opens, highs, lows, closes, volumes)
+        ]
+
+    def payload(self) -> Dict[str, Any]:
+        return {"symbol": self.symbol, "date": self.date, "count": len(self), "candles": self.candles()}
+
+
+@read_through("intraday_1m", lambda symbol, day: (symbol, day))
+def fetch_intraday_1m(symbol: str, day: str) -> IntradayBars:
     try:
         start_dt = datetime.strptime(day, "%Y-%m-%d")
     except ValueError:
@@ -808,20 +2303,28 @@ def fetch_intraday_1m(symbol: str, day: str) -> Dict[str, Any]:
 
     # yfinance: last ~7 days for 1m
     try:
-        df = yf.download(
-            tickers=symbol,
-            interval="1m",
-            start=start_dt.strftime("%Y-%m-%d"),
-            end=end_dt.strftime("%Y-%m-%d"),
-            progress=False,
-            auto_adjust=False,
-            prepost=True,
-            threads=False,
-        )
+        with UPSTREAM_BULKHEADS["yahoo"].slot():
+            df = yf.download(
+                tickers=symbol,
+                interval="1m",
+                start=start_dt.strftime("%Y-%m-%d"),
+                end=end_dt.strftime("%Y-%m-%d"),
+                progress=False,
+                auto_adjust=False,
+                prepost=True,
+                threads=False,
+            )
+    except BulkheadFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.exception("yfinance intraday download failed", extra={"symbol": symbol, "date": day})
         raise HTTPException(status_code=502, detail=f"Yahoo intraday request failed: {type(e).__name__}")
 
+    return _intraday_bars_from_df(symbol, day, df)
+
+
+def _intraday_bars_from_df(symbol: str, day: str, df: Optional[pd.DataFrame]) -> IntradayBars:
+    """Turn one symbol's yfinance 1m frame into IntradayBars."""
     if df is None or df.empty:
         logger.warning(
             "yfinance intraday returned empty",
@@ -842,46 +2345,166 @@ def fetch_intraday_1m(symbol: str, day: str) -> Dict[str, Any]:
 
     df = df.dropna(subset=["Open", "High", "Low", "Close"])
 
-    candles: List[Dict[str, Any]] = []
-    for idx, row in df.iterrows():
-        ts = pd.Timestamp(idx)
-        candles.append(
-            {
-                "time": _to_unix_seconds(ts),
-                "open": float(row["Open"]),
-                "high": float(row["High"]),
-                "low": float(row["Low"]),
-                "close": float(row["Close"]),
-                "volume": float(row.get("Volume", 0) or 0),
-            }
-        )
+    idx = pd.DatetimeIndex(df.index)
+    if idx.tz is None:
+        # yfinance sometimes returns naive timestamps; assume DEFAULT_TZ
+        idx = idx.tz_localize(DEFAULT_TZ)
+    values = np.empty((len(_OHLCV), df.shape[0]), dtype=np.float64)
+    values[0] = idx.as_unit("s").asi8
+    values[1:] = df[["Open", "High", "Low", "Close", "Volume"]].to_numpy(dtype=np.float64).T
+    return IntradayBars(symbol, day, values)
+
+
+def fetch_intraday_1m_many(
+    symbols: List[str], day: str, refresh: bool = False
+) -> Tuple[Dict[str, IntradayBars], Dict[str, Any]]:
+    """1m bars for several symbols: cache first, then one batched Yahoo download for the rest.
+
+    Each downloaded symbol is stored under the same key fetch_intraday_1m uses. Symbols the
+    batch couldn't serve (or days beyond Yahoo's 1m range) go through fetch_session_1m.
+    refresh=True downloads every symbol and overwrites its entry, so a live session never goes cold.
+    Returns (bars by symbol, errors).
+    """
+    try:
+        start_dt = datetime.strptime(day, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date. Expected YYYY-MM-DD")
 
-    payload = {"symbol": symbol, "date": day, "count": len(candles), "candles": candles}
-    INTRADAY_CACHE[cache_key] = payload
-    return payload
+    payloads: Dict[str, IntradayBars] = {}
+    errors: Dict[str, Any] = {}
+    cache = CACHES["intraday_1m"]
+    missing: List[str] = []
+    for sym in symbols:
+        bars = _MISS if refresh else cache.get((sym, day), _MISS)
+        if bars is _MISS:
+            missing.append(sym)
+        else:
+            payloads[sym] = bars
 
+    recent = (datetime.utcnow().date() - start_dt.date()).days <= YAHOO_1M_DAYS
+    if len(missing) > 1 and recent:
+        try:
+            # yfinance fetches a batch one ticker at a time, so it costs one call per symbol
+            with UPSTREAM_BULKHEADS["yahoo"].slot(cost=len(missing)):
+                df = yf.download(
+                    tickers=missing,
+                    interval="1m",
+                    start=start_dt.strftime("%Y-%m-%d"),
+                    end=(start_dt + timedelta(days=1)).strftime("%Y-%m-%d"),
+                    progress=False,
+                    auto_adjust=False,
+                    prepost=True,
+                    threads=False,
+                    group_by="ticker",
+                )
+        except BulkheadFull as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        except Exception:
+            logger.exception("yfinance batch intraday download failed", extra={"symbols": missing, "date": day})
+            df = None
 
-def fetch_daily(symbol: str, months: int) -> pd.DataFrame:
-    cache_key = ("daily", symbol, months)
-    if cache_key in DAILY_CACHE:
-        return DAILY_CACHE[cache_key]
+        if df is not None and isinstance(df.columns, pd.MultiIndex):
+            got = set(df.columns.get_level_values(0))
+            for sym in [m for m in missing if m in got]:
+                try:
+                    bars = _intraday_bars_from_df(sym, day, df[sym].copy())
+                except HTTPException:
+                    continue
+                # A batch pads unknown tickers with all-NaN columns; let those retry on their own
+                if len(bars):
+                    payloads[sym] = cache[(sym, day)] = bars
 
-    end = datetime.utcnow().date() + timedelta(days=1)
-    start = end - timedelta(days=months * 31)
+    for sym in [m for m in missing if m not in payloads]:
+        if refresh:
+            cache.pop((sym, day))  # a lone (or batch-skipped) symbol must not come back from the cache either
+        try:
+            payloads[sym] = fetch_session_1m(sym, day)
+        except HTTPException as e:
+            errors[sym] = e.detail
+    return payloads, errors
+
+
+@read_through("polygon_1m", lambda symbol, day: (symbol, day))
+def fetch_polygon_intraday_1m(symbol: str, day: str) -> IntradayBars:
+    """Archive 1m bars (pre/post included) from Polygon, as IntradayBars like fetch_intraday_1m."""
+    key = _polygon_key()
+    url = f"https://api.polygon.io/v2/aggs/ticker/{symbol}/range/1/minute/{day}/{day}"
+    params = {"adjusted": "true", "sort": "asc", "limit": 50000, "apiKey": key}
 
     try:
-        df = yf.download(
-            tickers=symbol,
-            interval="1d",
-            start=start.strftime("%Y-%m-%d"),
-            end=end.strftime("%Y-%m-%d"),
-            progress=False,
-            auto_adjust=False,
-            threads=False,
-        )
+        with UPSTREAM_BULKHEADS["polygon"].slot(), httpx.Client(timeout=20.0) as client:
+            resp = client.get(url, params=params)
+            if resp.status_code != 200:
+                raise HTTPException(status_code=502, detail=f"Polygon minute status {resp.status_code}")
+            data = resp.json() if resp.text else {}
+    except HTTPException:
+        raise
+    except BulkheadFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
-        logger.exception("yfinance daily download failed", extra={"symbol": symbol, "months": months})
-        raise HTTPException(status_code=502, detail=f"Yahoo daily request failed: {type(e).__name__}")
+        logger.exception("polygon minute request failed", extra={"symbol": symbol, "date": day})
+        raise HTTPException(status_code=502, detail=f"Polygon minute exception {type(e).__name__}")
+
+    results = data.get("results") if isinstance(data, dict) else None
+    if not isinstance(results, list) or len(results) == 0:
+        raise HTTPException(status_code=404, detail=f"No Polygon minute data for {symbol} on {day}")
+
+    rows: List[Tuple[float, float, float, float, float, float]] = []
+    for bar in results:
+        try:
+            rows.append(
+                (
+                    int(bar["t"]) // 1000,
+                    float(bar["o"]),
+                    float(bar["h"]),
+                    float(bar["l"]),
+                    float(bar["c"]),
+                    float(bar.get("v") or 0),
+                )
+            )
+        except Exception:
+            continue
+
+    values = np.array(rows, dtype=np.float64).reshape(-1, len(_OHLCV)).T.copy()
+    return IntradayBars(symbol, day, values)
+
+
+def fetch_session_1m(symbol: str, day: str) -> IntradayBars:
+    """1m bars for any session: Yahoo for recent days, the Polygon archive beyond that (or if Yahoo has none)."""
+    try:
+        age = (datetime.utcnow().date() - datetime.strptime(day, "%Y-%m-%d").date()).days
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date. Expected YYYY-MM-DD")
+    if age <= YAHOO_1M_DAYS:
+        try:
+            return fetch_intraday_1m(symbol, day)
+        except HTTPException as e:
+            if e.status_code != 404 or not POLYGON_API_KEY:
+                raise
+    return fetch_polygon_intraday_1m(symbol, day)
+
+
+@read_through("daily", lambda symbol, months: (symbol, months))
+def fetch_daily(symbol: str, months: int) -> pd.DataFrame:
+    end = datetime.utcnow().date() + timedelta(days=1)
+    start = end - timedelta(days=months * 31)
+
+    try:
+        with UPSTREAM_BULKHEADS["yahoo"].slot():
+            df = yf.download(
+                tickers=symbol,
+                interval="1d",
+                start=start.strftime("%Y-%m-%d"),
+                end=end.strftime("%Y-%m-%d"),
+                progress=False,
+                auto_adjust=False,
+                threads=False,
+            )
+    except BulkheadFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.exception("yfinance daily download failed", extra={"symbol": symbol, "months": months})
+        raise HTTPException(status_code=502, detail=f"Yahoo daily request failed: {type(e).__name__}")
 
     if df is None or df.empty:
         logger.warning(
@@ -894,12 +2517,21 @@ def fetch_daily(symbol: str, months: int) -> pd.DataFrame:
     if isinstance(df.columns, pd.MultiIndex):
         df.columns = [c[0] for c in df.columns]
 
-    DAILY_CACHE[cache_key] = df
     return df
 
 
-def compute_gap_stats(df: pd.DataFrame, gap_threshold: float = 24.0) -> Dict[str, Any]:
+def gap_percent(df: pd.DataFrame) -> pd.Series:
     # Gap = (Open - prevClose) / prevClose * 100
+    prev_close = df["Close"].shift(1)
+    return (df["Open"] - prev_close) / prev_close * 100.0
+
+
+def gap_mask(df: pd.DataFrame, gap_threshold: float) -> pd.Series:
+    """The gap-day rule shared by /ticker/gaps and /gaps/study."""
+    return gap_percent(df) >= gap_threshold
+
+
+def compute_gap_stats(df: pd.DataFrame, gap_threshold: float = 24.0) -> Dict[str, Any]:
     if df.shape[0] < 3:
         return {
             "gapThresholdPercent": gap_threshold,
@@ -908,10 +2540,7 @@ def compute_gap_stats(df: pd.DataFrame, gap_threshold: float = 24.0) -> Dict[str
             "redAfterGapPercent": 0.0,
         }
 
-    prev_close = df["Close"].shift(1)
-    gap_pct = (df["Open"] - prev_close) / prev_close * 100.0
-
-    gaps = gap_pct >= gap_threshold
+    gaps = gap_mask(df, gap_threshold)
     gaps_count = int(np.nansum(gaps.astype(int)))
 
     red_after_gap = gaps & (df["Close"] < df["Open"])
@@ -932,110 +2561,529 @@ def health():
     return {"ok": True, "name": APP_NAME}
 
 
-@app.get("/ticker/profile")
-def ticker_profile(symbol: str = Query(...)):
-    sym = _clean_symbol(symbol)
+def _prewarm() -> None:
+    """Import providers, load the symbol master and spin up parse workers, then flag readiness."""
+    t0 = time.perf_counter()
+    try:
+        for mod in (np, pd, httpx, yf):
+            mod._load()
+        with _startup_step("parsers", "imports"):
+            importlib.import_module("bs4")
+        with _startup_step("symbol_master", "prewarm"):
+            _load_symbol_master()
+        if PARSE_WORKERS > 0:
+            with _startup_step("parse_pool", "prewarm"):
+                pool = _parse_pool()
+                list(pool.map(parsers.parse_human_number, ["1"] * PARSE_WORKERS))
+    except Exception:
+        logger.exception("prewarm failed")
+    finally:
+        STARTUP_REPORT["prewarm"]["total"] = round((time.perf_counter() - t0) * 1000, 1)
+        READY.set()
+        logger.info("ready", extra={"report": STARTUP_REPORT})
+
+
+@app.on_event("startup")
+def _start_prewarm():
+    STARTUP_REPORT["startupEventMs"] = round((time.perf_counter() - _IMPORT_T0) * 1000, 1)
+    if PREWARM_ENABLED:
+        threading.Thread(target=_prewarm, name="prewarm", daemon=True).start()
+    else:
+        # Providers load on first use; only reference data is needed up front
+        _load_symbol_master()
+        READY.set()
+
 
-    logger.info("ticker_profile request", extra={"symbol": sym})
+@app.get("/livez")
+def livez():
+    return {"ok": True}
 
-    yahoo = fetch_yahoo_profile(sym)
-    polygon = None
-    if not bool(yahoo.get("yahooOk", True)):
+
+@app.get("/readyz")
+def readyz():
+    if not READY.is_set():
+        return FastJSONResponse({"ok": False, "ready": False}, status_code=503)
+    return {"ok": True, "ready": True}
+
+
+@app.get("/startup")
+def startup_report():
+    return {
+        **STARTUP_REPORT,
+        "ready": READY.is_set(),
+        "loaded": {name: mod._module is not None for name, mod in (("numpy", np), ("pandas", pd), ("httpx", httpx), ("yfinance", yf))},
+    }
+
+
+@app.get("/bulkheads")
+def bulkheads():
+    return {
+        "threadpool": THREADPOOL_SIZE,
+        "endpoints": {name: b.stats() for name, b in ENDPOINT_BULKHEADS.items()},
+        "upstreams": {name: b.stats() for name, b in UPSTREAM_BULKHEADS.items()},
+    }
+
+
+@app.get("/symbols/search")
+def symbols_search(q: str = Query(..., min_length=1, max_length=40), limit: int = Query(10, ge=1, le=50)):
+    items = SYMBOL_MASTER.search(q, limit=limit)
+    return {"query": q, "count": len(items), "loaded": SYMBOL_MASTER.loaded, "items": items}
+
+
+def _cached(fetch, *args) -> bool:
+    """True when a read_through fetch would be answered from its cache."""
+    return fetch.cache_key(*args) in fetch.cache
+
+
+class ProviderStats:
+    """Rolling window of (when, seconds, ok) samples for one provider call."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._samples: deque = deque(maxlen=PROVIDER_WINDOW)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self._samples.append((time.monotonic(), seconds, ok))
+
+    def _recent(self) -> List[Tuple[float, float, bool]]:
+        cutoff = time.monotonic() - PROVIDER_WINDOW_S
+        with self._lock:
+            return [s for s in self._samples if s[0] >= cutoff]
+
+    @staticmethod
+    def _quantile(values: List[float], q: float) -> Optional[float]:
+        if not values:
+            return None
+        values = sorted(values)
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+    def summary(self) -> Dict[str, Any]:
+        recent = self._recent()
+        latencies = [s[1] for s in recent if s[2]]
+        successes = sum(1 for s in recent if s[2])
+        rate = successes / len(recent) if recent else None
+        return {
+            "samples": len(recent),
+            "successRate": rate,
+            "p50": self._quantile(latencies, 0.5),
+            "p95": self._quantile(latencies, 0.95),
+            # Too few samples to judge counts as healthy so the provider keeps getting probed
+            "healthy": len(recent) < PROVIDER_MIN_SAMPLES or rate >= PROVIDER_MIN_SUCCESS,
+        }
+
+
+class ProviderRegistry:
+    """Tracks every provider's recent latency / success and orders fallbacks by it."""
+
+    def __init__(self):
+        self._stats: Dict[str, ProviderStats] = {}
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def stats(self, name: str) -> ProviderStats:
+        with self._lock:
+            if name not in self._stats:
+                self._stats[name] = ProviderStats(name)
+            return self._stats[name]
+
+    def record(self, name: str, seconds: float, ok: bool) -> None:
+        self.stats(name).record(seconds, ok)
+
+    def healthy(self, name: str) -> bool:
+        return self.stats(name).summary()["healthy"]
+
+    def prefer_healthy(self, names: List[str]) -> List[str]:
+        """Keep the given priority, but move unhealthy providers behind the healthy ones."""
+        return sorted(names, key=lambda n: not self.healthy(n))
+
+    def rank(self, names: List[str]) -> List[str]:
+        """Healthy first, then fastest median; providers without samples keep their given order up front."""
+
+        def key(item):
+            idx, name = item
+            s = self.stats(name).summary()
+            return (not s["healthy"], s["p50"] or 0.0, idx)
+
+        return [name for _, name in sorted(enumerate(names), key=key)]
+
+    def _timed(self, name: str, fn):
+        t0 = time.perf_counter()
         try:
-            polygon = fetch_polygon_profile(sym)
-        except HTTPException as e:
-            polygon = {"ok": False, "error": e.detail}
-        except Exception as e:
-            polygon = {"ok": False, "error": f"Polygon exception {type(e).__name__}"}
+            result = fn()
+        except Exception:
+            self.record(name, time.perf_counter() - t0, False)
+            raise
+        self.record(name, time.perf_counter() - t0, True)
+        return result
 
-    poly_ok = bool(polygon and polygon.get("ok"))
-    poly_fin = None
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=PROVIDER_HEDGE_WORKERS, thread_name_prefix="hedge")
+            return self._pool
+
+    def call_hedged(self, calls: Dict[str, Any]) -> Tuple[Any, str]:
+        """Run the best-ranked call; start the runner-up once the primary overruns its p95.
+
+        Returns (result, name) of the first call to succeed. A call that fails hands over to
+        the next one immediately; when all fail the last error is raised. Losers keep running
+        in the background so their result still lands in the cache and their timing is recorded.
+        """
+        pending = self.rank(list(calls))
+        running: Dict[Any, str] = {}
+        last_error: Optional[BaseException] = None
+
+        def launch() -> str:
+            name = pending.pop(0)
+            # The caller's context (rate-limit wait budget, log path) follows the call onto the pool
+            running[self._executor().submit(contextvars.copy_context().run, self._timed, name, calls[name])] = name
+            return name
+
+        leader = launch()
+        while running:
+            timeout = None
+            if pending:
+                p95 = self.stats(leader).summary()["p95"]
+                timeout = max(PROVIDER_HEDGE_MIN_S, p95 or 0.0)
+            done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                log_event("provider over its p95, hedging", lambda: {"provider": leader, "hedgeAfterS": timeout})
+                leader = launch()
+                continue
+            for fut in done:
+                name = running.pop(fut)
+                try:
+                    return fut.result(), name
+                except Exception as e:
+                    last_error = e
+            if pending and not running:
+                leader = launch()
+        raise last_error
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            names = sorted(self._stats)
+        return {name: self.stats(name).summary() for name in names}
+
+
+PROVIDERS = ProviderRegistry()
+
+
+@app.get("/providers")
+def providers():
+    return {"providers": PROVIDERS.snapshot()}
+
+
+# Output field -> sources that can supply it, highest priority first
+PROFILE_FIELD_SOURCES: Dict[str, List[str]] = {
+    "exchange": ["yahoo", "finviz", "polygon"],
+    "sector": ["yahoo", "finviz", "polygon"],
+    "industry": ["yahoo", "finviz", "polygon"],
+    "employees": ["yahoo", "polygon"],
+    "country": ["yahoo", "finviz", "polygon"],
+    "marketCap": ["yahoo", "finviz", "polygon"],
+    "ebitda": ["yahoo", "polygonFinancials", "googleFinance", "finviz"],
+    # Float: Finviz (primary) → KnowTheFloat (fallback)
+    "float": ["finviz", "knowTheFloat"],
+    # Short interest: Finviz
+    "shortInterestPercent": ["finviz"],
+    "dilutionInfo": ["dilutionTracker"],
+}
+PROFILE_SOURCES = ["yahoo", "polygon", "polygonFinancials", "googleFinance", "finviz", "knowTheFloat", "dilutionTracker"]
+
+
+def _guard_polygon(fetch, symbol: str, label: str) -> Dict[str, Any]:
     try:
-        poly_fin = fetch_polygon_financials(sym)
+        return fetch(symbol)
     except HTTPException as e:
-        poly_fin = {"ok": False, "error": e.detail}
+        return {"ok": False, "error": e.detail}
     except Exception as e:
-        poly_fin = {"ok": False, "error": f"Polygon financials exception {type(e).__name__}"}
-
-    poly_fin_ok = bool(poly_fin and poly_fin.get("ok"))
-    ktf = fetch_knowthefloat(sym)
-    dil = fetch_dilutiontracker(sym)
-
-    finviz = fetch_finviz_profile(sym)
-    finviz_ok = bool(finviz and finviz.get("ok"))
-
-    ebitda_source = "yahoo" if yahoo.get("ebitda") is not None else None
-    ebitda_value = yahoo.get("ebitda")
-    if ebitda_value is None and poly_fin_ok:
-        ebitda_value = poly_fin.get("ebitda")
-        ebitda_source = "polygon"
-    if ebitda_value is None:
-        gf = fetch_google_finance_ebitda(sym, yahoo.get("exchange") or (finviz.get("exchange") if finviz_ok else None) or (polygon.get("exchange") if poly_ok else None))
-        if gf.get("ok"):
-            ebitda_value = gf.get("ebitda")
-            ebitda_source = "google"
-        else:
-            gf = gf
-    else:
-        gf = {"ok": False, "error": "not used"}
-    # Last resort: Finviz snapshot table (only if EBITDA label exists in table)
-    if ebitda_value is None:
-        fv_ebitda = fetch_finviz_ebitda(sym)
-        if fv_ebitda is not None:
-            ebitda_value = fv_ebitda
-            ebitda_source = "finviz"
-
-    logger.info(
-        "ebitda chosen",
-        extra={"symbol": sym, "source": ebitda_source, "has_value": ebitda_value is not None},
-    )
+        return {"ok": False, "error": f"{label} exception {type(e).__name__}"}
+
+
+class _Pending(Exception):
+    """A source needed for a field didn't finish before the request deadline."""
+
+
+_PROFILE_POOL: Optional[ThreadPoolExecutor] = None
+_PROFILE_POOL_LOCK = threading.Lock()
+# (symbol, fields) with a background fill in flight
+_PROFILE_FILLS: set = set()
+
+
+def _profile_pool() -> ThreadPoolExecutor:
+    global _PROFILE_POOL
+    with _PROFILE_POOL_LOCK:
+        if _PROFILE_POOL is None:
+            _PROFILE_POOL = ThreadPoolExecutor(max_workers=PROFILE_WORKERS, thread_name_prefix="profile")
+        return _PROFILE_POOL
+
+
+class ProfileAssembler:
+    """Resolve profile fields lazily from PROFILE_FIELD_SOURCES.
+
+    A source is fetched the first time a field needs it, and a field stops walking its
+    source list as soon as one source fills it. Sources the registry marks unhealthy are
+    tried last.
+
+    With a deadline (time.monotonic()), fetches run on the profile pool and every wait is
+    bounded by it: a field whose source is still running is left in `pending` instead of
+    falling through to a lower-priority source, and the fetch keeps going into the cache.
+    """
+
+    def __init__(self, symbol: str, deadline: Optional[float] = None):
+        self.symbol = symbol
+        self.deadline = deadline
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.values: Dict[str, Any] = {}
+        self.chosen: Dict[str, Optional[str]] = {}
+        self.pending: List[str] = []
+        self._futures: Dict[str, Any] = {}
+
+    def _fetch(self, name: str) -> Dict[str, Any]:
+        sym = self.symbol
+        if name == "yahoo":
+            return fetch_yahoo_profile(sym)
+        if name == "polygon":
+            return _guard_polygon(fetch_polygon_profile, sym, "Polygon")
+        if name == "polygonFinancials":
+            return _guard_polygon(fetch_polygon_financials, sym, "Polygon financials")
+        if name == "googleFinance":
+            return fetch_google_finance_ebitda(sym, self.resolve("exchange"))
+        if name == "finviz":
+            # Last-resort EBITDA comes from the same (cached) Finviz page
+            return {**fetch_finviz_profile(sym), "ebitda": fetch_finviz_ebitda(sym)}
+        if name == "knowTheFloat":
+            return fetch_knowthefloat(sym)
+        if name == "dilutionTracker":
+            return fetch_dilutiontracker(sym)
+        raise KeyError(name)
+
+    def _cached(self, name: str) -> bool:
+        sym = self.symbol
+        if name == "googleFinance":
+            return _cached(fetch_google_finance_ebitda, sym, self.resolve("exchange"))
+        fetch = {
+            "yahoo": fetch_yahoo_profile,
+            "polygon": fetch_polygon_profile,
+            "polygonFinancials": fetch_polygon_financials,
+            "finviz": _fetch_finviz_page,
+            "knowTheFloat": fetch_knowthefloat,
+            "dilutionTracker": fetch_dilutiontracker,
+        }[name]
+        return _cached(fetch, sym)
+
+    def _load(self, name: str) -> Dict[str, Any]:
+        # Only real upstream calls feed the registry; cache hits would drown out its latency
+        fresh = not self._cached(name)
+        t0 = time.perf_counter()
+        res = self._fetch(name)
+        if fresh:
+            PROVIDERS.record(name, time.perf_counter() - t0, self._ok(name, res))
+        return res
+
+    def _available(self, name: str) -> bool:
+        # Polygon's profile only stands in for Yahoo when Yahoo came back empty
+        if name == "polygon":
+            return self.source("yahoo") is not None and not self.ok("yahoo")
+        return True
+
+    def _start(self, name: str):
+        if name not in self._futures:
+            # Google's URL needs the exchange, which must be settled on this thread first
+            if name == "googleFinance":
+                self.resolve("exchange")
+                if "exchange" in self.pending:
+                    raise _Pending(name)
+            # Run in the caller's context so its log path and rate-limit wait budget carry over
+            self._futures[name] = _profile_pool().submit(contextvars.copy_context().run, self._load, name)
+        return self._futures[name]
+
+    def _done(self, name: str) -> bool:
+        fut = self._futures.get(name)
+        return fut is not None and fut.done()
+
+    def prefetch(self, fields: List[str]) -> None:
+        """Start the first-choice source of every field at once (deadline mode only)."""
+        if self.deadline is None:
+            return
+        for field in fields:
+            for name in PROVIDERS.prefer_healthy(PROFILE_FIELD_SOURCES[field])[:1]:
+                if name == "googleFinance":
+                    continue
+                # Polygon waits on Yahoo's answer; blocking on it here would hold back every other source
+                if name == "polygon" and "yahoo" not in self.results and not self._done("yahoo"):
+                    continue
+                if self._available(name):
+                    self._start(name)
+
+    def source(self, name: str) -> Optional[Dict[str, Any]]:
+        if name not in self.results:
+            if not self._available(name):
+                return None
+            try:
+                if self.deadline is None:
+                    self.results[name] = self._load(name)
+                else:
+                    fut = self._start(name)
+                    self.results[name] = fut.result(timeout=max(0.0, self.deadline - time.monotonic()))
+            except FutureTimeout:
+                raise _Pending(name)
+            except Exception as e:
+                # A source that blows up only fails its own fields; the rest fall through to the next source
+                logger.exception("profile source failed", extra={"symbol": self.symbol, "source": name})
+                self.results[name] = self._failed(name, f"{name} exception {type(e).__name__}")
+        return self.results[name]
+
+    @staticmethod
+    def _failed(name: str, error: str) -> Dict[str, Any]:
+        return {"yahooOk": False, "yahooError": error} if name == "yahoo" else {"ok": False, "error": error}
+
+    @staticmethod
+    def _ok(name: str, res: Dict[str, Any]) -> bool:
+        return bool(res.get("yahooOk", True)) if name == "yahoo" else bool(res.get("ok"))
+
+    def ok(self, name: str) -> bool:
+        res = self.results.get(name)
+        if res is None:
+            return False
+        return self._ok(name, res)
+
+    def resolve(self, field: str) -> Any:
+        if field in self.values:
+            return self.values[field]
+        value, chosen = None, None
+        try:
+            for name in PROVIDERS.prefer_healthy(PROFILE_FIELD_SOURCES[field]):
+                res = self.source(name)
+                if res is None or not self.ok(name):
+                    continue
+                if res.get(field) not in (None, ""):
+                    value, chosen = res.get(field), name
+                    break
+        except _Pending:
+            if field not in self.pending:
+                self.pending.append(field)
+            return None
+        self.values[field] = value
+        self.chosen[field] = chosen
+        return value
+
+    def pending_sources(self) -> List[str]:
+        return [name for name in PROFILE_SOURCES if name in self._futures and name not in self.results]
+
+    def error(self, name: str) -> Optional[str]:
+        if name not in self.results:
+            return "pending" if name in self._futures else None
+        if self.ok(name):
+            return None
+        res = self.results[name]
+        if name == "yahoo":
+            return res.get("yahooError")
+        if name == "knowTheFloat":
+            return res.get("error") or "KnowTheFloat unavailable"
+        if name == "dilutionTracker":
+            return res.get("error") or res.get("note")
+        return res.get("error")
+
+    def source_url(self, name: str) -> Optional[str]:
+        res = self.results.get(name)
+        if res is None or (name == "polygon" and not self.ok(name)):
+            return None
+        return res.get("sourceUrl")
+
+    def sections(self) -> Dict[str, Any]:
+        return {
+            "sources": {name: self.ok(name) for name in PROFILE_SOURCES},
+            "errors": {name: self.error(name) for name in PROFILE_SOURCES},
+            "sourceUrls": {
+                name: self.source_url(name) for name in PROFILE_SOURCES if name != "yahoo"
+            },
+        }
+
+
+def _fill_profile(symbol: str, fields: Tuple[str, ...]) -> None:
+    """Finish a deadline-cut profile without a deadline so every source lands in the cache."""
+    try:
+        assembler = ProfileAssembler(symbol)
+        for field in fields:
+            assembler.resolve(field)
+        log_event("profile fill finished", lambda: {"symbol": symbol, "sources": sorted(assembler.results)})
+    except Exception:
+        logger.exception("profile fill failed", extra={"symbol": symbol})
+    finally:
+        with _PROFILE_POOL_LOCK:
+            _PROFILE_FILLS.discard((symbol, fields))
+
+
+def _schedule_profile_fill(symbol: str, fields: List[str]) -> None:
+    key = (symbol, tuple(fields))
+    with _PROFILE_POOL_LOCK:
+        if key in _PROFILE_FILLS:
+            return
+        _PROFILE_FILLS.add(key)
+    _profile_pool().submit(_fill_profile, *key)
+
+
+def _parse_profile_fields(fields: Optional[str]) -> List[str]:
+    if not fields:
+        return list(PROFILE_FIELD_SOURCES)
+    wanted = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in wanted if f not in PROFILE_FIELD_SOURCES]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown profile fields {unknown}; expected any of {list(PROFILE_FIELD_SOURCES)}",
+        )
+    return wanted
 
-    merged = {
-        **yahoo,
-        # Priority: Yahoo → Finviz → Polygon
-        "exchange": yahoo.get("exchange") or (finviz.get("exchange") if finviz_ok else None) or (polygon.get("exchange") if poly_ok else None),
-        "sector": yahoo.get("sector") or (finviz.get("sector") if finviz_ok else None) or (polygon.get("sector") if poly_ok else None),
-        "industry": yahoo.get("industry") or (finviz.get("industry") if finviz_ok else None) or (polygon.get("industry") if poly_ok else None),
-        "employees": yahoo.get("employees") or (polygon.get("employees") if poly_ok else None),
-        "country": yahoo.get("country") or (finviz.get("country") if finviz_ok else None) or (polygon.get("country") if poly_ok else None),
-        "marketCap": yahoo.get("marketCap") or (finviz.get("marketCap") if finviz_ok else None) or (polygon.get("marketCap") if poly_ok else None),
-        "ebitda": ebitda_value,
-        # Float: Finviz (primary) → KnowTheFloat (fallback)
-        "float": (finviz.get("float") if finviz_ok else None) or ktf.get("float"),
-        # Short interest: Finviz
-        "shortInterestPercent": (finviz.get("shortInterestPercent") if finviz_ok else None),
-        "dilutionInfo": dil.get("dilutionInfo"),
-        "sources": {
-            "yahoo": bool(yahoo.get("yahooOk", True)),
-            "polygon": poly_ok,
-            "polygonFinancials": poly_fin_ok,
-            "googleFinance": bool(ebitda_source == "google"),
-            "finviz": finviz_ok,
-            "knowTheFloat": bool(ktf.get("ok")),
-            "dilutionTracker": bool(dil.get("ok")),
-        },
-        "errors": {
-            "yahoo": yahoo.get("yahooError"),
-            "polygon": None if poly_ok else (polygon.get("error") if polygon else None),
-            "polygonFinancials": None if poly_fin_ok else (poly_fin.get("error") if poly_fin else None),
-            "googleFinance": None if ebitda_source == "google" else (gf.get("error") if isinstance(gf, dict) else None),
-            "finviz": None if finviz_ok else finviz.get("error"),
-            "knowTheFloat": None if ktf.get("ok") else (ktf.get("error") or "KnowTheFloat unavailable"),
-            "dilutionTracker": None if dil.get("ok") else (dil.get("error") or dil.get("note")),
-        },
-        "sourceUrls": {
-            "finviz": finviz.get("sourceUrl"),
-            "knowTheFloat": ktf.get("sourceUrl"),
-            "polygon": polygon.get("sourceUrl") if poly_ok else None,
-            "polygonFinancials": poly_fin.get("sourceUrl") if isinstance(poly_fin, dict) else None,
-            "googleFinance": gf.get("sourceUrl") if isinstance(gf, dict) else None,
-            "dilutionTracker": dil.get("sourceUrl"),
-        },
-    }
 
-    logger.info(
+@app.get("/ticker/profile")
+def ticker_profile(
+    symbol: str = Query(...),
+    fields: Optional[str] = Query(None),
+    deadline_ms: Optional[int] = Query(None, ge=50, le=60000),
+):
+    sym = _clean_symbol(symbol)
+    wanted = _parse_profile_fields(fields)
+
+    log_event("ticker_profile request", lambda: {"symbol": sym, "fields": fields, "deadline_ms": deadline_ms})
+
+    deadline = time.monotonic() + deadline_ms / 1000.0 if deadline_ms else None
+    assembler = ProfileAssembler(sym, deadline=deadline)
+    assembler.prefetch(wanted)
+    resolved = {field: assembler.resolve(field) for field in wanted}
+
+    if "ebitda" in wanted:
+        log_event(
+            "ebitda chosen",
+            lambda: {"symbol": sym, "source": assembler.chosen.get("ebitda"), "has_value": resolved["ebitda"] is not None},
+        )
+
+    yahoo = None
+    if not fields:
+        try:
+            yahoo = assembler.source("yahoo")
+        except _Pending:
+            pass
+    merged = {**(yahoo or {"symbol": sym}), **resolved, **assembler.sections()}
+    # Same keys whether or not Yahoo answered in time (or was needed at all)
+    merged.setdefault("yahooOk", assembler.ok("yahoo"))
+    merged.setdefault("yahooError", assembler.error("yahoo"))
+
+    if deadline is not None:
+        # Fields/sources still running at the deadline; a repeat call picks them up from the cache
+        merged["pending"] = list(assembler.pending)
+        merged["pendingSources"] = assembler.pending_sources()
+        merged["complete"] = not assembler.pending and (bool(fields) or yahoo is not None)
+        if not merged["complete"]:
+            _schedule_profile_fill(sym, wanted)
+
+    log_event(
         "ticker_profile mapped",
-        extra={
+        lambda: {
             "symbol": sym,
             "exchange": merged.get("exchange"),
             "sector": merged.get("sector"),
@@ -1047,82 +3095,375 @@ def ticker_profile(symbol: str = Query(...)):
             "ebitda": merged.get("ebitda"),
             "shortInterestPercent": merged.get("shortInterestPercent"),
             "yahooOk": merged.get("yahooOk"),
+            "sources": sorted(assembler.results),
         },
     )
 
     return merged
 
 
-@app.get("/ticker/news")
-def ticker_news(symbol: str = Query(...)):
-    sym = _clean_symbol(symbol)
-    logger.info("ticker_news request", extra={"symbol": sym})
+def _published_ts(pub: Optional[str]) -> Optional[float]:
+    """Epoch seconds for an ISO timestamp or a bare YYYY-MM-DD (taken as midnight UTC)."""
+    if not pub:
+        return None
+    try:
+        dt = datetime.fromisoformat(pub.replace("Z", "+00:00"))
+    except Exception:
+        try:
+            dt = datetime.strptime(pub[:10], "%Y-%m-%d")
+        except Exception:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
 
-    today = datetime.utcnow().date()
-    cutoff = today - timedelta(days=3)
 
-    # --- Source 1: Polygon news ---
-    polygon_data = fetch_polygon_news(sym)
-    polygon_items = polygon_data.get("items", []) if polygon_data.get("ok") else []
+def _news_key(title: str) -> Optional[str]:
+    """Near-duplicate key: hash of the first 12 lowercase alphanumeric title tokens."""
+    tokens = re.findall(r"[a-z0-9]+", (title or "").lower())
+    if not tokens:
+        return None
+    return hashlib.sha1(" ".join(tokens[:12]).encode()).hexdigest()[:16]
+
+
+class NewsIndex:
+    """Deduplicated news items indexed by symbol and publish time.
+
+    Items are normalised once on ingest; reads are a bisect + slice per symbol. With a store
+    every worker appends to the same JSONL file (items plus `ingestedAt` / `trackedAt` markers)
+    and tails it with sync(), so one ingesting worker fills the index of all of them.
+    """
+
+    def __init__(self, store_path: Optional[str] = None):
+        self.store_path = store_path
+        self._items: Dict[str, Dict[str, Any]] = {}
+        # symbol -> [(ts, key)] sorted ascending
+        self._by_symbol: Dict[str, List[Tuple[float, str]]] = {}
+        self._ingested_at: Dict[str, float] = {}
+        self._tracked_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        # (inode, offset) of the store file read so far
+        self._read_pos: Tuple[Optional[int], int] = (None, 0)
+
+    def last_ingest(self, symbol: str) -> Optional[float]:
+        return self._ingested_at.get(symbol)
+
+    def last_tracked(self, symbol: str) -> Optional[float]:
+        return self._tracked_at.get(symbol)
+
+    def add(self, symbol: str, raw_items: List[Dict[str, Any]], persist: bool = True) -> int:
+        """Index new items for `symbol`, then trim it to the retention window and NEWS_MAX_PER_SYMBOL.
+
+        Trimming here keeps the index bounded whether or not the background poll (and its prune) runs.
+        """
+        added: List[Dict[str, Any]] = []
+        cutoff = time.time() - NEWS_RETENTION_DAYS * 86400
+        with self._lock:
+            entries = self._by_symbol.setdefault(symbol, [])
+            for it in raw_items:
+                key = _news_key(it.get("title") or "")
+                if key is None:
+                    continue
+                item = self._items.get(key)
+                if item is None:
+                    ts = it.get("ts") or _published_ts(it.get("publishedAt"))
+                    if ts is not None and ts < cutoff:
+                        continue
+                    item = {
+                        "title": it.get("title"),
+                        "description": it.get("description"),
+                        "url": it.get("url"),
+                        "publishedAt": it.get("publishedAt"),
+                        "source": it.get("source"),
+                        "ts": ts if ts is not None else time.time(),
+                        "symbols": [],
+                    }
+                    self._items[key] = item
+                elif not item.get("description") and it.get("description"):
+                    item["description"] = it.get("description")
+                if symbol not in item["symbols"]:
+                    item["symbols"].append(symbol)
+                    bisect.insort(entries, (item["ts"], key))
+                    added.append({"symbol": symbol, "key": key, **item})
+            self._trim(symbol, cutoff)
+        if persist:
+            self._append(added)
+        return len(added)
+
+    def _trim(self, symbol: str, cutoff: float) -> None:
+        """Drop `symbol`'s entries older than cutoff or beyond its newest NEWS_MAX_PER_SYMBOL; caller holds _lock."""
+        entries = self._by_symbol.get(symbol, [])
+        keep_from = max(bisect.bisect_left(entries, (cutoff, "")), len(entries) - NEWS_MAX_PER_SYMBOL)
+        for _, key in entries[:keep_from]:
+            item = self._items.get(key)
+            if item is None:
+                continue
+            if symbol in item["symbols"]:
+                item["symbols"].remove(symbol)
+            if not item["symbols"]:
+                del self._items[key]
+        if keep_from >= len(entries):
+            self._by_symbol.pop(symbol, None)
+        elif keep_from > 0:
+            self._by_symbol[symbol] = entries[keep_from:]
+
+    def mark_ingested(self, symbol: str, at: Optional[float] = None, persist: bool = True) -> None:
+        self._ingested_at[symbol] = at = at or time.time()
+        if persist:
+            self._append([{"symbol": symbol, "ingestedAt": at}])
+
+    def note_tracked(self, symbol: str, at: float) -> None:
+        """Tell the ingesting worker (through the store) that a client asked for `symbol`."""
+        self._tracked_at[symbol] = at
+        self._append([{"symbol": symbol, "trackedAt": at}])
+
+    def feed(self, symbols: List[str], since_ts: float, limit: int) -> List[Dict[str, Any]]:
+        keys: Dict[str, float] = {}
+        with self._lock:
+            for sym in symbols:
+                entries = self._by_symbol.get(sym, [])
+                for ts, key in entries[bisect.bisect_left(entries, (since_ts, "")):]:
+                    keys[key] = ts
+            ordered = sorted(keys, key=keys.get, reverse=True)[:limit]
+            return [
+                {**{k: v for k, v in self._items[key].items() if k != "ts"}, "symbols": list(self._items[key]["symbols"])}
+                for key in ordered
+            ]
+
+    def prune(self, cutoff_ts: float) -> None:
+        with self._lock:
+            for sym in list(self._by_symbol):
+                self._trim(sym, cutoff_ts)
+
+    # --- JSONL store ---
+
+    @contextmanager
+    def _store_lock(self, exclusive: bool):
+        """Appends hold the store lock shared, compaction exclusive, so a rewrite never drops a line."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.store_path + ".lock", "a+b") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
 
-    # --- Source 2: Finviz news (already date-filtered to 3 days) ---
-    finviz_items = fetch_finviz_news(sym)
+    def _append(self, records: List[Dict[str, Any]]) -> None:
+        if not records or not self.store_path:
+            return
+        try:
+            with self._store_lock(exclusive=False), open(self.store_path, "ab") as f:
+                f.write(b"".join(orjson.dumps(rec) + b"\n" for rec in records))
+        except OSError:
+            logger.exception("news store append failed", extra={"path": self.store_path})
+
+    def sync(self) -> List[Tuple[str, float]]:
+        """Read what was appended to the store since the last call; returns its (symbol, trackedAt) markers.
+
+        A compacted (replaced) store is read again from the start; known items are skipped by add().
+        """
+        if not self.store_path or not os.path.exists(self.store_path):
+            return []
+        cutoff = time.time() - NEWS_RETENTION_DAYS * 86400
+        tracked: List[Tuple[str, float]] = []
+        with open(self.store_path, "rb") as f:
+            inode = os.fstat(f.fileno()).st_ino
+            offset = self._read_pos[1] if inode == self._read_pos[0] else 0
+            f.seek(offset)
+            chunk = f.read()
+        chunk = chunk[: chunk.rfind(b"\n") + 1]  # leave a line still being written for the next sync
+        self._read_pos = (inode, offset + len(chunk))
+        for line in chunk.splitlines():
+            try:
+                rec = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
+            sym = rec.get("symbol")
+            if not sym:
+                continue
+            if "ingestedAt" in rec:
+                self._ingested_at[sym] = max(self._ingested_at.get(sym, 0.0), rec["ingestedAt"])
+            elif "trackedAt" in rec:
+                self._tracked_at[sym] = max(self._tracked_at.get(sym, 0.0), rec["trackedAt"])
+                tracked.append((sym, rec["trackedAt"]))
+            elif rec.get("ts", 0) >= cutoff:
+                self.add(sym, [rec], persist=False)
+        return tracked
+
+    def compact(self) -> None:
+        """Rewrite the store with the items inside the retention window and each symbol's latest markers."""
+        if not self.store_path:
+            return
+        with self._store_lock(exclusive=True):
+            self.sync()
+            self.prune(time.time() - NEWS_RETENTION_DAYS * 86400)
+            tmp = self.store_path + ".tmp"
+            with self._lock, open(tmp, "wb") as f:
+                for key, item in self._items.items():
+                    for sym in item["symbols"]:
+                        f.write(orjson.dumps({"symbol": sym, "key": key, **item}) + b"\n")
+                for sym, at in self._ingested_at.items():
+                    f.write(orjson.dumps({"symbol": sym, "ingestedAt": at}) + b"\n")
+                track_cutoff = time.time() - NEWS_TRACK_TTL_S
+                for sym, at in self._tracked_at.items():
+                    if at >= track_cutoff:
+                        f.write(orjson.dumps({"symbol": sym, "trackedAt": at}) + b"\n")
+            os.replace(tmp, self.store_path)
+            self._read_pos = (os.stat(self.store_path).st_ino, os.path.getsize(self.store_path))
+
+
+NEWS_INDEX = NewsIndex(NEWS_STORE_PATH)
+# symbol -> last time a client asked for it (OrderedDict keeps LRU order)
+NEWS_TRACKED: "OrderedDict[str, float]" = OrderedDict((s, float("inf")) for s in NEWS_SEED_SYMBOLS)
+_NEWS_TRACK_LOCK = threading.Lock()
+_NEWS_STOP = threading.Event()
+_NEWS_WAKE = threading.Event()
+
+
+def _track_news_symbol(symbol: str, seen: Optional[float] = None) -> None:
+    """Keep `symbol` in the poll list; a client request (seen=None) is also passed on through the store."""
+    now = time.time()
+    with _NEWS_TRACK_LOCK:
+        last = NEWS_TRACKED.get(symbol)
+        if last != float("inf"):
+            NEWS_TRACKED[symbol] = max(last or 0.0, seen or now)
+        NEWS_TRACKED.move_to_end(symbol)
+        while len(NEWS_TRACKED) > NEWS_TRACK_MAX:
+            NEWS_TRACKED.popitem(last=False)
+    # At most one marker per symbol per poll interval, however often it is requested
+    noted = NEWS_INDEX.last_tracked(symbol) or 0.0
+    if NEWS_INGEST_ENABLED and seen is None and last != float("inf") and now - noted >= NEWS_POLL_S:
+        NEWS_INDEX.note_tracked(symbol, now)
+
+
+def ingest_news(symbol: str, fresh: bool = False) -> int:
+    """Pull Polygon + Finviz news for a symbol into NEWS_INDEX.
+
+    fresh=True (the background poll) bypasses the news caches. The Finviz quote page is only
+    re-scraped when it is older than a poll interval, so a page the profile just loaded is reused.
+    """
+    if fresh:
+        for namespace in ("polygon_news", "finviz_news"):
+            CACHES[namespace].pop((symbol,))
+        page = CACHES["finviz_page"].get((symbol,))
+        if not page or not page[0] or time.time() - page[0].get("fetchedAt", 0.0) >= NEWS_POLL_S:
+            CACHES["finviz_page"].pop((symbol,))
 
-    # --- Merge & normalise ---
-    all_items: List[Dict[str, Any]] = []
+    try:
+        polygon_data = fetch_polygon_news(symbol)
+    except HTTPException as e:
+        polygon_data = {"ok": False, "items": [], "error": e.detail}
+    polygon_items = [
+        {**it, "source": it.get("source") or "Polygon"} for it in (polygon_data.get("items", []) if polygon_data.get("ok") else [])
+    ]
+    finviz_items = [{**it, "source": it.get("source") or "Finviz"} for it in fetch_finviz_news(symbol)]
+
+    # Without the ingest loop nothing reads or compacts the store, so only the index is updated
+    added = NEWS_INDEX.add(symbol, polygon_items + finviz_items, persist=NEWS_INGEST_ENABLED)
+    # Only a poll tells the other workers (and the poller) the symbol is current
+    NEWS_INDEX.mark_ingested(symbol, persist=fresh)
+    log_event(
+        "news ingested",
+        lambda: {"symbol": symbol, "polygon_count": len(polygon_items), "finviz_count": len(finviz_items), "added": added},
+    )
+    return added
 
-    for it in polygon_items:
-        pub = it.get("publishedAt")
-        pub_date = None
-        if pub:
+
+def _news_ingest_loop() -> None:
+    """Poll tracked symbols into NEWS_INDEX; with a store only one worker polls and the others tail the store."""
+    try:
+        with _startup_step("news_store", "prewarm"):
+            NEWS_INDEX.sync()
+    except Exception:
+        logger.exception("news store load failed", extra={"path": NEWS_STORE_PATH})
+    compacted = 0.0
+    with ExitStack() as held:
+        # Without a shared store there is nothing to coordinate on: every worker polls for itself
+        leader = NEWS_STORE_PATH is None
+        while not _NEWS_STOP.is_set():
+            now = time.time()
+            if not leader:
+                # Retried every pass, so another worker takes over when the ingesting one exits
+                with ExitStack() as attempt:
+                    leader = attempt.enter_context(_try_flock(NEWS_STORE_PATH + ".leader"))
+                    if leader:
+                        held.enter_context(attempt.pop_all())
+                        logger.info("news ingest leader", extra={"path": NEWS_STORE_PATH})
             try:
-                pub_date = datetime.fromisoformat(pub.replace("Z", "+00:00")).date()
+                for sym, seen in NEWS_INDEX.sync():
+                    _track_news_symbol(sym, seen)
+                if leader and NEWS_STORE_PATH and now - compacted >= NEWS_COMPACT_EVERY_S:
+                    NEWS_INDEX.compact()
+                    compacted = now
             except Exception:
+                logger.exception("news store sync failed", extra={"path": NEWS_STORE_PATH})
+            with _NEWS_TRACK_LOCK:
+                for sym, seen in list(NEWS_TRACKED.items()):
+                    if now - seen > NEWS_TRACK_TTL_S:
+                        del NEWS_TRACKED[sym]
+                due = [
+                    sym for sym in NEWS_TRACKED if now - (NEWS_INDEX.last_ingest(sym) or 0.0) >= NEWS_POLL_S
+                ]
+            for sym in due if leader else []:
+                if _NEWS_STOP.is_set():
+                    return
                 try:
-                    pub_date = datetime.strptime(pub[:10], "%Y-%m-%d").date()
+                    ingest_news(sym, fresh=True)
                 except Exception:
-                    pass
-        if pub_date and pub_date < cutoff:
-            continue
-        all_items.append({
-            "title": it.get("title"),
-            "description": it.get("description"),
-            "url": it.get("url"),
-            "publishedAt": it.get("publishedAt"),
-            "source": it.get("source") or "Polygon",
-        })
+                    logger.exception("news ingest failed", extra={"symbol": sym})
+            NEWS_INDEX.prune(now - NEWS_RETENTION_DAYS * 86400)
+            _NEWS_WAKE.wait(timeout=min(30.0, NEWS_POLL_S))
+            _NEWS_WAKE.clear()
 
-    for it in finviz_items:
-        all_items.append({
-            "title": it.get("title"),
-            "description": it.get("description"),
-            "url": it.get("url"),
-            "publishedAt": it.get("publishedAt"),
-            "source": it.get("source") or "Finviz",
-        })
 
-    # --- Deduplicate by title ---
-    seen_titles: set = set()
-    unique_items: List[Dict[str, Any]] = []
-    for it in all_items:
-        title_key = (it.get("title") or "").lower().strip()[:60]
-        if title_key and title_key in seen_titles:
-            continue
-        seen_titles.add(title_key)
-        unique_items.append(it)
+@app.on_event("startup")
+def _start_news_ingester():
+    if not NEWS_INGEST_ENABLED:
+        return
+    threading.Thread(target=_news_ingest_loop, name="news-ingest", daemon=True).start()
+
+
+@app.on_event("shutdown")
+def _stop_news_ingester():
+    _NEWS_STOP.set()
+    _NEWS_WAKE.set()
+
+
+def _parse_since(since: Optional[str], default_days: int) -> float:
+    if not since:
+        day = datetime.now(timezone.utc).date() - timedelta(days=default_days)
+        return datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp()
+    if re.fullmatch(r"[0-9]+(\.[0-9]+)?", since):
+        return float(since)
+    ts = _published_ts(since)
+    if ts is None:
+        raise HTTPException(status_code=400, detail="Invalid since. Expected ISO date/time or unix seconds")
+    return ts
+
+
+@app.get("/ticker/news")
+def ticker_news(symbol: str = Query(...)):
+    sym = _clean_symbol(symbol)
+    log_event("ticker_news request", lambda: {"symbol": sym})
 
-    # --- Sort by date descending ---
-    unique_items.sort(key=lambda x: x.get("publishedAt") or "", reverse=True)
-    unique_items = unique_items[:20]
+    _track_news_symbol(sym)
+    # Served from the index; only a symbol that was never (or too long ago) ingested costs a scrape
+    last = NEWS_INDEX.last_ingest(sym)
+    if last is None or time.time() - last > 2 * NEWS_POLL_S or not NEWS_INGEST_ENABLED:
+        ingest_news(sym)
+
+    unique_items = NEWS_INDEX.feed([sym], _parse_since(None, 3), limit=20)
+    for it in unique_items:
+        it.pop("symbols", None)
 
     sources_found = sorted(set(it.get("source", "") for it in unique_items if it.get("source")))
 
-    logger.info(
+    log_event(
         "ticker_news merged",
-        extra={
+        lambda: {
             "symbol": sym,
-            "polygon_count": len(polygon_items),
-            "finviz_count": len(finviz_items),
             "merged_count": len(unique_items),
             "sources": sources_found,
         },
@@ -1137,30 +3478,450 @@ def ticker_news(symbol: str = Query(...)):
     }
 
 
+@app.get("/news/feed")
+def news_feed(
+    symbols: str = Query(..., description="Comma-separated symbols"),
+    since: Optional[str] = Query(None, description="ISO date/time or unix seconds; default 3 days ago"),
+    limit: int = Query(50, ge=1, le=500),
+):
+    syms = list(dict.fromkeys(_clean_symbol(x) for x in symbols.split(",") if x.strip()))
+    if not syms:
+        raise HTTPException(status_code=400, detail="symbols is required")
+    if len(syms) > NEWS_TRACK_MAX:
+        raise HTTPException(status_code=400, detail=f"At most {NEWS_TRACK_MAX} symbols")
+
+    pending = []
+    for sym in syms:
+        _track_news_symbol(sym)
+        if NEWS_INDEX.last_ingest(sym) is None:
+            pending.append(sym)
+    if pending:
+        # New symbols are picked up by the ingester on its next pass; don't scrape on the request
+        _NEWS_WAKE.set()
+
+    items = NEWS_INDEX.feed(syms, _parse_since(since, 3), limit=limit)
+    return {"symbols": syms, "count": len(items), "items": items, "pending": pending}
+
+
 @app.get("/ticker/intraday")
 def ticker_intraday(symbol: str = Query(...), date: str = Query(...)):
     sym = _clean_symbol(symbol)
-    return fetch_intraday_1m(sym, date)
+    return fetch_intraday_1m(sym, date).payload()
+
+
+def fetch_polygon_grouped_daily(day: str) -> Dict[str, Tuple[float, float, float, float, float]]:
+    """Every US stock's bar for one session: symbol -> (open, high, low, close, volume). Empty on holidays."""
+    url = f"https://api.polygon.io/v2/aggs/grouped/locale/us/market/stocks/{day}"
+    params = {"adjusted": "true", "apiKey": _polygon_key()}
+    with UPSTREAM_BULKHEADS["polygon"].slot(), httpx.Client(timeout=60.0) as client:
+        resp = client.get(url, params=params)
+    if resp.status_code == 429:
+        raise HTTPException(status_code=429, detail="Polygon grouped daily rate limited")
+    if resp.status_code != 200:
+        raise HTTPException(status_code=502, detail=f"Polygon grouped daily status {resp.status_code}")
+    bars: Dict[str, Tuple[float, float, float, float, float]] = {}
+    for bar in resp.json().get("results") or []:
+        try:
+            bars[str(bar["T"])] = (
+                float(bar["o"]), float(bar["h"]), float(bar["l"]), float(bar["c"]), float(bar.get("v") or 0)
+            )
+        except (KeyError, TypeError, ValueError):
+            continue
+    return bars
+
+
+def fetch_polygon_splits(after: str, through: str) -> List[Tuple[str, str, float]]:
+    """(symbol, execution day, price factor) for splits executed in (after, through]."""
+    params: Optional[Dict[str, Any]] = {
+        "execution_date.gt": after,
+        "execution_date.lte": through,
+        "limit": 1000,
+        "apiKey": _polygon_key(),
+    }
+    url: Optional[str] = "https://api.polygon.io/v3/reference/splits"
+    splits: List[Tuple[str, str, float]] = []
+    with httpx.Client(timeout=20.0) as client:
+        while url:
+            with UPSTREAM_BULKHEADS["polygon"].slot():
+                resp = client.get(url, params=params or {"apiKey": POLYGON_API_KEY})
+            if resp.status_code != 200:
+                raise HTTPException(status_code=502, detail=f"Polygon splits status {resp.status_code}")
+            data = resp.json()
+            for sp in data.get("results") or []:
+                try:
+                    splits.append((sp["ticker"], sp["execution_date"], float(sp["split_from"]) / float(sp["split_to"])))
+                except (KeyError, TypeError, ValueError, ZeroDivisionError):
+                    continue
+            url, params = data.get("next_url"), None
+    return splits
+
+
+_PANEL_FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+class DailyPanel:
+    """Whole-market daily OHLCV as one float64 memmap of shape (symbol capacity, day capacity, 5).
+
+    meta.json holds the symbol index (row order), the session days (column order) and the data file
+    of the current generation. A symbol's history is one contiguous (days, 5) block, so reads are
+    zero-copy slices. Appending a session writes one column in place; outgrowing either capacity,
+    or trimming to PANEL_DAYS, writes a new generation file and swaps meta.json atomically, so other
+    workers pick it up on their next read. Only the ingest thread writes.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.meta_path = os.path.join(root, "meta.json")
+        self._lock = threading.Lock()
+        self._mtime: Optional[int] = None
+        # (meta, memmap, symbol -> row, DatetimeIndex of the days), swapped as one reference
+        self._state: Optional[Tuple[Dict[str, Any], np.ndarray, Dict[str, int], Any]] = None
+
+    def _refresh(self) -> None:
+        try:
+            mtime = os.stat(self.meta_path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime:
+            return
+        with self._lock:
+            with open(self.meta_path, "rb") as f:
+                meta = orjson.loads(f.read())
+            self._open(meta)
+            self._mtime = mtime
+
+    def _map(self, meta: Dict[str, Any], mode: str) -> np.ndarray:
+        return np.memmap(
+            os.path.join(self.root, meta["file"]),
+            dtype=np.float64,
+            mode=mode,
+            shape=(meta["symbolCap"], meta["dayCap"], len(_PANEL_FIELDS)),
+        )
+
+    def _open(self, meta: Dict[str, Any]) -> None:
+        # Read-only for every reader; the writer maps the file r+ only while it writes (_writable)
+        data = self._map(meta, "r")
+        index = {sym: i for i, sym in enumerate(meta["symbols"])}
+        self._state = (meta, data, index, pd.DatetimeIndex(meta["days"]))
+
+    def status(self) -> Dict[str, Any]:
+        self._refresh()
+        if self._state is None:
+            return {"enabled": True, "symbols": 0, "days": 0}
+        meta = self._state[0]
+        return {
+            "enabled": True,
+            "file": meta["file"],
+            "symbols": len(meta["symbols"]),
+            "days": len(meta["days"]),
+            "firstDay": meta["days"][0] if meta["days"] else None,
+            "lastDay": meta["days"][-1] if meta["days"] else None,
+            "adjustedThrough": meta.get("adjustedThrough"),
+            "syncedThrough": meta.get("syncedThrough"),
+            "symbolCap": meta["symbolCap"],
+            "dayCap": meta["dayCap"],
+        }
+
+    def last_day(self) -> Optional[str]:
+        self._refresh()
+        days = self._state[0]["days"] if self._state else []
+        return days[-1] if days else None
+
+    def frame(self, symbol: str, since: str) -> Optional[pd.DataFrame]:
+        """Daily bars for `symbol` from `since` on, indexed by naive session date like Yahoo's."""
+        self._refresh()
+        state = self._state
+        if state is None:
+            return None
+        meta, data, index, day_index = state
+        row = index.get(symbol)
+        if row is None:
+            return None
+        start = bisect.bisect_left(meta["days"], since)
+        block = data[row, start : len(meta["days"])]
+        traded = ~np.isnan(block[:, 3])
+        if not traded.all():
+            block = block[traded]  # sessions before listing / while halted; the only copy on this path
+        return pd.DataFrame(block, index=day_index[start:][traded], columns=_PANEL_FIELDS, copy=False)
+
+    # --- writer side (ingest thread) ---
+
+    def _writable(self) -> np.ndarray:
+        return self._map(self._state[0], "r+")
+
+    def _write_meta(self, meta: Dict[str, Any]) -> None:
+        tmp = self.meta_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps(meta))
+        os.replace(tmp, self.meta_path)
+        with self._lock:
+            self._open(meta)
+            self._mtime = os.stat(self.meta_path).st_mtime_ns
+
+    def _regenerate(self, symbol_cap: int, keep_days: int) -> None:
+        """Copy the live block (minus dropped old days) into a new, larger generation file."""
+        old = self._state
+        meta = dict(old[0]) if old else {"symbols": [], "days": [], "adjustedThrough": None, "generation": 0}
+        drop = max(0, len(meta["days"]) - keep_days)
+        meta["generation"] = meta.get("generation", 0) + 1
+        meta["file"] = f"panel-{meta['generation']}.f64"
+        meta["symbolCap"] = symbol_cap
+        meta["dayCap"] = PANEL_DAYS + 32
+        data = np.memmap(
+            os.path.join(self.root, meta["file"]),
+            dtype=np.float64,
+            mode="w+",
+            shape=(meta["symbolCap"], meta["dayCap"], len(_PANEL_FIELDS)),
+        )
+        if old is not None:
+            n_sym, n_day = len(meta["symbols"]), len(meta["days"])
+            data[:n_sym, : n_day - drop] = old[1][:n_sym, drop:n_day]
+            meta["days"] = meta["days"][drop:]
+        data.flush()
+        del data
+        self._write_meta(meta)
+        if old is not None and old[0]["file"] != meta["file"]:
+            try:
+                os.remove(os.path.join(self.root, old[0]["file"]))  # readers keep their mapping
+            except OSError:
+                pass
+
+    def append_day(self, day: str, bars: Dict[str, Tuple[float, float, float, float, float]], fetched_through: str) -> None:
+        """Add one session as the newest column; `fetched_through` is the day its adjustment is as of."""
+        self._refresh()
+        meta = self._state[0] if self._state else {"symbols": [], "days": []}
+        if meta["days"] and day <= meta["days"][-1]:
+            return
+        symbols = meta["symbols"] + sorted(set(bars) - set(meta["symbols"]))
+        if self._state is None or len(symbols) > meta["symbolCap"] or len(meta["days"]) >= meta["dayCap"]:
+            cap = self._state[0]["symbolCap"] if self._state else 0
+            while cap < len(symbols):
+                cap = max(4096, cap * 2)
+            self._regenerate(cap, PANEL_DAYS - 1)
+        meta, data = self._state[0], self._writable()
+        n_old, col = len(meta["symbols"]), len(meta["days"])
+        data[n_old : len(symbols), :col] = np.nan  # new listings have no history
+        data[: len(symbols), col] = np.nan
+        index = {sym: i for i, sym in enumerate(symbols)}
+        rows = np.fromiter((index[sym] for sym in bars), dtype=np.int64, count=len(bars))
+        data[rows, col] = np.array(list(bars.values()), dtype=np.float64).reshape(-1, len(_PANEL_FIELDS))
+        data.flush()
+        adjusted = meta.get("adjustedThrough") or fetched_through
+        self._write_meta({**meta, "symbols": symbols, "days": meta["days"] + [day], "adjustedThrough": adjusted})
+
+    def apply_splits(self, splits: List[Tuple[str, str, float]], through: str) -> int:
+        """Scale stored bars before each split's execution day, then mark the store adjusted through `through`."""
+        self._refresh()
+        if self._state is None:
+            return 0
+        meta, _, index, _ = self._state
+        data = self._writable()
+        applied = 0
+        for sym, execution_day, factor in splits:
+            row = index.get(sym)
+            if row is None:
+                continue
+            k = bisect.bisect_left(meta["days"], execution_day)
+            data[row, :k, :4] *= factor
+            data[row, :k, 4] /= factor
+            applied += 1
+        data.flush()
+        self._write_meta({**meta, "adjustedThrough": through})
+        return applied
+
+    def mark_synced(self, through: str) -> None:
+        """Every session up to `through` is in (holidays just have no column); the ingest loop keys off this."""
+        self._refresh()
+        if self._state is not None:
+            self._write_meta({**self._state[0], "syncedThrough": through})
+
+
+DAILY_PANEL: Optional[DailyPanel] = None
+if PANEL_DIR:
+    os.makedirs(PANEL_DIR, exist_ok=True)
+    DAILY_PANEL = DailyPanel(PANEL_DIR)
+_PANEL_STOP = threading.Event()
+_PANEL_WAKE = threading.Event()
+PANEL_LAST_RUN: Dict[str, Any] = {}
+
+
+def _panel_through(now: Any) -> str:
+    """Newest session whose grouped bars are final: today once PANEL_UPDATE_AT has passed."""
+    day = now.normalize()
+    if now.strftime("%H:%M") < PANEL_UPDATE_AT:
+        day -= pd.Timedelta(days=1)
+    return day.strftime("%Y-%m-%d")
+
+
+def update_daily_panel() -> Dict[str, Any]:
+    """Apply splits since the last run, then append every missing session up to the newest final one."""
+    panel = DAILY_PANEL
+    through = _panel_through(pd.Timestamp.now(tz=DEFAULT_TZ))
+    last = panel.last_day()
+    start = (pd.Timestamp(last) + pd.Timedelta(days=1)) if last else pd.Timestamp(through) - pd.offsets.BDay(PANEL_DAYS)
+    report: Dict[str, Any] = {"through": through, "added": [], "holidays": 0, "splits": 0}
+
+    adjusted = panel.status().get("adjustedThrough")
+    if adjusted and adjusted < through:
+        # Rows stored so far are adjusted as of `adjusted`; new rows come back adjusted as of today
+        report["splits"] = panel.apply_splits(fetch_polygon_splits(adjusted, through), through)
+
+    for ts in pd.bdate_range(start, through):
+        if _PANEL_STOP.is_set():
+            break
+        day = ts.strftime("%Y-%m-%d")
+        try:
+            bars = fetch_polygon_grouped_daily(day)
+        except (BulkheadFull, HTTPException) as e:
+            if isinstance(e, HTTPException) and e.status_code != 429:
+                raise
+            # Out of budget: keep the sessions added so far, the next check resumes from here
+            report["rateLimited"] = day
+            logger.warning("daily panel backfill rate limited", extra={"day": day, "added": len(report["added"])})
+            break
+        if bars:
+            panel.append_day(day, bars, through)
+            report["added"].append(day)
+        else:
+            report["holidays"] += 1
+        if PANEL_CALL_GAP_S:
+            _PANEL_STOP.wait(PANEL_CALL_GAP_S)
+    else:
+        panel.mark_synced(through)
+    return report
+
+
+@contextmanager
+def _try_flock(path: str):
+    """Yield True in the one worker that holds `path` locked, False in the others (always True without fcntl)."""
+    if fcntl is None:
+        yield True
+        return
+    with open(path, "a+b") as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _panel_ingest_loop() -> None:
+    while not _PANEL_STOP.is_set():
+        through = _panel_through(pd.Timestamp.now(tz=DEFAULT_TZ))
+        if (DAILY_PANEL.status().get("syncedThrough") or "") < through:
+            t0 = time.perf_counter()
+            try:
+                # One ingesting worker per panel directory; the others only read
+                with _try_flock(os.path.join(PANEL_DIR, "ingest.lock")) as writer:
+                    if writer:
+                        report = update_daily_panel()
+                        PANEL_LAST_RUN.clear()
+                        PANEL_LAST_RUN.update(report, ok=True, ms=round((time.perf_counter() - t0) * 1000, 1))
+                        logger.info("daily panel updated", extra={"added": len(report["added"]), "through": through})
+            except Exception as e:
+                PANEL_LAST_RUN.update(ok=False, error=f"{type(e).__name__}: {e}", at=time.time())
+                logger.exception("daily panel update failed", extra={"through": through})
+        # A check is one stat() when the panel is current; failed or partial runs retry on the next one
+        _PANEL_WAKE.wait(timeout=600.0)
+        _PANEL_WAKE.clear()
+
+
+@app.on_event("startup")
+def _start_panel_ingester():
+    if DAILY_PANEL is None or not PANEL_INGEST_ENABLED or not POLYGON_API_KEY:
+        return
+    threading.Thread(target=_panel_ingest_loop, name="panel-ingest", daemon=True).start()
+
+
+@app.on_event("shutdown")
+def _stop_panel_ingester():
+    _PANEL_STOP.set()
+    _PANEL_WAKE.set()
+
+
+def _live_daily_bar(symbol: str, day: str) -> Optional[pd.DataFrame]:
+    """Today's regular session so far as a one-row daily frame, from the (cached) 1m bars; None on a holiday."""
+    try:
+        bars = fetch_intraday_1m(symbol, day)
+    except HTTPException as e:
+        if e.status_code == 404:
+            return None
+        raise
+    regular = compute_session_stats(bars.arrays(_OHLCV), None)["regular"]
+    if regular is None:
+        return None
+    row = [[regular[f.lower()] for f in _PANEL_FIELDS]]
+    return pd.DataFrame(row, index=pd.DatetimeIndex([day]), columns=_PANEL_FIELDS)
+
+
+def _panel_daily(symbol: str, months: int) -> Optional[pd.DataFrame]:
+    """The panel's bars for the same window fetch_daily covers, or None when it can't serve them.
+
+    The panel only holds finished sessions, so during one today's bar comes from the live 1m bars
+    like Yahoo's daily has it; if those fail the whole read falls back to the daily providers.
+    """
+    if DAILY_PANEL is None:
+        return None
+    last = DAILY_PANEL.last_day()
+    now = pd.Timestamp.now(tz=DEFAULT_TZ)
+    today = now.tz_localize(None).normalize()
+    if last is None or (today - pd.Timestamp(last)).days > PANEL_MAX_STALE_DAYS:
+        return None
+    since = (today + pd.Timedelta(days=1 - months * 31)).strftime("%Y-%m-%d")
+    df = DAILY_PANEL.frame(symbol, since)
+    if df is None or df.shape[0] < 3:
+        return None
+    day = today.strftime("%Y-%m-%d")
+    if last < day and now.weekday() < 5 and now.hour * 60 + now.minute >= SESSIONS["regular"][0]:
+        try:
+            live = _live_daily_bar(symbol, day)
+        except HTTPException:
+            return None
+        if live is not None:
+            df = pd.concat([df, live])
+    return df
+
+
+# Registry name -> (provider label, fetch); the label is what /ticker/gaps reports
+DAILY_PROVIDERS = {
+    "yahoo_daily": ("yahoo", fetch_daily),
+    "polygon_daily": ("polygon", fetch_polygon_daily),
+}
+
+
+def _fetch_daily_hedged(symbol: str, months: int) -> Tuple[pd.DataFrame, str, str]:
+    """(daily bars, upstream provider label, source): source is "panel" for the local store, else "live"."""
+    df = _panel_daily(symbol, months)
+    if df is not None:
+        return df, "polygon", "panel"  # the panel is filled from Polygon's grouped daily bars
+    for label, fetch in DAILY_PROVIDERS.values():
+        if _cached(fetch, symbol, months):
+            return fetch(symbol, months), label, "live"
+    df, name = PROVIDERS.call_hedged(
+        {name: functools.partial(fetch, symbol, months) for name, (_, fetch) in DAILY_PROVIDERS.items()}
+    )
+    return df, DAILY_PROVIDERS[name][0], "live"
 
 
 @app.get("/ticker/gaps")
 def ticker_gaps(symbol: str = Query(...), months: int = Query(9, ge=6, le=12), gap_threshold: float = Query(24.0, ge=0.0, le=200.0)):
     sym = _clean_symbol(symbol)
-    logger.info("ticker_gaps request", extra={"symbol": sym, "months": months, "gap_threshold": gap_threshold})
+    log_event("ticker_gaps request", lambda: {"symbol": sym, "months": months, "gap_threshold": gap_threshold})
     try:
-        try:
-            df = fetch_daily(sym, months=months)
-            provider = "yahoo"
-        except HTTPException as e:
-            logger.warning("yahoo daily unavailable, trying polygon", extra={"symbol": sym, "detail": e.detail})
-            df = fetch_polygon_daily(sym, months=months)
-            provider = "polygon"
+        df, provider, source = _fetch_daily_hedged(sym, months)
 
-        logger.info("daily rows downloaded", extra={"symbol": sym, "rows": int(df.shape[0]), "provider": provider})
+        log_event(
+            "daily rows downloaded",
+            lambda: {"symbol": sym, "rows": int(df.shape[0]), "provider": provider, "source": source},
+        )
         stats = compute_gap_stats(df, gap_threshold=gap_threshold)
-        logger.info(
+        log_event(
             "gap stats computed",
-            extra={
+            lambda: {
                 "symbol": sym,
                 "rows": int(df.shape[0]),
                 "gapsCount": stats.get("gapsCount"),
@@ -1168,7 +3929,7 @@ def ticker_gaps(symbol: str = Query(...), months: int = Query(9, ge=6, le=12), g
                 "provider": provider,
             },
         )
-        return {"symbol": sym, "months": months, "ok": True, "provider": provider, **stats}
+        return {"symbol": sym, "months": months, "ok": True, "provider": provider, "source": source, **stats}
     except HTTPException as e:
         logger.warning(
             "gaps unavailable",
@@ -1182,3 +3943,964 @@ def ticker_gaps(symbol: str = Query(...), months: int = Query(9, ge=6, le=12), g
             "redAfterGapPercent": 0.0,
         }
         return {"symbol": sym, "months": months, "ok": False, "error": e.detail, **empty}
+
+
+
+class TradeIn(BaseModel):
+    id: Optional[str] = None
+    symbol: str
+    side: str = Field(..., description="BUY/LONG or SELL/SHORT")
+    entryTime: datetime
+    entryPrice: float = Field(..., gt=0)
+    exitTime: Optional[datetime] = None
+    exitPrice: Optional[float] = Field(None, gt=0)
+
+
+class ExcursionRequest(BaseModel):
+    trades: List[TradeIn] = Field(..., min_length=1, max_length=EXCURSION_MAX_TRADES)
+    # How far after the exit the post-exit move is measured
+    postExitMinutes: int = Field(30, ge=1, le=390)
+
+
+_LONG_SIDES = {"BUY", "B", "LONG", "L"}
+_SHORT_SIDES = {"SELL", "S", "SHORT", "SS"}
+
+
+def _session_ts(dt: datetime) -> pd.Timestamp:
+    # Naive times are market-local (DEFAULT_TZ), like the journal's fills
+    ts = pd.Timestamp(dt)
+    return ts.tz_localize(DEFAULT_TZ) if ts.tzinfo is None else ts.tz_convert(DEFAULT_TZ)
+
+
+def compute_excursions(
+    bars: Dict[str, np.ndarray],
+    entry_t: np.ndarray,
+    entry_px: np.ndarray,
+    exit_t: np.ndarray,
+    exit_px: np.ndarray,
+    direction: np.ndarray,
+    post_exit_s: float,
+) -> Dict[str, np.ndarray]:
+    """MFE / MAE / time-to-MFE / post-exit move for every trade of one symbol-day at once.
+
+    Times are unix seconds; direction is +1 (long) / -1 (short); exit_t / exit_px may be NaN
+    (open trade: measured to the end of the session, no post-exit move). Each trade's bar
+    window [entry bar, exit bar] becomes a row of a (trades x longest window) matrix.
+    """
+    t, high, low, close = bars["time"], bars["high"], bars["low"], bars["close"]
+    n = t.shape[0]
+    has_exit = ~np.isnan(exit_t)
+    first = np.searchsorted(t, entry_t, side="right") - 1
+    last = np.where(has_exit, np.searchsorted(t, np.where(has_exit, exit_t, 0.0), side="right") - 1, n - 1)
+    valid = (first >= 0) & (last >= first)
+    first = np.where(valid, first, 0)
+    last = np.where(valid, last, 0)
+
+    width = int((last - first).max()) + 1 if valid.any() else 1
+    idx = first[:, None] + np.arange(width)[None, :]
+    in_window = idx <= last[:, None]
+    idx = np.minimum(idx, n - 1)
+
+    # Favourable / adverse excursion per bar, in the trade's direction
+    d = direction[:, None]
+    fav = np.where(d > 0, high[idx] - entry_px[:, None], entry_px[:, None] - low[idx])
+    adv = np.where(d > 0, entry_px[:, None] - low[idx], high[idx] - entry_px[:, None])
+    fav = np.where(in_window, fav, -np.inf)
+    adv = np.where(in_window, adv, -np.inf)
+
+    rows = np.arange(first.shape[0])
+    mfe_col = fav.argmax(axis=1)
+    mae_col = adv.argmax(axis=1)
+    mfe = np.maximum(fav[rows, mfe_col], 0.0)
+    mae = np.maximum(adv[rows, mae_col], 0.0)
+    mfe_time = t[idx[rows, mfe_col]]
+    mae_time = t[idx[rows, mae_col]]
+
+    # Post-exit: close of the last bar starting within post_exit_s of the exit, vs the exit price
+    post_i = np.searchsorted(t, np.where(has_exit, exit_t + post_exit_s, 0.0), side="right") - 1
+    post_ok = valid & has_exit & (post_i > last)
+    post_move = np.where(post_ok, (close[np.maximum(post_i, 0)] - exit_px) * direction, np.nan)
+
+    return {
+        "valid": valid,
+        "mfe": mfe,
+        "mae": mae,
+        "mfeTime": mfe_time,
+        "maeTime": mae_time,
+        "timeToMfe": np.maximum(mfe_time - entry_t, 0.0),
+        "postExitMove": post_move,
+        "bars": last - first + 1,
+    }
+
+
+def _round_or_none(x: float, digits: int = 4) -> Optional[float]:
+    return None if x is None or not np.isfinite(x) else round(float(x), digits)
+
+
+@app.post("/trades/excursions")
+def trade_excursions(req: ExcursionRequest):
+    """Batch MFE/MAE for journal trades; each symbol-day's 1m bars are loaded once."""
+    results: List[Optional[Dict[str, Any]]] = [None] * len(req.trades)
+    groups: Dict[Tuple[str, str], List[int]] = {}
+    # trade index -> (direction, entry, exit)
+    parsed: Dict[int, Tuple[int, pd.Timestamp, Optional[pd.Timestamp]]] = {}
+
+    for i, trade in enumerate(req.trades):
+        side = trade.side.strip().upper()
+        direction = 1 if side in _LONG_SIDES else -1 if side in _SHORT_SIDES else 0
+        entry = _session_ts(trade.entryTime)
+        exit_ = _session_ts(trade.exitTime) if trade.exitTime is not None else None
+        base = {"id": trade.id, "symbol": trade.symbol.strip().upper(), "date": entry.strftime("%Y-%m-%d")}
+        if direction == 0:
+            results[i] = {**base, "ok": False, "error": f"Unknown side {trade.side!r}"}
+            continue
+        try:
+            sym = _clean_symbol(trade.symbol)
+        except HTTPException as e:
+            results[i] = {**base, "ok": False, "error": e.detail}
+            continue
+        parsed[i] = (direction, entry, exit_)
+        groups.setdefault((sym, base["date"]), []).append(i)
+
+    def load(key: Tuple[str, str]):
+        try:
+            return key, fetch_intraday_1m(*key), None
+        except HTTPException as e:
+            return key, None, e.detail
+
+    with ThreadPoolExecutor(max_workers=max(1, min(EXCURSION_FETCH_WORKERS, len(groups)))) as pool:
+        loaded = list(pool.map(load, groups))
+
+    for (sym, day), bars, err in loaded:
+        members = groups[(sym, day)]
+        if err is not None or not len(bars):
+            for i in members:
+                results[i] = {"id": req.trades[i].id, "symbol": sym, "date": day, "ok": False, "error": err or "No bars"}
+            continue
+
+        trades = [req.trades[i] for i in members]
+        exits = [parsed[i][2] for i in members]
+        out = compute_excursions(
+            bars.arrays(),
+            entry_t=np.array([parsed[i][1].timestamp() for i in members]),
+            entry_px=np.array([t.entryPrice for t in trades], dtype=np.float64),
+            exit_t=np.array([x.timestamp() if x is not None else np.nan for x in exits]),
+            exit_px=np.array([t.exitPrice if t.exitPrice is not None else np.nan for t in trades], dtype=np.float64),
+            direction=np.array([parsed[i][0] for i in members], dtype=np.float64),
+            post_exit_s=req.postExitMinutes * 60.0,
+        )
+        for k, i in enumerate(members):
+            base = {"id": trades[k].id, "symbol": sym, "date": day}
+            if not out["valid"][k]:
+                results[i] = {**base, "ok": False, "error": "Trade times fall outside the session's bars"}
+                continue
+            px = trades[k].entryPrice
+            results[i] = {
+                **base,
+                "ok": True,
+                "side": "LONG" if parsed[i][0] > 0 else "SHORT",
+                "bars": int(out["bars"][k]),
+                "mfe": _round_or_none(out["mfe"][k]),
+                "mae": _round_or_none(out["mae"][k]),
+                "mfePercent": _round_or_none(out["mfe"][k] / px * 100.0, 2),
+                "maePercent": _round_or_none(out["mae"][k] / px * 100.0, 2),
+                "mfeTime": int(out["mfeTime"][k]),
+                "maeTime": int(out["maeTime"][k]),
+                "timeToMfeSeconds": int(out["timeToMfe"][k]),
+                "postExitMove": _round_or_none(out["postExitMove"][k]),
+                "postExitPercent": _round_or_none(out["postExitMove"][k] / trades[k].exitPrice * 100.0, 2)
+                if trades[k].exitPrice
+                else None,
+            }
+
+    log_event("trade excursions computed", lambda: {"trades": len(req.trades), "symbolDays": len(groups)})
+    return {"count": len(results), "symbolDays": len(groups), "postExitMinutes": req.postExitMinutes, "trades": results}
+
+
+SESSION_MINUTES = 390  # 09:30-16:00
+PREMARKET_MINUTES = 330  # 04:00-09:30
+
+
+def _index_day(idx: Any) -> str:
+    # Yahoo daily rows are naive dates; Polygon's are UTC instants at the ET midnight
+    ts = pd.Timestamp(idx)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert(DEFAULT_TZ)
+    return ts.strftime("%Y-%m-%d")
+
+
+def align_sessions(sessions: List[Dict[str, np.ndarray]], days: List[str]) -> Dict[str, np.ndarray]:
+    """Scatter every session's 1m bars onto an (events x minute-from-open) grid.
+
+    Returns open/high/low/close/volume matrices (NaN where a minute has no bar) and each
+    event's premarket high (-inf when there was no premarket trading).
+    """
+    n_events = len(sessions)
+    open_ts = np.array([pd.Timestamp(f"{day} 09:30", tz=DEFAULT_TZ).timestamp() for day in days])
+    lens = np.array([s["time"].shape[0] for s in sessions], dtype=np.int64)
+    row = np.repeat(np.arange(n_events), lens)
+    cat = {f: np.concatenate([s[f] for s in sessions]) if n_events else np.empty(0) for f in _OHLCV}
+    minute = np.floor((cat["time"] - open_ts[row]) / 60.0).astype(np.int64)
+
+    regular = (minute >= 0) & (minute < SESSION_MINUTES)
+    grid: Dict[str, np.ndarray] = {}
+    for f in ("open", "high", "low", "close", "volume"):
+        m = np.full((n_events, SESSION_MINUTES), np.nan)
+        m[row[regular], minute[regular]] = cat[f][regular]
+        grid[f] = m
+
+    premarket = (minute < 0) & (minute >= -PREMARKET_MINUTES)
+    pm_high = np.full(n_events, -np.inf)
+    np.maximum.at(pm_high, row[premarket], cat["high"][premarket])
+    grid["pmHigh"] = pm_high
+    return grid
+
+
+def _first_valid(m: np.ndarray) -> np.ndarray:
+    return np.argmax(~np.isnan(m), axis=1)
+
+
+def _last_valid(m: np.ndarray) -> np.ndarray:
+    return m.shape[1] - 1 - np.argmax(~np.isnan(m[:, ::-1]), axis=1)
+
+
+def gap_event_study(grid: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    """Per-event and aggregate intraday shape statistics, computed across all events at once."""
+    o, h, l, c, v = (grid[f] for f in ("open", "high", "low", "close", "volume"))
+    rows = np.arange(h.shape[0])
+
+    open_px = o[rows, _first_valid(o)]
+    close_px = c[rows, _last_valid(c)]
+    hod_minute = np.nanargmax(h, axis=1)
+    hod = h[rows, hod_minute]
+    lod = np.nanmin(l, axis=1)
+
+    fade = (open_px - close_px) / open_px * 100.0
+    max_fade = (open_px - lod) / open_px * 100.0
+
+    pm_high = grid["pmHigh"]
+    pm_known = np.isfinite(pm_high)
+    above_pm = h > pm_high[:, None]
+    pm_break = pm_known & above_pm.any(axis=1)
+    pm_break_minute = np.where(pm_break, np.argmax(above_pm, axis=1), np.nan)
+
+    # Session VWAP; a reclaim is a close back above it after at least one close below
+    vol = np.nan_to_num(v)
+    cum_vol = np.cumsum(vol, axis=1)
+    cum_pv = np.cumsum(np.nan_to_num((h + l + c) / 3.0) * vol, axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vwap = np.where(cum_vol > 0, cum_pv / cum_vol, np.nan)
+    below = c < vwap
+    was_below = np.zeros_like(below)
+    was_below[:, 1:] = np.logical_or.accumulate(below, axis=1)[:, :-1]
+    lost_vwap = below.any(axis=1)
+    reclaimed = ((c > vwap) & was_below).any(axis=1)
+
+    path = (c / open_px[:, None] - 1.0) * 100.0
+    counts = (~np.isnan(path)).sum(axis=0)
+
+    def pct(hits: np.ndarray, base: np.ndarray) -> float:
+        n = int(base.sum())
+        return round(float(hits.sum()) / n * 100.0, 2) if n else 0.0
+
+    def dist(x: np.ndarray) -> Dict[str, Optional[float]]:
+        x = x[np.isfinite(x)]
+        if not x.size:
+            return {"mean": None, "median": None}
+        return {"mean": round(float(x.mean()), 2), "median": round(float(np.median(x)), 2)}
+
+    everyone = np.ones(rows.shape[0], dtype=bool)
+    aggregate = {
+        "events": int(rows.shape[0]),
+        "hodMinute": dist(hod_minute.astype(np.float64)),
+        # Events whose high of day fell in each 30-minute block from the open
+        "hodHistogram30m": np.bincount(hod_minute // 30, minlength=SESSION_MINUTES // 30).tolist(),
+        "fadePercent": dist(fade),
+        "maxFadePercent": dist(max_fade),
+        "redClosePercent": pct(close_px < open_px, everyone),
+        "pmHighBreakPercent": pct(pm_break, pm_known),
+        "pmHighBreakMinute": dist(pm_break_minute),
+        "vwapReclaimPercent": pct(reclaimed, lost_vwap),
+        "avgPathPercent": np.round(np.nansum(path, axis=0) / np.maximum(counts, 1), 2),
+    }
+    events = {
+        "open": open_px,
+        "close": close_px,
+        "high": hod,
+        "hodMinute": hod_minute,
+        "fadePercent": fade,
+        "maxFadePercent": max_fade,
+        "pmHigh": np.where(pm_known, pm_high, np.nan),
+        "pmHighBreakMinute": pm_break_minute,
+        "vwapReclaimed": reclaimed,
+    }
+    return {"aggregate": aggregate, "events": events}
+
+
+@app.get("/gaps/study")
+def gaps_study(
+    symbols: str = Query(..., description="Comma-separated symbols"),
+    months: int = Query(9, ge=6, le=12),
+    gap_threshold: float = Query(24.0, ge=0.0, le=200.0),
+    include_events: bool = Query(True),
+):
+    """Event study over gap days: intraday shape of every gap session, aligned on minutes from the open."""
+    syms = list(dict.fromkeys(_clean_symbol(x) for x in symbols.split(",") if x.strip()))
+    if not syms or len(syms) > 50:
+        raise HTTPException(status_code=400, detail="Pass between 1 and 50 symbols")
+
+    errors: Dict[str, Any] = {}
+
+    def load_daily(sym: str):
+        try:
+            return sym, _fetch_daily_hedged(sym, months)[0]
+        except HTTPException as e:
+            errors[sym] = e.detail
+            return sym, None
+
+    def load_session(event: Tuple[str, str, float]):
+        try:
+            return fetch_session_1m(event[0], event[1]).arrays(_OHLCV)
+        except HTTPException as e:
+            errors[f"{event[0]}:{event[1]}"] = e.detail
+            return None
+
+    workers = max(1, GAP_STUDY_FETCH_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        found: List[Tuple[str, str, float]] = []
+        for sym, df in pool.map(load_daily, syms):
+            if df is None or df.shape[0] < 3:
+                continue
+            gp = gap_percent(df)
+            for idx in df.index[gap_mask(df, gap_threshold).to_numpy()]:
+                found.append((sym, _index_day(idx), float(gp.loc[idx])))
+
+        # Most recent events first when the cap bites
+        found.sort(key=lambda e: e[1], reverse=True)
+        events = found[:GAP_STUDY_MAX_EVENTS]
+        sessions = list(pool.map(load_session, events))
+
+    kept = [(e, s) for e, s in zip(events, sessions) if s is not None and s["time"].size]
+    grid = align_sessions([s for _, s in kept], [e[1] for e, _ in kept])
+    has_bars = ~np.isnan(grid["high"]).all(axis=1)
+    kept = [k for k, ok in zip(kept, has_bars) if ok]
+    grid = {f: m[has_bars] for f, m in grid.items()}
+
+    study = gap_event_study(grid)
+    payload: Dict[str, Any] = {
+        "symbols": syms,
+        "months": months,
+        "gapThresholdPercent": gap_threshold,
+        "gapDays": len(found),
+        "truncated": len(found) > len(events),
+        "sessionMinutes": SESSION_MINUTES,
+        **study["aggregate"],
+        "errors": errors,
+    }
+    if include_events:
+        per = study["events"]
+        payload["eventList"] = [
+            {
+                "symbol": sym,
+                "date": day,
+                "gapPercent": round(gp, 2),
+                **{
+                    k: (bool(a[i]) if a.dtype == bool else int(a[i]) if a.dtype.kind == "i" else _round_or_none(a[i]))
+                    for k, a in per.items()
+                },
+            }
+            for i, ((sym, day, gp), _) in enumerate(kept)
+        ]
+    log_event("gap study computed", lambda: {"symbols": len(syms), "gapDays": len(found), "events": len(kept)})
+    return payload
+
+
+# Session windows in DEFAULT_TZ, as [start, end) minutes of the day
+SESSIONS = {
+    "premarket": (4 * 60, 9 * 60 + 30),
+    "regular": (9 * 60 + 30, 16 * 60),
+    "afterHours": (16 * 60, 20 * 60),
+}
+
+
+def _prior_close(symbol: str, day: str) -> Optional[float]:
+    """Last regular-session close before `day` from the (cached) daily bars, if any provider has it."""
+    try:
+        df, _, _ = _fetch_daily_hedged(symbol, 6)
+    except HTTPException:
+        return None
+    days = np.array([_index_day(i) for i in df.index])
+    before = np.nonzero(days < day)[0]
+    return float(df["Close"].iloc[before[-1]]) if before.size else None
+
+
+def compute_session_stats(bars: Dict[str, np.ndarray], prior_close: Optional[float]) -> Dict[str, Any]:
+    local = pd.to_datetime(bars["time"], unit="s", utc=True).tz_convert(DEFAULT_TZ)
+    minute = np.asarray(local.hour * 60 + local.minute)
+    typical = (bars["high"] + bars["low"] + bars["close"]) / 3.0
+
+    out: Dict[str, Any] = {}
+    for name, (start, end) in SESSIONS.items():
+        mask = (minute >= start) & (minute < end)
+        if not mask.any():
+            out[name] = None
+            continue
+        high, low, vol = bars["high"][mask], bars["low"][mask], bars["volume"][mask]
+        hi = int(np.argmax(high))
+        total_vol = float(vol.sum())
+        open_px = float(bars["open"][mask][0])
+        out[name] = {
+            "open": open_px,
+            "high": float(high[hi]),
+            "low": float(low.min()),
+            "close": float(bars["close"][mask][-1]),
+            "volume": total_vol,
+            "vwap": round(float((typical[mask] * vol).sum() / total_vol), 4) if total_vol > 0 else None,
+            "highTime": int(bars["time"][mask][hi]),
+            "bars": int(mask.sum()),
+            "gapPercent": round((open_px - prior_close) / prior_close * 100.0, 2) if prior_close else None,
+        }
+    return out
+
+
+def fetch_session_stats(symbol: str, day: str) -> Dict[str, Any]:
+    # Canonical YYYY-MM-DD: the live/finished choice below compares strings, and it is the cache key
+    try:
+        day = datetime.strptime(day, "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date. Expected YYYY-MM-DD")
+    # A finished session never changes: keep it with the daily data, today's only as long as its bars
+    today = pd.Timestamp.now(tz=DEFAULT_TZ).strftime("%Y-%m-%d")
+    cache = CACHES["session_stats_live" if day >= today else "session_stats"]
+    cache_key = (symbol, day)
+    stats = cache.get(cache_key, _MISS)
+    if stats is not _MISS:
+        return stats
+    with cache.lock(cache_key):
+        stats = cache.get(cache_key, _MISS)
+        if stats is not _MISS:
+            return stats
+        bars = fetch_session_1m(symbol, day)
+        prior_close = _prior_close(symbol, day)
+        stats = {
+            "symbol": symbol,
+            "date": day,
+            "timezone": DEFAULT_TZ,
+            "priorClose": prior_close,
+            **compute_session_stats(bars.arrays(_OHLCV), prior_close),
+        }
+        cache[cache_key] = stats
+        return stats
+
+
+@app.get("/ticker/session-stats")
+def ticker_session_stats(symbol: str = Query(...), date: str = Query(...)):
+    sym = _clean_symbol(symbol)
+    log_event("ticker_session_stats request", lambda: {"symbol": sym, "date": date})
+    return fetch_session_stats(sym, date)
+
+
+def _ffill_rows(m: np.ndarray) -> np.ndarray:
+    """Forward-fill NaNs along each row (leading NaNs stay NaN)."""
+    idx = np.where(~np.isnan(m), np.arange(m.shape[1])[None, :], 0)
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    return m[np.arange(m.shape[0])[:, None], idx]
+
+
+def _rolling_sum(x: np.ndarray, window: int) -> np.ndarray:
+    c = np.concatenate([np.zeros((x.shape[0], 1)), np.cumsum(x, axis=1)], axis=1)
+    out = np.full(x.shape, np.nan)
+    if x.shape[1] >= window:
+        out[:, window - 1 :] = c[:, window:] - c[:, :-window]
+    return out
+
+
+def rolling_beta_corr(r: np.ndarray, rb: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Rolling beta / correlation of each row of r to the benchmark returns rb, via windowed sums."""
+    valid = ~np.isnan(r) & ~np.isnan(rb)[None, :]
+    x = np.where(valid, rb[None, :], 0.0)
+    y = np.where(valid, r, 0.0)
+    n = _rolling_sum(valid.astype(np.float64), window)
+    sx, sy = _rolling_sum(x, window), _rolling_sum(y, window)
+    sxx, syy, sxy = _rolling_sum(x * x, window), _rolling_sum(y * y, window), _rolling_sum(x * y, window)
+    cov = n * sxy - sx * sy
+    var_x = n * sxx - sx * sx
+    var_y = n * syy - sy * sy
+    enough = n >= max(2, window // 2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        beta = np.where(enough & (var_x > 0), cov / var_x, np.nan)
+        corr = np.where(enough & (var_x > 0) & (var_y > 0), cov / np.sqrt(var_x * var_y), np.nan)
+    return beta, corr
+
+
+@app.get("/ticker/compare")
+def ticker_compare(
+    symbols: str = Query(..., description="Comma-separated symbols"),
+    date: str = Query(...),
+    benchmark: str = Query("SPY"),
+    session: str = Query("regular", pattern="^(regular|all)$"),
+    fill: str = Query("ffill", pattern="^(ffill|none)$"),
+    window: int = Query(30, ge=5, le=390),
+):
+    """Minute-aligned closes for several symbols plus returns, relative strength, beta and correlation."""
+    bench = _clean_symbol(benchmark)
+    syms = [x for x in dict.fromkeys(_clean_symbol(x) for x in symbols.split(",") if x.strip()) if x != bench]
+    if not syms or len(syms) > 20:
+        raise HTTPException(status_code=400, detail="Pass between 1 and 20 symbols")
+
+    payloads, errors = fetch_intraday_1m_many([bench, *syms], date)
+    if bench not in payloads:
+        raise HTTPException(status_code=502, detail=f"No intraday data for benchmark {bench}: {errors.get(bench)}")
+    syms = [sym for sym in syms if sym in payloads]
+    order = [bench, *syms]
+
+    bars = [payloads[sym].arrays(("time", "close")) for sym in order]
+    times = np.unique(np.concatenate([b["time"] for b in bars]))
+    if session == "regular":
+        local = pd.to_datetime(times, unit="s", utc=True).tz_convert(DEFAULT_TZ)
+        minute = np.asarray(local.hour * 60 + local.minute)
+        start, end = SESSIONS["regular"]
+        times = times[(minute >= start) & (minute < end)]
+
+    # No minute at all (session=regular before the open) leaves every series empty, count 0
+    n = times.shape[0]
+    close = np.full((len(order), n), np.nan)
+    for i, b in enumerate(bars if n else []):
+        pos = np.searchsorted(times, b["time"])
+        hit = (pos < n) & (times[np.minimum(pos, n - 1)] == b["time"])
+        close[i, pos[hit]] = b["close"][hit]
+    if fill == "ffill":
+        close = _ffill_rows(close)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        first = close[np.arange(len(order)), np.argmax(~np.isnan(close), axis=1)] if n else np.full(len(order), np.nan)
+        ret_pct = (close / first[:, None] - 1.0) * 100.0
+        minute_ret = np.full(close.shape, np.nan)
+        minute_ret[:, 1:] = close[:, 1:] / close[:, :-1] - 1.0
+    beta, corr = rolling_beta_corr(minute_ret[1:], minute_ret[0], window)
+
+    def rows(m: np.ndarray, names: List[str], digits: int) -> Dict[str, Any]:
+        return {name: np.round(m[i], digits) for i, name in enumerate(names)}
+
+    return {
+        "date": date,
+        "benchmark": bench,
+        "symbols": syms,
+        "session": session,
+        "fill": fill,
+        "window": window,
+        "count": int(times.shape[0]),
+        "times": times.astype(np.int64),
+        "close": rows(close, order, 4),
+        "returnPercent": rows(ret_pct, order, 3),
+        "relativePercent": rows(ret_pct[1:] - ret_pct[0], syms, 3),
+        "beta": rows(beta, syms, 3),
+        "correlation": rows(corr, syms, 3),
+        "errors": errors,
+    }
+
+
+SNAPSHOT_SECTIONS = ["profile", "news", "gaps", "intraday", "sessionStats"]
+
+
+def _snapshot_jobs(
+    sym: str, date: Optional[str], include: List[str], months: int, gap_threshold: float, deadline_ms: Optional[int]
+) -> Dict[str, Any]:
+    jobs = {
+        "profile": lambda: ticker_profile(sym, fields=None, deadline_ms=deadline_ms),
+        "news": lambda: ticker_news(sym),
+        "gaps": lambda: ticker_gaps(sym, months=months, gap_threshold=gap_threshold),
+        "intraday": lambda: fetch_intraday_1m(sym, date).payload(),
+        "sessionStats": lambda: fetch_session_stats(sym, date),
+    }
+    return {name: jobs[name] for name in include}
+
+
+def _run_section(name: str, job) -> Tuple[str, Any]:
+    try:
+        return name, job()
+    except HTTPException as e:
+        return name, {"ok": False, "status": e.status_code, "error": e.detail}
+    except Exception as e:
+        logger.exception("snapshot section failed", extra={"section": name})
+        return name, {"ok": False, "status": 500, "error": f"{name} exception {type(e).__name__}"}
+
+
+@app.get("/ticker/snapshot")
+def ticker_snapshot(
+    symbol: str = Query(...),
+    date: Optional[str] = Query(None),
+    include: Optional[str] = Query(None, description=f"Comma-separated subset of {SNAPSHOT_SECTIONS}"),
+    months: int = Query(9, ge=6, le=12),
+    gap_threshold: float = Query(24.0, ge=0.0, le=200.0),
+    deadline_ms: Optional[int] = Query(None, ge=50, le=60000),
+    stream: bool = Query(False),
+):
+    """Profile, news, gaps and intraday for one ticker in a single round-trip.
+
+    Sections run concurrently and share the upstream caches, so e.g. the Finviz page the
+    profile scrapes also feeds the news. With stream=true every section is written as one
+    NDJSON line ({"section", "data"}) as soon as it finishes.
+    """
+    sym = _clean_symbol(symbol)
+    if include:
+        wanted = [x.strip() for x in include.split(",") if x.strip()]
+        unknown = [x for x in wanted if x not in SNAPSHOT_SECTIONS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown sections {unknown}; expected any of {SNAPSHOT_SECTIONS}")
+    else:
+        wanted = ["profile", "news", "gaps"] + (["intraday"] if date else [])
+    if not date and {"intraday", "sessionStats"} & set(wanted):
+        raise HTTPException(status_code=400, detail="date is required for intraday / sessionStats")
+
+    log_event("ticker_snapshot request", lambda: {"symbol": sym, "sections": wanted, "stream": stream})
+    jobs = _snapshot_jobs(sym, date, wanted, months, gap_threshold, deadline_ms)
+    t0 = time.perf_counter()
+
+    if stream:
+        def lines():
+            with ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="snapshot") as pool:
+                futures = [pool.submit(_run_section, name, job) for name, job in jobs.items()]
+                for fut in as_completed(futures):
+                    name, data = fut.result()
+                    yield dump_json({"section": name, "data": data}) + b"\n"
+            yield dump_json({"section": "done", "ms": round((time.perf_counter() - t0) * 1000, 1)}) + b"\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    with ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="snapshot") as pool:
+        sections = dict(pool.map(lambda item: _run_section(*item), jobs.items()))
+    return {"symbol": sym, "date": date, **sections, "ms": round((time.perf_counter() - t0) * 1000, 1)}
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Admin API disabled (set TICKER_LAB_ADMIN_TOKEN)")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+def _cache_namespaces(namespace: Optional[str]) -> List[ReadThroughCache]:
+    if namespace is None:
+        return list(CACHES.values())
+    if namespace not in CACHES:
+        raise HTTPException(status_code=404, detail=f"Unknown cache namespace {namespace!r}; expected one of {sorted(CACHES)}")
+    return [CACHES[namespace]]
+
+
+class PrewarmRequest(BaseModel):
+    symbols: List[str] = Field(..., min_length=1, max_length=200)
+    sections: List[str] = Field(default_factory=lambda: ["profile", "news", "gaps"])
+    date: Optional[str] = None
+
+
+@app.get("/admin/cache", dependencies=[Depends(require_admin)])
+def admin_cache_stats():
+    return {"backend": CACHE_BACKEND, "namespaces": {name: cache.stats() for name, cache in CACHES.items()}}
+
+
+@app.get("/admin/cache/{namespace}", dependencies=[Depends(require_admin)])
+def admin_cache_entries(namespace: str, symbol: Optional[str] = Query(None), limit: int = Query(200, ge=1, le=5000)):
+    cache = _cache_namespaces(namespace)[0]
+    sym = symbol.strip().upper() if symbol else None
+    entries = [
+        {"key": list(key) if isinstance(key, tuple) else key, "negative": negative}
+        for key, negative in cache.entries()
+        if sym is None or (isinstance(key, tuple) and key and key[0] == sym)
+    ]
+    return {"namespace": namespace, **cache.stats(), "count": len(entries), "entries": entries[:limit]}
+
+
+@app.delete("/admin/cache", dependencies=[Depends(require_admin)])
+def admin_cache_invalidate(namespace: Optional[str] = Query(None), symbol: Optional[str] = Query(None)):
+    """Drop a whole namespace, one symbol across every namespace, or one symbol in one namespace."""
+    if namespace is None and symbol is None:
+        raise HTTPException(status_code=400, detail="Pass namespace and/or symbol")
+    sym = symbol.strip().upper() if symbol else None
+    removed = {cache.namespace: cache.invalidate(sym) for cache in _cache_namespaces(namespace)}
+    logger.info("cache invalidated", extra={"namespace": namespace, "symbol": sym, "removed": sum(removed.values())})
+    return {"namespace": namespace, "symbol": sym, "removed": removed}
+
+
+@app.post("/admin/cache/prewarm", dependencies=[Depends(require_admin)])
+def admin_cache_prewarm(req: PrewarmRequest):
+    """Load the given snapshot sections for each symbol through the normal read-through path."""
+    unknown = [x for x in req.sections if x not in SNAPSHOT_SECTIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown sections {unknown}; expected any of {SNAPSHOT_SECTIONS}")
+    if not req.date and {"intraday", "sessionStats"} & set(req.sections):
+        raise HTTPException(status_code=400, detail="date is required for intraday / sessionStats")
+
+    t0 = time.perf_counter()
+    syms = list(dict.fromkeys(_clean_symbol(x) for x in req.symbols))
+    jobs = [
+        (sym, name, job)
+        for sym in syms
+        for name, job in _snapshot_jobs(sym, req.date, req.sections, 9, 24.0, None).items()
+    ]
+    results: Dict[str, Dict[str, Any]] = {sym: {} for sym in syms}
+    with ThreadPoolExecutor(max_workers=min(8, len(jobs)), thread_name_prefix="prewarm") as pool:
+        for (sym, _, _), (name, data) in zip(jobs, pool.map(lambda j: _run_section(j[1], j[2]), jobs)):
+            results[sym][name] = not (isinstance(data, dict) and data.get("ok") is False)
+    return {"symbols": results, "ms": round((time.perf_counter() - t0) * 1000, 1)}
+
+
+@app.get("/admin/logging", dependencies=[Depends(require_admin)])
+def admin_logging():
+    return {
+        "level": logging.getLevelName(logger.level),
+        "format": LOG_FORMAT,
+        "sampleRates": LOG_SAMPLER.rates,
+        "sampledOut": LOG_SAMPLER.dropped,
+        "queued": LOG_HANDLER.queue.qsize(),
+        "queueSize": LOG_QUEUE_SIZE,
+        "droppedQueueFull": LOG_HANDLER.dropped,
+    }
+
+
+@app.get("/admin/profiles", dependencies=[Depends(require_admin)])
+def admin_profiles():
+    return {"profiles": [{k: v for k, v in rec.items() if k != "folded"} for rec in reversed(PROFILES.values())]}
+
+
+@app.get("/admin/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+def admin_profile_stacks(profile_id: str):
+    record = PROFILES.get(profile_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired profile id")
+    return Response(record["folded"], media_type="text/plain; charset=utf-8")
+
+
+@app.post("/admin/profile", dependencies=[Depends(require_admin)])
+async def admin_profile_window(
+    seconds: float = Query(10.0, gt=0),
+    interval_ms: float = Query(PROFILE_INTERVAL_MS, ge=1.0, le=1000.0),
+):
+    """Sample every busy thread for `seconds` and return the folded stacks (also kept under X-Profile-Id)."""
+    if seconds > PROFILE_MAX_S:
+        raise HTTPException(status_code=400, detail=f"seconds must be <= {PROFILE_MAX_S:g}")
+    if not _PROFILE_ACTIVE.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="Another profile is being captured")
+    profiler = SamplingProfiler(interval_ms).start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.stop()
+        _PROFILE_ACTIVE.release()
+    record = _store_profile(profiler, f"window {seconds:g}s")
+    return Response(record["folded"], media_type="text/plain; charset=utf-8", headers={"X-Profile-Id": record["id"]})
+
+
+@app.get("/admin/panel", dependencies=[Depends(require_admin)])
+def admin_panel():
+    if DAILY_PANEL is None:
+        return {"enabled": False}
+    return {**DAILY_PANEL.status(), "lastRun": PANEL_LAST_RUN}
+
+
+@app.post("/admin/panel/update", dependencies=[Depends(require_admin)])
+def admin_panel_update():
+    """Wake the ingest thread now instead of at the next check."""
+    if DAILY_PANEL is None:
+        raise HTTPException(status_code=404, detail="Daily panel disabled (set TICKER_LAB_PANEL_DIR)")
+    _PANEL_WAKE.set()
+    return {"ok": True, "lastDay": DAILY_PANEL.last_day()}
+
+
+def load_universe(path: str) -> List[str]:
+    """Symbols from a watchlist file: the first field of each line (CSV or whitespace), `#` comments allowed."""
+    symbols: List[str] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            field = re.split(r"[,\s]+", line.split("#", 1)[0].strip())[0]
+            if field and field.lower() not in ("symbol", "ticker"):
+                symbols.append(field.upper())
+    return list(dict.fromkeys(symbols))
+
+
+WARMUP_REPORT: Dict[str, Any] = {}
+_WARMUP_STOP = threading.Event()
+_WARMUP_WAKE = threading.Event()
+
+
+def _warm_error(name: str, data: Any) -> Optional[Any]:
+    """Why a section didn't warm, judged by that section's own success signal; None if it did."""
+    if not isinstance(data, dict):
+        return None
+    if data.get("ok") is False and "status" in data:
+        return data.get("error")  # the section raised (see _run_section)
+    if name == "profile":
+        # No top-level ok: the profile warmed if any of its sources answered
+        if any(data.get("sources", {}).values()):
+            return None
+        return {src: err for src, err in data.get("errors", {}).items() if err} or "no profile source answered"
+    if name == "news":
+        return None  # ok is false for a symbol without recent news, which is nothing to retry
+    return data.get("error") if data.get("ok") is False else None
+
+
+def _warm_symbol(sym: str, sections: List[str]) -> List[Dict[str, Any]]:
+    _RATE_WAIT_S.set(WARMUP_RATE_WAIT_S)
+    failures = []
+    for name, job in _snapshot_jobs(sym, None, sections, 9, 24.0, None).items():
+        _, data = _run_section(name, job)
+        error = _warm_error(name, data)
+        if error is not None:
+            failures.append({"symbol": sym, "section": name, "status": data.get("status"), "error": error})
+    return failures
+
+
+def _warm_intraday(symbols: List[str], day: str, refresh: bool) -> Dict[str, Any]:
+    """Today's 1m bars (premarket included) in batched downloads; returns errors by symbol."""
+    _RATE_WAIT_S.set(WARMUP_RATE_WAIT_S)
+    errors: Dict[str, Any] = {}
+    for i in range(0, len(symbols), max(1, WARMUP_BATCH)):
+        try:
+            errors.update(fetch_intraday_1m_many(symbols[i : i + WARMUP_BATCH], day, refresh=refresh)[1])
+        except HTTPException as e:
+            errors.update({sym: e.detail for sym in symbols[i : i + WARMUP_BATCH]})
+    return errors
+
+
+def _universe_symbols(failures: List[Dict[str, Any]]) -> List[str]:
+    """The universe file re-read (edits apply on the next run), minus symbols _clean_symbol rejects."""
+    symbols: List[str] = []
+    for raw in load_universe(WARMUP_UNIVERSE_PATH):
+        try:
+            symbols.append(_clean_symbol(raw))
+        except HTTPException as e:
+            failures.append({"symbol": raw, "section": "universe", "status": e.status_code, "error": e.detail})
+    return symbols
+
+
+def run_warmup() -> Dict[str, Any]:
+    """Warm every universe symbol's sections; the report lists coverage per section and each failure."""
+    t0 = time.perf_counter()
+    report: Dict[str, Any] = {"startedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"), "running": True}
+    WARMUP_REPORT.clear()
+    WARMUP_REPORT.update(report)
+    failures: List[Dict[str, Any]] = []
+    symbols = _universe_symbols(failures)
+
+    per_symbol = [x for x in WARMUP_SECTIONS if x in ("profile", "news", "gaps")]
+    with ThreadPoolExecutor(max_workers=max(1, WARMUP_WORKERS), thread_name_prefix="warmup") as pool:
+        for found in pool.map(lambda sym: _warm_symbol(sym, per_symbol), symbols):
+            failures.extend(found)
+    if "intraday" in WARMUP_SECTIONS:
+        today = pd.Timestamp.now(tz=DEFAULT_TZ).strftime("%Y-%m-%d")
+        for sym, err in _warm_intraday(symbols, today, refresh=False).items():
+            failures.append({"symbol": sym, "section": "intraday", "status": None, "error": err})
+
+    sections = per_symbol + (["intraday"] if "intraday" in WARMUP_SECTIONS else [])
+    failed = {name: sum(1 for f in failures if f["section"] == name) for name in sections}
+    report.update(
+        running=False,
+        finishedAt=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        ms=round((time.perf_counter() - t0) * 1000, 1),
+        universe=len(symbols),
+        coverage={
+            name: {
+                "ok": len(symbols) - failed[name],
+                "failed": failed[name],
+                "percent": round((len(symbols) - failed[name]) / len(symbols) * 100, 1) if symbols else None,
+            }
+            for name in sections
+        },
+        failures=failures[:200],
+        failuresTotal=len(failures),
+        intradayRefreshes=0,
+    )
+    WARMUP_REPORT.clear()
+    WARMUP_REPORT.update(report)
+    logger.info("warmup finished", extra={k: report[k] for k in ("universe", "ms", "failuresTotal")})
+    return report
+
+
+def _next_warmup(now: Any) -> Any:
+    """Next WARMUP_AT time on a weekday, as a DEFAULT_TZ timestamp."""
+    day = now.normalize()
+    for offset in range(8):
+        d = day + pd.Timedelta(days=offset)
+        if d.weekday() >= 5:
+            continue
+        for at in sorted(WARMUP_AT):
+            hh, mm = (int(x) for x in at.split(":"))
+            ts = d.replace(hour=hh, minute=mm)
+            if ts > now:
+                return ts
+    return day + pd.Timedelta(days=1)
+
+
+def _warmup_loop() -> None:
+    while not _WARMUP_STOP.is_set():
+        now = pd.Timestamp.now(tz=DEFAULT_TZ)
+        woken = _WARMUP_WAKE.wait(timeout=max(1.0, (_next_warmup(now) - now).total_seconds()))
+        _WARMUP_WAKE.clear()
+        if _WARMUP_STOP.is_set():
+            return
+        # With the shared sqlite cache one worker warms for all of them; memory caches are per worker
+        lock = os.path.join(os.path.dirname(CACHE_PATH), "ticker-lab-warmup.lock")
+        with _try_flock(lock) if CACHE_BACKEND == "sqlite" else nullcontext(True) as leader:
+            if not leader:
+                continue
+            try:
+                run_warmup()
+            except Exception as e:
+                WARMUP_REPORT.update(running=False, error=f"{type(e).__name__}: {e}")
+                logger.exception("warmup failed")
+                continue
+            if "intraday" not in WARMUP_SECTIONS or woken:
+                continue
+            # Keep the short-TTL intraday entries fresh until the open has been served
+            symbols = _universe_symbols([])
+            today = pd.Timestamp.now(tz=DEFAULT_TZ).strftime("%Y-%m-%d")
+            while not _WARMUP_STOP.wait(WARMUP_INTRADAY_EVERY_S):
+                if pd.Timestamp.now(tz=DEFAULT_TZ).strftime("%H:%M") >= WARMUP_UNTIL:
+                    break
+                try:
+                    WARMUP_REPORT["intradayErrors"] = _warm_intraday(symbols, today, refresh=True)
+                    WARMUP_REPORT["intradayRefreshes"] = WARMUP_REPORT.get("intradayRefreshes", 0) + 1
+                except Exception:
+                    logger.exception("warmup intraday refresh failed")
+
+
+@app.on_event("startup")
+def _start_warmup_scheduler():
+    if not WARMUP_UNIVERSE_PATH:
+        return
+    threading.Thread(target=_warmup_loop, name="warmup", daemon=True).start()
+
+
+@app.on_event("shutdown")
+def _stop_warmup_scheduler():
+    _WARMUP_STOP.set()
+    _WARMUP_WAKE.set()
+
+
+@app.get("/admin/warmup", dependencies=[Depends(require_admin)])
+def admin_warmup():
+    if not WARMUP_UNIVERSE_PATH:
+        return {"enabled": False}
+    now = pd.Timestamp.now(tz=DEFAULT_TZ)
+    return {
+        "enabled": True,
+        "universe": WARMUP_UNIVERSE_PATH,
+        "at": WARMUP_AT,
+        "timezone": DEFAULT_TZ,
+        "sections": WARMUP_SECTIONS,
+        "nextRun": _next_warmup(now).isoformat(),
+        "lastRun": WARMUP_REPORT,
+    }
+
+
+@app.post("/admin/warmup/run", dependencies=[Depends(require_admin)])
+def admin_warmup_run():
+    """Start a warmup now (without the intraday refresh loop that follows scheduled runs)."""
+    if not WARMUP_UNIVERSE_PATH:
+        raise HTTPException(status_code=404, detail="Warmup disabled (set TICKER_LAB_WARMUP_UNIVERSE)")
+    if WARMUP_REPORT.get("running"):
+        raise HTTPException(status_code=409, detail="A warmup is already running")
+    _WARMUP_WAKE.set()
+    return {"ok": True}
+
+STARTUP_REPORT["moduleImportMs"] = round((time.perf_counter() - _IMPORT_T0) * 1000, 1)
@@ -0,0 +1,170 @@
+"""CPU-bound HTML extraction for the scrapers in main.py.
+
+Every function takes the raw response bytes (plus the charset httpx detected)
+and returns a small picklable result, so main._run_parser can run it in a
+worker process without holding the request threads' GIL. Keep this module
+free of app imports: pool workers import it on their own.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+_HUMAN_NUMBER_RE = re.compile(r"(-?[0-9]*\.?[0-9]+)\s*([KMBT])?", re.IGNORECASE)
+_SHORT_FLOAT_RE = re.compile(r"Short Float\s*([0-9.]+)%", re.IGNORECASE)
+_KTF_FLOAT_RE = re.compile(r"Float\s*:\s*([0-9,.]+)\s*(K|M|B)?", re.IGNORECASE)
+
+GOOGLE_EBITDA_PATTERNS = [
+    re.compile(p, re.IGNORECASE | re.DOTALL)
+    for p in [
+        r"EBITDA[^<]*?<[^>]*>([0-9.,]+\s*[KMBT]?)\s*(USD)?",
+        r">EBITDA<[^>]*>\s*(?:<[^>]*>)*\s*([0-9.,]+\s*[KMBT]?)",
+        r"EBITDA\s*</[^>]+>\s*<[^>]+>\s*([0-9.,]+\s*[KMBT]?)",
+        r"EBITDA\s*([0-9.,]+\s*[KMBT]?)",
+        r"data-[^>]*EBITDA[^>]*>([0-9.,]+\s*[KMBT]?)<",
+    ]
+]
+
+DILUTION_PATTERNS = [
+    re.compile(p, re.IGNORECASE)
+    for p in [
+        r"(ATM\s+offering[^.]{5,120}\.)",
+        r"(shelf\s+registration[^.]{5,120}\.)",
+        r"(shares\s+outstanding[:\s]+[0-9,.]+[KMBT]?)",
+        r"(authorized\s+shares[:\s]+[0-9,.]+[KMBT]?)",
+        r"(dilution\s+risk[^.]{5,80}\.)",
+        r"(S-3\s+filing[^.]{5,80}\.)",
+    ]
+]
+
+
+def _decode(content: bytes, encoding: Optional[str]) -> str:
+    return content.decode(encoding or "utf-8", errors="replace")
+
+
+def _soup(content: bytes, encoding: Optional[str]):
+    # bs4 is imported on first parse so importing this module stays cheap
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(_decode(content, encoding), "html.parser")
+
+
+def parse_human_number(text: str) -> Optional[float]:
+    if not text:
+        return None
+    s = text.strip().replace(",", "")
+    m = _HUMAN_NUMBER_RE.fullmatch(s)
+    if not m:
+        return None
+    try:
+        num = float(m.group(1))
+    except Exception:
+        return None
+    mult = {"K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}.get((m.group(2) or "").upper(), 1.0)
+    return num * mult
+
+
+def parse_finviz_page(content: bytes, encoding: Optional[str] = None) -> Dict[str, Any]:
+    """Extract the snapshot table, header links and news rows from a Finviz quote page."""
+    soup = _soup(content, encoding)
+
+    # --- Snapshot table (financial metrics) ---
+    snapshot: Dict[str, str] = {}
+    for table in soup.find_all("table", class_="snapshot-table2"):
+        cells = table.find_all("td")
+        for i in range(0, len(cells) - 1, 2):
+            label = cells[i].get_text(strip=True)
+            value = cells[i + 1].get_text(strip=True)
+            if label:
+                snapshot[label] = value
+
+    # --- Header links (Sector | Industry | Country | Exchange) ---
+    links: Dict[str, str] = {}
+    for a in soup.find_all("a", class_="tab-link"):
+        href = a.get("href", "")
+        text = a.get_text(strip=True)
+        if not text or text == "-":
+            continue
+        if "f=sec_" in href:
+            links["sector"] = text
+        elif "f=ind_" in href:
+            links["industry"] = text
+        elif "f=geo_" in href:
+            links["country"] = text
+        elif "f=exch_" in href:
+            links["exchange"] = text
+
+    # --- News table rows: [date cell, title, href, source] ---
+    news: List[List[str]] = []
+    news_table = soup.find("table", id="news-table")
+    if news_table:
+        for row in news_table.find_all("tr"):
+            cells = row.find_all("td")
+            if len(cells) < 2:
+                continue
+            link_el = cells[1].find("a")
+            if not link_el:
+                continue
+            source_span = cells[1].find("span")
+            news.append(
+                [
+                    cells[0].get_text(strip=True),
+                    link_el.get_text(strip=True),
+                    link_el.get("href", ""),
+                    source_span.get_text(strip=True).strip("()") if source_span else "Finviz",
+                ]
+            )
+
+    # Full-text fallback for short float, only when the snapshot lacks it
+    text_short_float: Optional[float] = None
+    sf = snapshot.get("Short Float / Ratio", "") or snapshot.get("Short Float", "")
+    if not re.match(r"[0-9.]+%", sf):
+        m = _SHORT_FLOAT_RE.search(soup.get_text(" "))
+        if m:
+            try:
+                text_short_float = float(m.group(1))
+            except Exception:
+                pass
+
+    return {"snapshot": snapshot, "links": links, "news": news, "textShortFloat": text_short_float}
+
+
+def parse_knowthefloat_page(content: bytes, encoding: Optional[str] = None) -> Optional[float]:
+    text = _soup(content, encoding).get_text(" ")
+    m = _KTF_FLOAT_RE.search(text)
+    if not m:
+        return None
+    num = float(m.group(1).replace(",", ""))
+    mult = {"K": 1e3, "M": 1e6, "B": 1e9}.get((m.group(2) or "").upper(), 1.0)
+    return num * mult
+
+
+def parse_dilutiontracker_page(content: bytes, encoding: Optional[str] = None) -> List[str]:
+    """Return up to three dilution-related snippets found in the page text."""
+    text = _soup(content, encoding).get_text(" ", strip=True)
+    snippets: List[str] = []
+    for pattern in DILUTION_PATTERNS:
+        for match in pattern.findall(text)[:2]:
+            cleaned = match.strip()
+            if len(cleaned) > 15 and cleaned not in snippets:
+                snippets.append(cleaned)
+    return snippets[:3]
+
+
+def scan_google_finance_ebitda(content: bytes, encoding: Optional[str] = None) -> Optional[float]:
+    html = _decode(content, encoding)
+    for pattern in GOOGLE_EBITDA_PATTERNS:
+        m = pattern.search(html)
+        if m:
+            ebitda = parse_human_number(m.group(1).replace(" ", "").strip())
+            if ebitda is not None:
+                return ebitda
+    return None
+
+
+# What each extractor returns for a page with nothing on it; callers get this when a parse is abandoned
+EMPTY_RESULTS = {
+    "parse_finviz_page": lambda: {"snapshot": {}, "links": {}, "news": [], "textShortFloat": None},
+    "parse_knowthefloat_page": lambda: None,
+    "parse_dilutiontracker_page": lambda: [],
+    "scan_google_finance_ebitda": lambda: None,
+}
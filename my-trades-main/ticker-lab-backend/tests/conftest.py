@@ -0,0 +1,31 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Keep background jobs off and logs plain before main is imported
+os.environ.setdefault("TICKER_LAB_PREWARM", "0")
+os.environ.setdefault("TICKER_LAB_NEWS_INGEST", "0")
+os.environ.setdefault("TICKER_LAB_LOG_FORMAT", "text")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+
+def session_bars(symbol: str, day: str, minutes, opens, highs, lows, closes, volumes=None) -> "main.IntradayBars":
+    """IntradayBars from bars given as minutes after 09:30 TICKER_LAB_TZ (negative = premarket)."""
+    open_ts = pd.Timestamp(f"{day} 09:30", tz=main.DEFAULT_TZ).timestamp()
+    times = open_ts + 60.0 * np.asarray(minutes, dtype=np.float64)
+    volumes = volumes if volumes is not None else [100.0] * len(times)
+    return main.IntradayBars(symbol, day, np.array([times, opens, highs, lows, closes, volumes], dtype=np.float64))
+
+
+@pytest.fixture
+def clean_caches():
+    for cache in main.CACHES.values():
+        cache.clear()
+    yield main.CACHES
+    for cache in main.CACHES.values():
+        cache.clear()
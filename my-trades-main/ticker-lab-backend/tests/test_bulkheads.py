@@ -0,0 +1,69 @@
+import threading
+import time
+
+import pytest
+
+import main
+
+
+def test_bulkhead_rejects_when_pool_and_queue_are_full():
+    pool = main.Bulkhead("test", limit=1, queue=1, wait_s=0.2)
+    release = threading.Event()
+    outcome = []
+
+    def hold():
+        with pool.slot():
+            release.wait(1)
+
+    def queued():
+        try:
+            with pool.slot():
+                outcome.append("ran")
+        except main.BulkheadFull:
+            outcome.append("rejected")
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    time.sleep(0.02)
+    waiter = threading.Thread(target=queued)
+    waiter.start()
+    time.sleep(0.02)
+    with pytest.raises(main.BulkheadFull):
+        with pool.slot():
+            pass
+    waiter.join()
+    release.set()
+    holder.join()
+
+    assert outcome == ["rejected"]  # queued past wait_s
+    assert pool.rejected == 2 and pool.active == 0 and pool.waiting == 0
+    with pool.slot():
+        assert pool.active == 1
+
+
+def test_token_bucket_reserves_and_refuses():
+    bucket = main.TokenBucket(rate=10.0, burst=2.0)
+    assert bucket.reserve(1, max_wait=0) == 0.0
+    assert bucket.reserve(1, max_wait=0) == 0.0
+    assert bucket.reserve(1, max_wait=0.01) is None  # nothing taken
+    wait = bucket.reserve(1, max_wait=1)
+    assert 0 < wait <= 0.1 and bucket.throttled == 1
+
+    pool = main.Bulkhead("rated", limit=4, queue=0, wait_s=0, bucket=main.TokenBucket(rate=0.01, burst=1.0))
+    with pool.slot():
+        pass
+    with pytest.raises(main.BulkheadFull, match="rate limited"):
+        with pool.slot():
+            pass
+
+
+def test_pool_rejection_refunds_rate_tokens():
+    pool = main.Bulkhead("rated", limit=1, queue=0, wait_s=0, bucket=main.TokenBucket(rate=0.01, burst=2.0))
+    with pool.slot():
+        with pytest.raises(main.BulkheadFull, match="bulkhead full"):
+            with pool.slot():
+                pass
+        assert pool.bucket.tokens == pytest.approx(1.0, abs=1e-3)  # only the call that went out paid
+    with pool.slot():
+        pass
+    assert pool.rejected == 1
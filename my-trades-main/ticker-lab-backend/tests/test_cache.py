@@ -0,0 +1,66 @@
+import threading
+import time
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def namespace(monkeypatch):
+    cache = main.ReadThroughCache("test_ns", ttl=60, negative_ttl=0.2, maxsize=16)
+    monkeypatch.setitem(main.CACHES, "test_ns", cache)
+    return cache
+
+
+def test_read_through_is_single_flight(namespace):
+    calls = []
+    started = threading.Event()
+
+    @main.read_through("test_ns", lambda symbol: (symbol,))
+    def fetch(symbol):
+        calls.append(symbol)
+        started.set()
+        time.sleep(0.1)
+        return {"symbol": symbol}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(fetch("TSLA"))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls == ["TSLA"]
+    assert results == [{"symbol": "TSLA"}] * 5
+    assert namespace.misses == 1 and namespace.hits == 4
+
+
+def test_negative_results_expire_and_uncached_is_not_stored(namespace):
+    answers = [None, {"ok": True}]
+
+    @main.read_through("test_ns", lambda symbol: (symbol,))
+    def fetch(symbol):
+        return answers.pop(0)
+
+    assert fetch("AAA") is None
+    assert namespace.entries() == [(("AAA",), True)]
+    assert fetch("AAA") is None  # still within the negative TTL
+    time.sleep(0.25)
+    assert fetch("AAA") == {"ok": True}
+    assert namespace.entries() == [(("AAA",), False)]
+
+    @main.read_through("test_ns", lambda symbol: (symbol,))
+    def busy(symbol):
+        raise main.Uncached({"ok": False, "error": "busy"})
+
+    assert busy("BBB") == {"ok": False, "error": "busy"}
+    assert ("BBB",) not in namespace
+
+
+def test_invalidate_drops_one_symbol(namespace):
+    namespace[("AAA", "2026-02-03")] = {"x": 1}
+    namespace[("AAA", "2026-02-04")] = []
+    namespace[("BBB", "2026-02-03")] = {"x": 2}
+    assert namespace.invalidate("AAA") == 2
+    assert [key for key, _ in namespace.entries()] == [("BBB", "2026-02-03")]
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from conftest import session_bars
+
+DAY = "2026-02-03"
+
+
+def _cache(symbol, minutes, closes):
+    main.CACHES["intraday_1m"][(symbol, DAY)] = session_bars(symbol, DAY, minutes, closes, closes, closes, closes)
+
+
+def _compare(**params):
+    return TestClient(main.app).get("/ticker/compare", params={"symbols": "AAA", "date": DAY, **params})
+
+
+def test_compare_aligns_on_the_union_of_minutes(clean_caches):
+    _cache("SPY", [-5, 0, 1, 2], [99.0, 100.0, 101.0, 102.0])
+    _cache("AAA", [0, 2], [10.0, 11.0])
+
+    body = _compare().json()
+    assert body["count"] == 3  # the premarket minute is outside session=regular
+    assert body["close"]["AAA"] == [10.0, 10.0, 11.0]
+    assert body["returnPercent"]["AAA"][-1] == 10.0
+    assert body["relativePercent"]["AAA"][-1] == 8.0
+
+    body = _compare(session="all", fill="none").json()
+    assert body["count"] == 4
+    assert body["close"]["AAA"] == [None, 10.0, None, 11.0]
+
+
+def test_compare_before_the_open_returns_empty_series(clean_caches):
+    _cache("SPY", [-60, -30], [99.0, 100.0])
+    _cache("AAA", [-45], [10.0])
+
+    resp = _compare()
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["count"] == 0 and body["times"] == []
+    assert body["close"] == {"SPY": [], "AAA": []}
+    assert body["beta"] == {"AAA": []} and body["relativePercent"] == {"AAA": []}
+
+
+def test_refresh_refetches_a_single_missing_symbol(monkeypatch, clean_caches):
+    cached = session_bars("AAA", DAY, [0], [1.0], [1.0], [1.0], [1.0])
+    fresh = session_bars("AAA", DAY, [0, 1], [2.0, 2.0], [2.0, 2.0], [2.0, 2.0], [2.0, 2.0])
+    clean_caches["intraday_1m"][("AAA", DAY)] = cached
+    monkeypatch.setattr(main, "fetch_session_1m", lambda symbol, day: main.CACHES["intraday_1m"].get((symbol, day), fresh))
+
+    payloads, errors = main.fetch_intraday_1m_many(["AAA"], DAY)
+    assert payloads["AAA"] is cached
+    payloads, errors = main.fetch_intraday_1m_many(["AAA"], DAY, refresh=True)
+    assert payloads["AAA"] is fresh and not errors
+    assert np.array_equal(payloads["AAA"].values, fresh.values)
+
+
+def test_ffill_rows_keeps_leading_nans():
+    m = np.array([[np.nan, 1.0, np.nan, 3.0, np.nan], [2.0, np.nan, np.nan, np.nan, 5.0]])
+    out = main._ffill_rows(m)
+    assert np.isnan(out[0, 0])
+    assert out[0, 1:].tolist() == [1.0, 1.0, 3.0, 3.0]
+    assert out[1].tolist() == [2.0, 2.0, 2.0, 2.0, 5.0]
+
+
+def test_rolling_beta_corr_matches_polyfit():
+    rng = np.random.default_rng(7)
+    rb = rng.normal(size=60)
+    r = np.vstack([2.0 * rb, -0.5 * rb + rng.normal(scale=0.1, size=60)])
+    r[1, 10] = np.nan
+    beta, corr = main.rolling_beta_corr(r, rb, window=20)
+
+    assert np.isnan(beta[:, :9]).all()  # fewer than window // 2 points so far
+    assert beta[0, -1] == pytest.approx(2.0) and corr[0, -1] == pytest.approx(1.0)
+    x, y = rb[-20:], r[1, -20:]
+    assert beta[1, -1] == pytest.approx(np.polyfit(x, y, 1)[0])
+    assert corr[1, -1] == pytest.approx(np.corrcoef(x, y)[0, 1])
@@ -0,0 +1,26 @@
+import gzip
+
+import pytest
+
+import main
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip", "gzip"),
+        ("gzip;q=0.5, br;q=0.9", "br" if main.brotli is not None else "gzip"),
+        ("br;q=0, gzip;q=0", None),
+        ("*", "br" if main.brotli is not None else "gzip"),
+        ("identity", None),
+    ],
+)
+def test_negotiate_encoding(header, expected):
+    assert main._negotiate_encoding(header) == expected
+
+
+def test_compress_round_trips():
+    body = b'{"candles": []}' * 100
+    assert gzip.decompress(main._compress(body, "gzip")) == body
+    if main.brotli is not None:
+        assert main.brotli.decompress(main._compress(body, "br")) == body
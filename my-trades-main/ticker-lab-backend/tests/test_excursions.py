@@ -0,0 +1,32 @@
+import numpy as np
+
+import main
+
+
+def test_excursions_long_short_and_invalid():
+    bars = {
+        "time": np.array([0.0, 60.0, 120.0, 180.0]),
+        "high": np.array([10.0, 12.0, 11.0, 13.0]),
+        "low": np.array([9.0, 9.5, 8.0, 10.0]),
+        "close": np.array([10.0, 11.0, 9.0, 12.0]),
+    }
+    out = main.compute_excursions(
+        bars,
+        entry_t=np.array([0.0, 60.0, -10.0]),
+        entry_px=np.array([10.0, 11.0, 10.0]),
+        exit_t=np.array([120.0, np.nan, 60.0]),
+        exit_px=np.array([9.0, np.nan, 10.0]),
+        direction=np.array([1, -1, 1]),
+        post_exit_s=60.0,
+    )
+    assert out["valid"].tolist() == [True, True, False]
+    # long: best high 12 at t=60, worst low 8 at t=120, close 12 one minute after the exit at 9
+    assert out["mfe"][0] == 2.0 and out["mfeTime"][0] == 60.0 and out["timeToMfe"][0] == 60.0
+    assert out["mae"][0] == 2.0 and out["maeTime"][0] == 120.0
+    assert out["postExitMove"][0] == 3.0
+    assert out["bars"][0] == 3
+    # open short: measured to the last bar, no post-exit move
+    assert out["mfe"][1] == 3.0 and out["mfeTime"][1] == 120.0
+    assert out["mae"][1] == 2.0 and out["maeTime"][1] == 180.0
+    assert np.isnan(out["postExitMove"][1])
+    assert out["bars"][1] == 3
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import main
+from conftest import session_bars
+
+DAY = "2026-02-03"
+
+
+def test_gap_event_study_aggregates():
+    fader = session_bars(
+        "AAA", DAY, [-30, 0, 1, 2], [5, 10, 12, 9], [6, 12, 12.5, 9.5], [5, 9, 8.5, 7], [5.5, 11, 9, 8]
+    )
+    runner = session_bars("BBB", "2026-02-04", [0, 1, 2], [20, 21, 22], [21, 22, 25], [19, 20, 21], [21, 22, 24])
+    grid = main.align_sessions([fader.arrays(main._OHLCV), runner.arrays(main._OHLCV)], [DAY, "2026-02-04"])
+
+    assert grid["close"].shape == (2, main.SESSION_MINUTES)
+    assert np.isnan(grid["close"][0, 3])
+    assert grid["pmHigh"].tolist() == [6.0, -np.inf]
+
+    study = main.gap_event_study(grid)
+    events, aggregate = study["events"], study["aggregate"]
+    assert events["open"].tolist() == [10.0, 20.0]
+    assert events["close"].tolist() == [8.0, 24.0]
+    assert events["hodMinute"].tolist() == [1, 2]
+    assert events["fadePercent"][0] == pytest.approx(20.0)
+    assert events["pmHighBreakMinute"][0] == 0.0 and np.isnan(events["pmHigh"][1])
+    assert aggregate["events"] == 2
+    assert aggregate["redClosePercent"] == 50.0
+    assert aggregate["pmHighBreakPercent"] == 100.0  # only the event with premarket trading counts
+    assert aggregate["hodHistogram30m"][0] == 2
+
+
+def test_gap_stats_counts_red_gap_days():
+    df = pd.DataFrame(
+        {"Open": [10.0, 13.0, 12.0, 16.0], "Close": [10.0, 12.0, 12.5, 17.0]},
+        index=pd.date_range("2026-01-05", periods=4),
+    )
+    stats = main.compute_gap_stats(df, gap_threshold=24.0)
+    assert stats["gapsCount"] == 2
+    assert stats["redAfterGapCount"] == 1
+    assert stats["redAfterGapPercent"] == 50.0
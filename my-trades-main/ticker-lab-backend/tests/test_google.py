@@ -0,0 +1,43 @@
+import asyncio
+import types
+
+import main
+
+
+class FakeClient:
+    """httpx.AsyncClient stand-in: every quote page is a slow 404; tracks google pool usage."""
+
+    peak = 0
+    urls = []
+
+    def __init__(self, **kwargs):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def get(self, url):
+        FakeClient.urls.append(url)
+        FakeClient.peak = max(FakeClient.peak, main.UPSTREAM_BULKHEADS["google"].active)
+        await asyncio.sleep(0.05)
+        return types.SimpleNamespace(status_code=404)
+
+
+def test_race_hedges_into_spare_google_capacity_only(monkeypatch):
+    pool = main.Bulkhead("google", limit=3, queue=0, wait_s=0)
+    monkeypatch.setitem(main.UPSTREAM_BULKHEADS, "google", pool)
+    monkeypatch.setattr(main, "httpx", types.SimpleNamespace(AsyncClient=FakeClient))
+    monkeypatch.setattr(main, "GOOGLE_HEDGE_DELAY_S", 0.005)
+    FakeClient.peak, FakeClient.urls = 0, []
+    candidates = [f"AAA:{ex}" for ex in ("NASDAQ", "NYSE", "NYSEAMERICAN", "BATS")]
+
+    with pool.slot():
+        assert main._run_coroutine(main._race_google_candidates(candidates)) == (None, None)
+        assert pool.active == 1  # every hedge slot was handed back
+
+    assert len(FakeClient.urls) == 4
+    assert FakeClient.peak == 2  # the caller's slot plus one hedge; the last slot stays free
+    assert pool.rejected == 0
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from conftest import session_bars
+
+
+def test_intraday_bars_views_and_payload():
+    bars = session_bars("AAA", "2026-02-03", [0, 1], [1.0, 2.0], [1.5, 2.5], [0.5, 1.5], [1.2, 2.2], [10.0, 20.0])
+    rows = bars.arrays(("time", "close"))
+    assert rows["close"].tolist() == [1.2, 2.2]
+    assert np.shares_memory(rows["close"], bars.values)
+    with pytest.raises(ValueError):
+        rows["close"][0] = 0.0
+
+    payload = bars.payload()
+    assert payload["count"] == 2 and payload["symbol"] == "AAA"
+    assert payload["candles"][1] == {
+        "time": int(bars.values[0, 1]),
+        "open": 2.0,
+        "high": 2.5,
+        "low": 1.5,
+        "close": 2.2,
+        "volume": 20.0,
+    }
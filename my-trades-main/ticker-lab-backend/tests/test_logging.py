@@ -0,0 +1,33 @@
+import atexit
+import logging
+
+import main
+
+
+def test_logging_leaves_the_root_logger_alone():
+    assert main.LOG_HANDLER in main.logger.handlers and main.logger.propagate is False
+    assert main.LOG_HANDLER not in logging.getLogger().handlers
+
+
+def test_setup_adds_no_root_handler(monkeypatch):
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "handlers", [])
+    handler, listener = main._setup_logging()
+    try:
+        assert root.handlers == []
+    finally:
+        atexit.unregister(listener.stop)
+        listener.stop()
+        main.logger.removeHandler(handler)
+
+
+def test_sampler_keeps_warnings_and_tags_sampled_records():
+    sampler = main.LogSampler({"/hot": 0.0, "*": 1.0})
+    token = main._LOG_PATH.set("/hot")
+    try:
+        info = logging.LogRecord("x", logging.INFO, __file__, 1, "m", None, None)
+        warning = logging.LogRecord("x", logging.WARNING, __file__, 1, "m", None, None)
+        assert sampler.filter(info) is False and sampler.dropped == 1
+        assert sampler.filter(warning) is True
+    finally:
+        main._LOG_PATH.reset(token)
@@ -0,0 +1,94 @@
+import time
+from datetime import datetime, timezone
+
+import main
+
+
+def _item(title: str) -> dict:
+    return {"title": title, "url": "https://example.com", "publishedAt": datetime.now(timezone.utc).isoformat()}
+
+
+def test_workers_share_the_store_through_sync(tmp_path):
+    path = str(tmp_path / "news.jsonl")
+    leader, follower = main.NewsIndex(path), main.NewsIndex(path)
+
+    assert leader.add("AAA", [_item("Alpha beats"), _item("Alpha guides")]) == 2
+    leader.mark_ingested("AAA", at=123.0)
+    follower.note_tracked("BBB", 456.0)
+
+    assert follower.sync() == [("BBB", 456.0)]
+    assert len(follower.feed(["AAA"], 0, 10)) == 2
+    assert follower.last_ingest("AAA") == 123.0
+    assert leader.sync() == [("BBB", 456.0)]
+    assert leader.sync() == []  # nothing new
+
+
+def test_compaction_keeps_lines_other_workers_appended(tmp_path):
+    path = str(tmp_path / "news.jsonl")
+    leader, follower = main.NewsIndex(path), main.NewsIndex(path)
+    leader.add("AAA", [_item("Alpha beats")])
+    leader.add("AAA", [_item("Alpha beats")])  # duplicate, not stored twice
+    follower.add("BBB", [_item("Beta files")])  # the leader has not read this yet
+
+    leader.compact()
+    assert {it["title"] for it in leader.feed(["AAA", "BBB"], 0, 10)} == {"Alpha beats", "Beta files"}
+    with open(path, "rb") as f:
+        assert len(f.read().splitlines()) == 2
+
+    follower.sync()  # the rewritten file is read from the start
+    assert len(follower.feed(["AAA", "BBB"], 0, 10)) == 2
+    restarted = main.NewsIndex(path)
+    restarted.sync()
+    assert len(restarted.feed(["AAA", "BBB"], 0, 10)) == 2
+
+
+def _finviz_page(fetched_at: float) -> tuple:
+    stamp = datetime.now(timezone.utc).strftime("%b-%d-%y 09:30AM")
+    page = {"snapshot": {}, "links": {}, "news": [[stamp, "Alpha beats", "https://x", "Wire"]], "textShortFloat": None}
+    return {**page, "fetchedAt": fetched_at}, "https://finviz.com/quote.ashx?t=AAA&p=d", None
+
+
+def test_poll_reuses_a_fresh_finviz_page(monkeypatch, clean_caches):
+    monkeypatch.setattr(main, "NEWS_INDEX", main.NewsIndex())
+    monkeypatch.setattr(main, "fetch_polygon_news", lambda symbol: {"ok": False, "items": []})
+    page = _finviz_page(time.time())
+    clean_caches["finviz_page"][("AAA",)] = page
+    clean_caches["finviz_news"][("AAA",)] = []
+
+    assert main.ingest_news("AAA", fresh=True) == 1  # news cache bypassed, page served from the cache
+    assert clean_caches["finviz_page"].get(("AAA",)) is page
+
+
+def test_poll_rescrapes_a_stale_finviz_page(monkeypatch, clean_caches):
+    monkeypatch.setattr(main, "NEWS_INDEX", main.NewsIndex())
+    monkeypatch.setattr(main, "fetch_polygon_news", lambda symbol: {"ok": False, "items": []})
+    monkeypatch.setattr(main, "fetch_finviz_news", lambda symbol: [])
+    clean_caches["finviz_page"][("AAA",)] = _finviz_page(time.time() - 2 * main.NEWS_POLL_S)
+
+    main.ingest_news("AAA", fresh=True)
+    assert ("AAA",) not in clean_caches["finviz_page"]
+
+
+def test_add_keeps_each_symbol_within_retention_and_cap(monkeypatch):
+    monkeypatch.setattr(main, "NEWS_MAX_PER_SYMBOL", 3)
+    index = main.NewsIndex()
+    now = time.time()
+    assert index.add("AAA", [{"title": "Alpha old news", "ts": now - (main.NEWS_RETENTION_DAYS + 1) * 86400}]) == 0
+
+    items = [{"title": f"Alpha item {i}", "ts": now - 60 * (10 - i)} for i in range(5)]
+    index.add("AAA", items)
+    index.add("BBB", items[:1])
+    assert [it["title"] for it in index.feed(["AAA"], 0, 10)] == ["Alpha item 4", "Alpha item 3", "Alpha item 2"]
+    assert [it["symbols"] for it in index.feed(["BBB"], 0, 10)] == [["BBB"]]  # trimmed for AAA only
+    assert len(index._items) == 4
+
+
+def test_on_request_ingest_leaves_the_store_alone(tmp_path, monkeypatch, clean_caches):
+    path = tmp_path / "news.jsonl"
+    monkeypatch.setattr(main, "NEWS_INDEX", main.NewsIndex(str(path)))
+    monkeypatch.setattr(main, "NEWS_INGEST_ENABLED", False)
+    monkeypatch.setattr(main, "fetch_polygon_news", lambda symbol: {"ok": True, "items": [_item("Alpha beats")]})
+    monkeypatch.setattr(main, "fetch_finviz_news", lambda symbol: [])
+
+    assert main.ingest_news("AAA") == 1
+    assert not path.exists()
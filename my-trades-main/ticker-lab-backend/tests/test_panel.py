@@ -0,0 +1,90 @@
+import pandas as pd
+
+import main
+from conftest import session_bars
+
+
+def test_daily_panel_append_read_and_splits(tmp_path):
+    panel = main.DailyPanel(str(tmp_path))
+    panel.append_day("2026-02-02", {"AAA": (10, 11, 9, 10.5, 100), "BBB": (5, 6, 4, 5.5, 50)}, "2026-02-02")
+    panel.append_day("2026-02-03", {"AAA": (10.5, 12, 10, 11, 200), "CCC": (1, 1, 1, 1, 1)}, "2026-02-03")
+    panel.append_day("2026-02-03", {"AAA": (0, 0, 0, 0, 0)}, "2026-02-03")  # already stored
+
+    assert panel.last_day() == "2026-02-03"
+    df = panel.frame("AAA", "2026-01-01")
+    assert df["Close"].tolist() == [10.5, 11.0]
+    assert [d.strftime("%Y-%m-%d") for d in df.index] == ["2026-02-02", "2026-02-03"]
+    assert panel.frame("BBB", "2026-01-01").shape[0] == 1  # no bar on the second day
+    assert panel.frame("CCC", "2026-01-01").index[0].strftime("%Y-%m-%d") == "2026-02-03"
+    assert panel.frame("ZZZ", "2026-01-01") is None
+
+    assert panel.apply_splits([("AAA", "2026-02-03", 0.5)], "2026-02-03") == 1
+    df = panel.frame("AAA", "2026-01-01")
+    assert df["Close"].tolist() == [5.25, 11.0]
+    assert df["Volume"].tolist() == [200.0, 200.0]
+
+    # a second process opening the same directory sees the same data
+    reader = main.DailyPanel(str(tmp_path))
+    assert reader.frame("AAA", "2026-02-03")["Close"].tolist() == [11.0]
+    assert reader.status()["symbols"] == 3
+
+
+def test_daily_panel_maps_read_only_between_writes(tmp_path):
+    panel = main.DailyPanel(str(tmp_path))
+    panel.append_day("2026-02-02", {"AAA": (1, 1, 1, 1, 1)}, "2026-02-02")
+    assert panel._state[1].mode == "r"
+    reader = main.DailyPanel(str(tmp_path))
+    reader.frame("AAA", "2026-01-01")
+    assert reader._state[1].mode == "r"
+
+
+def _recent_days(n):
+    today = pd.Timestamp.now(tz=main.DEFAULT_TZ).tz_localize(None).normalize()
+    return [(today - pd.Timedelta(days=n - i)).strftime("%Y-%m-%d") for i in range(n)]
+
+
+def test_backfill_stops_cleanly_when_rate_limited(tmp_path, monkeypatch):
+    panel = main.DailyPanel(str(tmp_path))
+    calls = []
+
+    def grouped(day):
+        calls.append(day)
+        if len(calls) > 2:
+            raise main.HTTPException(status_code=429, detail="rate limited")
+        return {"AAA": (1, 1, 1, 1, 1)}
+
+    monkeypatch.setattr(main, "DAILY_PANEL", panel)
+    monkeypatch.setattr(main, "PANEL_CALL_GAP_S", 0)
+    monkeypatch.setattr(main, "fetch_polygon_grouped_daily", grouped)
+    report = main.update_daily_panel()
+
+    assert len(report["added"]) == 2 and report["rateLimited"] == calls[-1]
+    assert panel.status()["syncedThrough"] is None  # the next check resumes the backfill
+
+
+def test_panel_reads_keep_the_upstream_provider(tmp_path, monkeypatch):
+    panel = main.DailyPanel(str(tmp_path))
+    for i, day in enumerate(_recent_days(5)):
+        panel.append_day(day, {"AAA": (10.0 + i, 11.0 + i, 9.0 + i, 10.5 + i, 100.0)}, day)
+    today = pd.Timestamp.now(tz=main.DEFAULT_TZ)
+    live = pd.DataFrame(
+        [[20.0, 21.0, 19.0, 20.5, 5.0]], index=pd.DatetimeIndex([today.strftime("%Y-%m-%d")]), columns=main._PANEL_FIELDS
+    )
+    monkeypatch.setattr(main, "DAILY_PANEL", panel)
+    monkeypatch.setattr(main, "_live_daily_bar", lambda symbol, day: live)
+
+    df, provider, source = main._fetch_daily_hedged("AAA", 6)
+    assert (provider, source) == ("polygon", "panel")
+    in_session = today.weekday() < 5 and today.hour * 60 + today.minute >= main.SESSIONS["regular"][0]
+    assert df.shape[0] == (6 if in_session else 5)
+    assert df["Close"].iloc[-1] == (20.5 if in_session else 14.5)
+
+
+def test_live_daily_bar_from_the_regular_session(clean_caches):
+    day = "2026-02-03"
+    clean_caches["intraday_1m"][("AAA", day)] = session_bars(
+        "AAA", day, [-10, 0, 1], [4.0, 5.0, 5.5], [4.5, 5.6, 6.0], [3.9, 4.9, 5.4], [4.2, 5.5, 5.8], [7.0, 100.0, 50.0]
+    )
+    bar = main._live_daily_bar("AAA", day)
+    assert bar.index[0].strftime("%Y-%m-%d") == day
+    assert bar.iloc[0].tolist() == [5.0, 6.0, 4.9, 5.8, 150.0]
@@ -0,0 +1,39 @@
+from concurrent.futures import Future
+
+import httpx
+
+import main
+import parsers
+
+
+class StalledPool:
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, fn, *args):
+        future = Future()  # never runs
+        self.futures.append(future)
+        return future
+
+
+def test_run_parser_timeout_returns_empty_result(monkeypatch, caplog):
+    pool = StalledPool()
+    monkeypatch.setattr(main, "PARSE_WORKERS", 1)
+    monkeypatch.setattr(main, "PARSE_TIMEOUT_S", 0.01)
+    monkeypatch.setattr(main, "_parse_pool", lambda: pool)
+    resp = httpx.Response(200, content=b"<html></html>", request=httpx.Request("GET", "https://finviz.com/quote.ashx"))
+
+    monkeypatch.setattr(main.logger, "handlers", [caplog.handler])  # the app logger does not propagate
+    page = main._run_parser(parsers.parse_finviz_page, resp)
+    snippets = main._run_parser(parsers.parse_dilutiontracker_page, resp)
+
+    assert page == parsers.parse_finviz_page(b"<html></html>")
+    assert snippets == []
+    assert all(f.cancelled() for f in pool.futures)
+    assert [r.getMessage() for r in caplog.records] == ["parse timed out"] * 2
+
+
+def test_empty_results_cover_every_extractor():
+    for name in parsers.EMPTY_RESULTS:
+        assert callable(getattr(parsers, name))
+
@@ -0,0 +1,85 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+PROFILE = {"exchange": "NASDAQ", "sector": "Tech", "industry": "Software", "country": "US", "marketCap": 1e9}
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    """Stub every profile source; tests set a callable per source name."""
+    behaviour = {}
+
+    def fetch(self, name):
+        return behaviour.get(name, lambda: {"ok": False, "error": "stub"})()
+
+    monkeypatch.setattr(main.ProfileAssembler, "_fetch", fetch)
+    monkeypatch.setattr(main.ProfileAssembler, "_cached", lambda self, name: True)
+    monkeypatch.setattr(main, "_schedule_profile_fill", lambda symbol, fields: None)
+    return behaviour
+
+
+def test_deadline_response_keeps_yahoo_keys_while_pending(sources):
+    def slow_yahoo():
+        time.sleep(0.5)
+        return {"symbol": "AAA", **PROFILE, "yahooOk": True, "yahooError": None}
+
+    sources["yahoo"] = slow_yahoo
+    body = TestClient(main.app).get("/ticker/profile", params={"symbol": "AAA", "deadline_ms": 100}).json()
+
+    assert body["complete"] is False
+    assert body["yahooOk"] is False and body["yahooError"] == "pending"
+    assert "yahoo" in body["pendingSources"]
+
+
+def test_source_exception_fails_only_its_fields(sources):
+    def broken():
+        raise RuntimeError("parser bug")
+
+    sources["yahoo"] = broken
+    sources["finviz"] = lambda: {"ok": True, **PROFILE, "float": 5e6, "shortInterestPercent": 12.5}
+    for deadline in (2000, None):
+        params = {"symbol": "AAA", "fields": "sector,float"}
+        if deadline:
+            params["deadline_ms"] = deadline
+        resp = TestClient(main.app).get("/ticker/profile", params=params)
+
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["sector"] == "Tech" and body["float"] == 5e6  # fell through to Finviz
+        assert body["yahooOk"] is False
+        assert body["errors"]["yahoo"] == "yahoo exception RuntimeError"
+
+
+def test_unhealthy_slow_yahoo_does_not_hold_back_the_deadline(sources, monkeypatch):
+    registry = main.ProviderRegistry()
+    for _ in range(main.PROVIDER_MIN_SAMPLES):
+        registry.record("yahoo", 0.1, False)
+    monkeypatch.setattr(main, "PROVIDERS", registry)
+
+    def slow_yahoo():
+        time.sleep(1.0)
+        return {"symbol": "AAA", **PROFILE, "yahooOk": True, "yahooError": None}
+
+    sources["yahoo"] = slow_yahoo
+    sources["finviz"] = lambda: {"ok": True, **PROFILE, "float": 5e6, "shortInterestPercent": 12.5}
+    t0 = time.monotonic()
+    resp = TestClient(main.app).get("/ticker/profile", params={"symbol": "AAA", "deadline_ms": 300})
+
+    assert resp.status_code == 200 and time.monotonic() - t0 < 0.9
+    body = resp.json()
+    assert body["sector"] == "Tech" and body["float"] == 5e6  # Finviz ran alongside Yahoo
+    assert "employees" in body["pending"] and body["complete"] is False
+    assert body["errors"]["yahoo"] == "pending"
+    assert body["errors"]["polygon"] is None  # never called
+
+
+def test_errors_are_null_for_sources_never_called(sources):
+    sources["yahoo"] = lambda: {"symbol": "AAA", **PROFILE, "yahooOk": True, "yahooError": None}
+    body = TestClient(main.app).get("/ticker/profile", params={"symbol": "AAA", "fields": "sector"}).json()
+
+    assert body["sector"] == "Tech"
+    assert body["errors"]["yahoo"] is None and body["errors"]["finviz"] is None
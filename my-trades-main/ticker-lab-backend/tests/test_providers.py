@@ -0,0 +1,27 @@
+import contextvars
+
+import pytest
+
+import main
+
+
+def test_hedged_calls_see_the_callers_rate_budget():
+    registry = main.ProviderRegistry()
+
+    def run():
+        main._RATE_WAIT_S.set(120.0)
+        return registry.call_hedged({"yahoo": main._RATE_WAIT_S.get})
+
+    assert contextvars.copy_context().run(run) == (120.0, "yahoo")
+    assert main._RATE_WAIT_S.get() is None
+
+
+def test_a_failing_call_hands_over_to_the_next():
+    registry = main.ProviderRegistry()
+
+    def broken():
+        raise RuntimeError("down")
+
+    assert registry.call_hedged({"yahoo": broken, "polygon": lambda: "bars"}) == ("bars", "polygon")
+    with pytest.raises(RuntimeError, match="down"):
+        registry.call_hedged({"yahoo": broken})
@@ -0,0 +1,55 @@
+import pytest
+
+import main
+from conftest import session_bars
+
+DAY = "2026-02-03"
+
+
+def test_session_stats_split_and_gap():
+    bars = session_bars(
+        "AAA",
+        DAY,
+        [-60, -59, 0, 1, 390],
+        [4.0, 4.5, 5.0, 5.5, 6.0],
+        [4.6, 4.8, 5.6, 6.0, 6.2],
+        [3.9, 4.4, 4.9, 5.4, 5.9],
+        [4.5, 4.7, 5.5, 5.8, 6.1],
+        [100.0, 300.0, 1000.0, 0.0, 50.0],
+    )
+    stats = main.compute_session_stats(bars.arrays(main._OHLCV), prior_close=4.0)
+
+    pre, regular, post = stats["premarket"], stats["regular"], stats["afterHours"]
+    assert pre["bars"] == 2 and pre["open"] == 4.0 and pre["close"] == 4.7 and pre["high"] == 4.8
+    assert pre["gapPercent"] == 0.0
+    assert regular["bars"] == 2 and regular["volume"] == 1000.0
+    assert regular["highTime"] == int(bars.values[0, 3])
+    assert regular["vwap"] == pytest.approx((5.6 + 4.9 + 5.5) / 3.0, abs=1e-4)
+    assert regular["gapPercent"] == 25.0
+    assert post["bars"] == 1
+
+    regular_only = {f: row[:4] for f, row in bars.arrays(main._OHLCV).items()}
+    no_after = main.compute_session_stats(regular_only, prior_close=None)
+    assert no_after["afterHours"] is None
+    assert no_after["regular"]["gapPercent"] is None
+
+
+def test_session_stats_normalises_the_date(monkeypatch, clean_caches):
+    calls = []
+
+    def bars(symbol, day):
+        calls.append(day)
+        return session_bars(symbol, day, [0, 1], [5.0, 5.5], [5.6, 6.0], [4.9, 5.4], [5.5, 5.8])
+
+    monkeypatch.setattr(main, "fetch_session_1m", bars)
+    monkeypatch.setattr(main, "_prior_close", lambda symbol, day: 4.0)
+
+    first = main.fetch_session_stats("AAA", "2026-1-5")
+    assert first["date"] == "2026-01-05" and first["regular"]["bars"] == 2
+    assert main.fetch_session_stats("AAA", "2026-01-05") is first
+    assert calls == ["2026-01-05"]
+    assert ("AAA", "2026-01-05") in clean_caches["session_stats"]
+
+    with pytest.raises(main.HTTPException) as e:
+        main.fetch_session_stats("AAA", "2026-13-01")
+    assert e.value.status_code == 400
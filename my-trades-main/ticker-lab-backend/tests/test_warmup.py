@@ -0,0 +1,109 @@
+import contextvars
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import main
+from conftest import session_bars
+
+FIELDS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+
+class FakeYahoo:
+    """yf.download stand-in: two 1m bars at the open for every ticker asked for."""
+
+    def __init__(self):
+        self.calls = []
+
+    def download(self, tickers, start, **kwargs):
+        self.calls.append(tickers)
+        index = pd.date_range(f"{start} 09:30", periods=2, freq="1min", tz=main.DEFAULT_TZ)
+        frame = pd.DataFrame(np.full((2, len(FIELDS)), 7.0), index=index, columns=FIELDS)
+        if isinstance(tickers, str):
+            return frame
+        return pd.concat({sym: frame for sym in tickers}, axis=1)
+
+
+@pytest.fixture
+def yahoo(monkeypatch, clean_caches):
+    fake = FakeYahoo()
+    pool = main.Bulkhead("yahoo", limit=4, queue=4, bucket=main.TokenBucket(rate=0.001, burst=3.0))
+    monkeypatch.setattr(main, "yf", fake)
+    monkeypatch.setitem(main.UPSTREAM_BULKHEADS, "yahoo", pool)
+    monkeypatch.setattr(main, "WARMUP_BATCH", 2)
+    return fake, pool
+
+
+def _warm(symbols, refresh):
+    today = pd.Timestamp.now(tz=main.DEFAULT_TZ).strftime("%Y-%m-%d")
+    # own context: _warm_intraday raises the rate-wait budget for the calling thread
+    return today, contextvars.copy_context().run(main._warm_intraday, symbols, today, refresh)
+
+
+def test_refresh_redownloads_a_lone_trailing_symbol(yahoo):
+    fake, pool = yahoo
+    today = pd.Timestamp.now(tz=main.DEFAULT_TZ).strftime("%Y-%m-%d")
+    stale = session_bars("CCC", today, [-60], [1.0], [1.0], [1.0], [1.0])
+    main.CACHES["intraday_1m"][("CCC", today)] = stale
+
+    today, errors = _warm(["AAA", "BBB", "CCC"], refresh=True)
+
+    assert errors == {}
+    assert fake.calls == [["AAA", "BBB"], "CCC"]
+    assert main.CACHES["intraday_1m"].get(("CCC", today)) is not stale
+    assert pool.bucket.tokens == pytest.approx(0.0, abs=1e-2)  # one token per symbol downloaded
+
+
+def test_exhausted_budget_fails_without_spending(yahoo):
+    fake, pool = yahoo
+    _warm(["AAA", "BBB", "CCC"], refresh=True)
+    tokens = pool.bucket.tokens
+
+    _, errors = _warm(["AAA", "BBB", "CCC"], refresh=True)
+
+    assert sorted(errors) == ["AAA", "BBB", "CCC"]
+    assert len(fake.calls) == 2  # nothing went out on the second run
+    assert pool.bucket.tokens == pytest.approx(tokens, abs=1e-2)
+
+
+def test_zero_rate_wait_budget_does_not_queue(monkeypatch):
+    pool = main.Bulkhead("budget", limit=1, queue=0, wait_s=5.0, bucket=main.TokenBucket(rate=10.0, burst=1.0))
+    monkeypatch.setattr(main, "WARMUP_RATE_WAIT_S", 0.0)
+
+    def two_calls():
+        main._RATE_WAIT_S.set(main.WARMUP_RATE_WAIT_S)
+        with pool.slot():
+            pass
+        with pool.slot():  # would need ~0.1s for a token
+            pass
+
+    with pytest.raises(main.BulkheadFull, match="rate limited"):
+        contextvars.copy_context().run(two_calls)
+
+
+def _warm_sections(sections):
+    return contextvars.copy_context().run(main._warm_symbol, "AAA", sections)
+
+
+def test_profile_with_no_answering_source_counts_as_failed(monkeypatch, clean_caches):
+    answers = {}
+    monkeypatch.setattr(
+        main.ProfileAssembler, "_fetch", lambda self, name: answers.get(name) or self._failed(name, f"{name} down")
+    )
+    monkeypatch.setattr(main.ProfileAssembler, "_cached", lambda self, name: True)
+
+    [failure] = _warm_sections(["profile"])
+    assert failure["section"] == "profile"
+    assert failure["error"]["finviz"] == "finviz down"
+
+    answers["finviz"] = {"ok": True, "sector": "Tech", "float": 5e6}
+    assert _warm_sections(["profile"]) == []
+
+
+def test_symbol_without_news_is_warmed(monkeypatch):
+    monkeypatch.setattr(main, "NEWS_INDEX", main.NewsIndex())
+    monkeypatch.setattr(main, "fetch_polygon_news", lambda symbol: {"ok": True, "items": []})
+    monkeypatch.setattr(main, "fetch_finviz_news", lambda symbol: [])
+
+    assert _warm_sections(["news"]) == []